@@ -0,0 +1 @@
+"""ssg.py üçün benchmark alətləri və saxta client-lər (işləmə zamanı lazım deyil)"""
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""`ssg.py bench` əmrinin ölçmə alətləri"""
+
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ssg
+from ssg import (
+    TELEGRAM_DH_PRIME, AuthKeyPool, BatchRunner, Colors, Metrics, PremiumSessionGenerator, __version__,
+)
+from bench.fakes import fake_client_overrides
+
+
+class StartupBenchmark:
+    """ssg.py başlanğıc vaxtını ölçün: lazy idxal vs. əvvəlki eager idxal"""
+    
+    SCENARIOS = {
+        # Əvvəlki davranış: hər iki kitabxana modul yüklənəndə idxal olunurdu
+        'eager': "import ssg; ssg.load_pyrogram(); ssg.load_telethon()",
+        # Yeni davranış: kitabxanalar yalnız session yaradılanda idxal olunur
+        'lazy': "import ssg",
+    }
+    
+    def __init__(self, runs: int = 10):
+        self.runs = max(1, runs)
+        self.workdir = os.path.dirname(os.path.abspath(ssg.__file__))
+    
+    def measure(self, code):
+        """Təmiz interpretatorda kodun icra vaxtlarını (ms) ölçün"""
+        samples = []
+        for _ in range(self.runs):
+            started = time.perf_counter()
+            subprocess.run(
+                [sys.executable, '-c', code],
+                cwd=self.workdir,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+    
+    def run(self):
+        """Bütün ssenariləri ölçün və xülasə qaytarın"""
+        results = {}
+        for name, code in self.SCENARIOS.items():
+            samples = sorted(self.measure(code))
+            results[name] = {
+                'runs': len(samples),
+                'min_ms': round(samples[0], 2),
+                'median_ms': round(samples[len(samples) // 2], 2),
+                'mean_ms': round(sum(samples) / len(samples), 2),
+            }
+        results['saved_ms'] = round(results['eager']['median_ms'] - results['lazy']['median_ms'], 2)
+        return results
+    
+    def print_report(self, results):
+        """Nəticələri cədvəl şəklində göstərin"""
+        print(f"\n{Colors.CYAN}⏱️  Başlanğıc Vaxtı ({self.runs} ölçüm){Colors.END}")
+        for name in self.SCENARIOS:
+            row = results[name]
+            print(f"{Colors.WHITE}  {name:<6} min={row['min_ms']:>8.2f} ms  median={row['median_ms']:>8.2f} ms  orta={row['mean_ms']:>8.2f} ms{Colors.END}")
+        print(f"{Colors.GREEN}  Qənaət (median): {results['saved_ms']:.2f} ms{Colors.END}")
+
+
+class SaveBenchmark:
+    """Yüzlərlə paralel save_session_to_file çağırışı ilə yazma sürətini ölçün"""
+    
+    def __init__(self, count: int = 500, target: float = 200.0, fsync: bool = True):
+        self.count = max(1, count)
+        self.target = target
+        self.fsync = fsync
+    
+    async def _measure_loop_lag(self, stop, lags, interval=0.005):
+        """Event loop-un nə qədər bloklandığını ölçün"""
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, loop.time() - expected))
+    
+    async def run(self):
+        """Müvəqqəti qovluqda benchmark-ı icra edin"""
+        previous_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix='ssg-bench-') as workdir:
+            os.chdir(workdir)
+            generator = PremiumSessionGenerator(quiet=True)
+            generator.writer.fsync = self.fsync
+            try:
+                stop = asyncio.Event()
+                lags = []
+                ticker = asyncio.ensure_future(self._measure_loop_lag(stop, lags))
+                session_string = 'A' * 352
+                
+                started = time.perf_counter()
+                paths = await asyncio.gather(*[
+                    generator.save_session_to_file(f"bench_user_{i}", session_string, 'pyrogram')
+                    for i in range(self.count)
+                ])
+                elapsed = time.perf_counter() - started
+                
+                stop.set()
+                await ticker
+                indexed = generator.store.count()
+            finally:
+                generator.close()
+                os.chdir(previous_cwd)
+        
+        writes_per_second = self.count / elapsed if elapsed else 0.0
+        return {
+            'count': self.count,
+            'fsync': self.fsync,
+            'written': sum(1 for path in paths if path),
+            'indexed': indexed,
+            'elapsed_s': round(elapsed, 4),
+            'writes_per_second': round(writes_per_second, 1),
+            'target_writes_per_second': self.target,
+            'target_met': writes_per_second >= self.target,
+            'max_loop_lag_ms': round(max(lags, default=0.0) * 1000, 2),
+        }
+    
+    def print_report(self, results):
+        """Nəticələri göstərin"""
+        color = Colors.GREEN if results['target_met'] else Colors.RED
+        print(f"\n{Colors.CYAN}💾 Session Yazma ({results['count']} paralel, fsync={results['fsync']}){Colors.END}")
+        print(f"{Colors.WHITE}  Yazıldı: {results['written']}  İndeksləndi: {results['indexed']}  Vaxt: {results['elapsed_s']} s{Colors.END}")
+        print(f"{color}  {results['writes_per_second']} yazı/s (hədəf: {results['target_writes_per_second']}){Colors.END}")
+        print(f"{Colors.WHITE}  Event loop-un maksimum gecikməsi: {results['max_loop_lag_ms']} ms{Colors.END}")
+
+
+class PipelineBenchmark:
+    """Saxta client-lərlə session yaradılması pipeline-ının öz yükünü ölçün"""
+    
+    def __init__(self, libraries=('pyrogram', 'telethon'), sessions: int = 200,
+                 concurrency_levels=(1, 10, 50), latency: float = 0.05, fsync: bool = True):
+        self.libraries = tuple(libraries)
+        self.sessions = max(1, sessions)
+        self.concurrency_levels = tuple(sorted(set(max(1, level) for level in concurrency_levels)))
+        self.latency = latency
+        self.fsync = fsync
+    
+    async def run_level(self, library, concurrency):
+        """Bir kitabxana və paralellik səviyyəsi üçün ölçün"""
+        previous_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix='ssg-bench-') as workdir:
+            os.chdir(workdir)
+            generator = PremiumSessionGenerator(client_overrides=fake_client_overrides(self.latency))
+            generator.writer.fsync = self.fsync
+            # Pipeline-ın öz yükü ölçülür, sorğu limitləri yox
+            generator.flood.api_rate = generator.flood.dc_rate = 0
+            runner = BatchRunner(generator, '12345', 'fake-hash', library, concurrency)
+            tokens = [f"{100000 + i}:fake-token" for i in range(self.sessions)]
+            
+            tracemalloc.start()
+            try:
+                # Terminal çıxışı da ölçülür, amma ekrana yazılmır
+                with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+                    summary = await runner.run(tokens, os.path.join(workdir, 'results.jsonl'))
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                generator.close()
+                os.chdir(previous_cwd)
+        
+        return {
+            'library': library,
+            'concurrency': concurrency,
+            'sessions': summary['total'],
+            'succeeded': summary['succeeded'],
+            'elapsed_s': summary['elapsed'],
+            'sessions_per_second': summary['per_second'],
+            'peak_memory_kb': round(peak / 1024, 1),
+            'stages': generator.metrics.summary(),
+        }
+    
+    async def run(self):
+        """Bütün kombinasiyaları ölçün"""
+        results = []
+        for library in self.libraries:
+            for concurrency in self.concurrency_levels:
+                results.append(await self.run_level(library, concurrency))
+        return {
+            'meta': {
+                'ssg_version': __version__,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'sessions': self.sessions,
+                'fake_latency_s': self.latency,
+                'fsync': self.fsync,
+            },
+            'results': results,
+        }
+    
+    def print_report(self, report):
+        """Nəticələri cədvəl şəklində göstərin"""
+        meta = report['meta']
+        print(f"\n{Colors.CYAN}🧪 Pipeline Benchmark ({meta['sessions']} session, saxta gecikmə {meta['fake_latency_s']} s){Colors.END}")
+        for row in report['results']:
+            print(f"{Colors.GREEN}  {row['library']:<9} paralellik={row['concurrency']:<4} "
+                  f"{row['sessions_per_second']:>8} session/s  pik yaddaş={row['peak_memory_kb']} KB{Colors.END}")
+            for stage, stats in row['stages'].items():
+                print(f"{Colors.WHITE}      {stage:<15} p50={stats['p50_ms']:>9.3f}  p90={stats['p90_ms']:>9.3f}  "
+                      f"p99={stats['p99_ms']:>9.3f}  max={stats['max_ms']:>9.3f} ms{Colors.END}")
+
+
+class KeygenBenchmark:
+    """Hər session üçün DH hesablamasında hovuzun qənaət etdiyi CPU vaxtını ölçün"""
+    
+    def __init__(self, count: int = 20, workers: int = 1):
+        self.count = max(1, count)
+        self.workers = max(1, workers)
+    
+    def run(self):
+        """Adi hesablama və hazır hovuzdan götürmə vaxtlarını müqayisə edin"""
+        # Kitabxananın etdiyi kimi: hər g üçün deyil, serverin verdiyi tək g üçün
+        inline = []
+        for _ in range(self.count):
+            started = time.perf_counter()
+            b = int.from_bytes(os.urandom(256), 'big')
+            pow(3, b, TELEGRAM_DH_PRIME)
+            inline.append(time.perf_counter() - started)
+        
+        pool = AuthKeyPool(size=self.count, workers=self.workers).start()
+        try:
+            fill_started = time.perf_counter()
+            while pool.ready() < self.count:
+                time.sleep(0.01)
+            fill_elapsed = time.perf_counter() - fill_started
+            
+            # Növbə ilə Pyrogram (big-endian) və Telethon (get_int, little-endian) oxunuşu
+            pooled = []
+            library_hits = {'pyrogram': 0, 'telethon': 0}
+            for i in range(self.count):
+                library, byteorder = ('pyrogram', 'big') if i % 2 == 0 else ('telethon', 'little')
+                hits = pool.hits
+                started = time.perf_counter()
+                b = int.from_bytes(pool.urandom(256, byteorder=byteorder), byteorder)
+                pool.pow(3, b, TELEGRAM_DH_PRIME)
+                pooled.append(time.perf_counter() - started)
+                library_hits[library] += pool.hits - hits
+            hits = pool.hits
+        finally:
+            pool.close()
+        
+        inline_ms = sorted(value * 1000 for value in inline)
+        pooled_ms = sorted(value * 1000 for value in pooled)
+        return {
+            'count': self.count,
+            'workers': self.workers,
+            'inline_p50_ms': round(Metrics.percentile(inline_ms, 0.5), 3),
+            'pooled_p50_ms': round(Metrics.percentile(pooled_ms, 0.5), 3),
+            'saved_per_session_ms': round(Metrics.percentile(inline_ms, 0.5) - Metrics.percentile(pooled_ms, 0.5), 3),
+            'pool_hits': hits,
+            'pool_hits_by_library': library_hits,
+            'pool_fill_s': round(fill_elapsed, 3),
+            'pool_entries_per_second': round(self.count / fill_elapsed, 2) if fill_elapsed else None,
+        }
+    
+    def print_report(self, results):
+        """Nəticələri göstərin"""
+        print(f"\n{Colors.CYAN}🔑 DH Açar Hovuzu ({results['count']} session, {results['workers']} proses){Colors.END}")
+        print(f"{Colors.WHITE}  Adi hesablama (p50):  {results['inline_p50_ms']:>9.3f} ms{Colors.END}")
+        print(f"{Colors.WHITE}  Hovuzdan (p50):       {results['pooled_p50_ms']:>9.3f} ms  ({results['pool_hits']} isabət){Colors.END}")
+        by_library = results['pool_hits_by_library']
+        print(f"{Colors.WHITE}  İsabət: Pyrogram {by_library['pyrogram']}, Telethon {by_library['telethon']}{Colors.END}")
+        print(f"{Colors.GREEN}  Session başına qənaət: {results['saved_per_session_ms']:.3f} ms{Colors.END}")
+        print(f"{Colors.WHITE}  Hovuzun dolma sürəti: {results['pool_entries_per_second']} giriş/s{Colors.END}")
+
+
+def write_benchmark_results(results, output):
+    """Benchmark nəticələrini JSON faylına yazın"""
+    if not output:
+        return
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"{Colors.GREEN}💾 Nəticələr saxlandı: {output}{Colors.END}")
+
+
+async def run_benchmark(args):
+    """Benchmark əmrlərini icra edin"""
+    if args.bench_command == 'startup':
+        bench = StartupBenchmark(runs=args.runs)
+        results = bench.run()
+        bench.print_report(results)
+        write_benchmark_results(results, args.output)
+        return 0
+    elif args.bench_command == 'save':
+        bench = SaveBenchmark(count=args.count, target=args.target, fsync=not args.no_fsync)
+        results = await bench.run()
+        bench.print_report(results)
+        write_benchmark_results(results, args.output)
+        return 0 if results['target_met'] else 2
+    elif args.bench_command == 'keygen':
+        bench = KeygenBenchmark(args.count, args.workers)
+        results = bench.run()
+        bench.print_report(results)
+        write_benchmark_results(results, args.output)
+        return 0
+    elif args.bench_command == 'pipeline':
+        libraries = ('pyrogram', 'telethon') if args.library == 'both' else (args.library,)
+        levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+        bench = PipelineBenchmark(libraries, args.sessions, levels, args.latency, not args.no_fsync)
+        report = await bench.run()
+        bench.print_report(report)
+        write_benchmark_results(report, args.output)
+        return 0
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""Şəbəkəsiz saxta Pyrogram/Telethon client-ləri: benchmark-lar, `--fake` rejimi və testlər üçün"""
+
+import asyncio
+import functools
+import hashlib
+import os
+import time
+import types
+from datetime import datetime, timedelta, timezone
+
+from ssg import SessionConverter, login_token_url
+
+
+class AuthKeyUnregistered(Exception):
+    """Saxta client-in ləğv edilmiş session üçün atdığı xəta (Pyrogram adı ilə)"""
+
+
+class FloodWait(Exception):
+    """Saxta client-in atdığı FloodWait (Pyrogram adı və .value atributu ilə)"""
+    
+    def __init__(self, value):
+        super().__init__(f"A wait of {value} seconds is required")
+        self.value = value
+
+
+class FakeUser:
+    """get_me() nəticəsinin saxta forması"""
+    
+    def __init__(self, user_id, bot=False):
+        self.id = user_id
+        self.first_name = f"Fake {user_id}"
+        self.username = f"fake{user_id}"
+        self.is_bot = bot
+        self.bot = bot
+
+
+class FakeQrLogin:
+    """Telethon QRLogin-in saxta forması: token `scan_after` saniyədən sonra skan olunmuş sayılır"""
+    
+    def __init__(self, client, expires_in: float = 30.0, scan_after: float = 0.0):
+        self.client = client
+        self.expires_in = expires_in
+        self.scanned_at = time.monotonic() + scan_after
+        self.refreshed = 0
+        self._issue()
+    
+    def _issue(self):
+        self.token = os.urandom(16)
+        self.expires = datetime.now(timezone.utc) + timedelta(seconds=self.expires_in)
+    
+    @property
+    def url(self):
+        return login_token_url(self.token)
+    
+    async def recreate(self):
+        await self.client._rpc()
+        self.refreshed += 1
+        self._issue()
+        return self.token
+    
+    async def wait(self, timeout=None):
+        delay = max(0.0, self.scanned_at - time.monotonic())
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(delay)
+        return FakeUser(self.client.user_id, False)
+
+
+class FakeTelegramClient:
+    """Şəbəkəsiz saxta client: Pyrogram/Telethon API-sinin bu skriptdə istifadə olunan hissəsi"""
+    
+    def __init__(self, session_string=None, latency: float = 0.0, outcome: str = 'alive', user_id=None, bot=False,
+                 flood_every: int = 0, flood_wait: float = 1.0, qr_expires: float = 30.0, qr_scan_after: float = 0.0):
+        self.session_string = session_string
+        self.latency = latency
+        self.outcome = outcome
+        self.user_id = user_id or int.from_bytes(os.urandom(4), 'big')
+        self.bot = bot
+        self.connected = False
+        # Hər `flood_every`-ci RPC FloodWait(flood_wait) atır (0 - heç vaxt)
+        self.flood_every = flood_every
+        self.flood_wait = flood_wait
+        # QR girişi: tokenin ömrü və "skan" anı (saniyə)
+        self.qr_expires = qr_expires
+        self.qr_scan_after = qr_scan_after
+        self.calls = 0
+    
+    async def _rpc(self):
+        """Şəbəkə gecikməsini təqlid edin"""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.calls += 1
+        if self.flood_every and self.calls % self.flood_every == 0:
+            raise FloodWait(self.flood_wait)
+        if self.outcome == 'revoked':
+            raise AuthKeyUnregistered('The key is not registered in the system')
+        if self.outcome == 'error':
+            raise ConnectionError('Fake network error')
+    
+    async def connect(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.connected = True
+        return True
+    
+    async def disconnect(self):
+        self.connected = False
+    
+    async def get_me(self):
+        await self._rpc()
+        return FakeUser(self.user_id, self.bot)
+    
+    async def send_code(self, phone_number):
+        await self._rpc()
+        return types.SimpleNamespace(phone_code_hash=hashlib.sha256(phone_number.encode()).hexdigest()[:16])
+    
+    async def sign_in(self, phone_number, phone_code_hash, phone_code):
+        await self._rpc()
+        return FakeUser(self.user_id, self.bot)
+    
+    async def check_password(self, password):
+        await self._rpc()
+        return FakeUser(self.user_id, self.bot)
+    
+    async def log_out(self):
+        await self._rpc()
+        self.connected = False
+        return True
+    
+    async def qr_login(self, ignored_ids=None):
+        await self._rpc()
+        return FakeQrLogin(self, self.qr_expires, self.qr_scan_after)
+
+
+class FakeClientFactory:
+    """Saxta client-lər yaradın; nəticə session sətrinin hash-inə görə sabitdir"""
+    
+    def __init__(self, latency: float = 0.05, revoked_ratio: float = 0.0, error_ratio: float = 0.0,
+                 flood_every: int = 0, flood_wait: float = 1.0):
+        self.latency = latency
+        self.revoked_ratio = revoked_ratio
+        self.error_ratio = error_ratio
+        self.flood_every = flood_every
+        self.flood_wait = flood_wait
+    
+    def outcome_for(self, session_string):
+        """Session sətrindən deterministik nəticə seçin"""
+        bucket = int.from_bytes(hashlib.sha256(session_string.encode()).digest()[:2], 'big') / 65536
+        if bucket < self.revoked_ratio:
+            return 'revoked'
+        if bucket < self.revoked_ratio + self.error_ratio:
+            return 'error'
+        return 'alive'
+    
+    def __call__(self, library, session_string, name='ssg_check'):
+        return FakeTelegramClient(session_string, self.latency, self.outcome_for(session_string),
+                                  flood_every=self.flood_every, flood_wait=self.flood_wait)
+
+
+class FakePyroClient(FakeTelegramClient):
+    """Pyrogram Client-in saxta əvəzedicisi (konstruktor imzası Pyrogram-a uyğundur)"""
+    
+    def __init__(self, name, api_id=None, api_hash=None, bot_token=None, session_string=None,
+                 latency: float = 0.0, flood_every: int = 0, flood_wait: float = 1.0,
+                 qr_expires: float = 30.0, qr_scan_after: float = 0.0, **kwargs):
+        user_id = int(bot_token.split(':', 1)[0]) if bot_token and bot_token.split(':', 1)[0].isdigit() else None
+        super().__init__(session_string, latency, user_id=user_id, bot=bool(bot_token),
+                         flood_every=flood_every, flood_wait=flood_wait, qr_expires=qr_expires, qr_scan_after=qr_scan_after)
+        self.name = name
+        self.api_id = api_id or 0
+        self.auth_key = os.urandom(256)
+    
+    async def start(self):
+        await self.connect()
+        await self._rpc()
+        return self
+    
+    async def stop(self):
+        await self.disconnect()
+        return self
+    
+    async def export_session_string(self):
+        return SessionConverter.encode_pyrogram(2, self.auth_key, self.user_id, self.bot, api_id=self.api_id)
+    
+    async def send_message(self, chat_id, text, **kwargs):
+        await self._rpc()
+
+
+class FakeStringSession:
+    """Telethon StringSession-ın saxta əvəzedicisi"""
+    
+    def __init__(self, string=None):
+        self.dc_id = 2
+        self.auth_key = os.urandom(256)
+    
+    def save(self):
+        return SessionConverter.encode_telethon(self.dc_id, self.auth_key)
+
+
+class FakeTeleClient(FakeTelegramClient):
+    """Telethon TelegramClient-in saxta əvəzedicisi (konstruktor imzası Telethon-a uyğundur)"""
+    
+    def __init__(self, session, api_id, api_hash, latency: float = 0.0, flood_every: int = 0,
+                 flood_wait: float = 1.0, qr_expires: float = 30.0, qr_scan_after: float = 0.0, **kwargs):
+        super().__init__(None, latency, flood_every=flood_every, flood_wait=flood_wait,
+                         qr_expires=qr_expires, qr_scan_after=qr_scan_after)
+        # Fayl yolu verilərsə (sqlite rejimi), yaddaşdakı saxta session istifadə olunur
+        self.session = FakeStringSession() if isinstance(session, str) else session
+    
+    async def start(self, phone=None, bot_token=None, code_callback=None, **kwargs):
+        if bot_token and bot_token.split(':', 1)[0].isdigit():
+            self.user_id = int(bot_token.split(':', 1)[0])
+            self.bot = True
+        if not self.connected:
+            await self.connect()
+        if phone and code_callback:
+            await self.send_code(phone)
+            code = code_callback()
+            if asyncio.iscoroutine(code) or isinstance(code, asyncio.Future):
+                code = await code
+        await self._rpc()
+        return self
+    
+    async def send_message(self, entity, message, **kwargs):
+        await self._rpc()
+
+
+def fake_client_overrides(latency: float = 0.05, flood_every: int = 0, flood_wait: float = 1.0,
+                          qr_expires: float = 30.0, qr_scan_after: float = 0.0):
+    """PremiumSessionGenerator üçün saxta Pyrogram/Telethon client-ləri"""
+    flood = {'flood_every': flood_every, 'flood_wait': flood_wait, 'qr_expires': qr_expires, 'qr_scan_after': qr_scan_after}
+    return {
+        'pyrogram': functools.partial(FakePyroClient, latency=latency, **flood),
+        'telethon': functools.partial(FakeTeleClient, latency=latency, **flood),
+        'telethon_session': FakeStringSession,
+    }
@@ -9,47 +9,174 @@
 ==================================================
 """
 
+__version__ = "2.0"
+
 import asyncio
 import os
 import sys
 import platform
 import subprocess
 import importlib
+import importlib.util
+import argparse
+import base64
+import contextlib
+import functools
+import hashlib
+import json
+import queue
+import re
+import socket
+import struct
+import tempfile
+import threading
 import time
+import types
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime, timezone
+from concurrent.futures import Future
 from typing import Optional, Tuple
 import getpass
 
+
+@functools.lru_cache(maxsize=None)
+def load_importlib_metadata():
+    """importlib.metadata yalnız versiya oxunanda idxal olunur (yoxdursa None)"""
+    try:
+        from importlib import metadata
+    except ImportError:  # Python 3.7
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            return None
+    return metadata
+
 # Global variables for package availability
+detected_environment = None
 pyro_available = False
 telethon_available = False
 pyro_version = "0.0.0"
 tele_version = "0.0.0"
 
-# Import checks with enhanced error handling
-try:
-    from pyrogram import Client as PyroClient
-    from pyrogram import __version__ as pyro_version
-    from pyrogram.errors import (
-        SessionPasswordNeeded, ApiIdInvalid, PhoneCodeInvalid, 
-        PhoneCodeExpired, PhoneNumberInvalid, PhoneNumberUnoccupied,
-        BadRequest
-    )
-    pyro_available = True
-except ImportError:
-    pyro_available = False
-
-try:
-    from telethon import TelegramClient as TeleClient
-    from telethon import __version__ as tele_version
-    from telethon.sessions import StringSession as TeleString
-    from telethon.errors import (
-        ApiIdInvalidError, PhoneNumberInvalidError, 
-        PhoneCodeInvalidError, PhoneCodeExpiredError,
-        SessionPasswordNeededError, FloodWaitError
-    )
-    telethon_available = True
-except ImportError:
-    telethon_available = False
+# Kitabxanalar yalnız ilk istifadədə idxal olunur (bax: load_pyrogram/load_telethon)
+pyro_loaded = False
+telethon_loaded = False
+PyroClient = None
+TeleClient = None
+TeleString = None
+
+# İstəyə bağlı DH açar hovuzu (bax: AuthKeyPool), --keygen-patch-auth ilə kitabxana yüklənəndə quraşdırılır
+auth_key_pool = None
+
+
+class _NotLoaded(Exception):
+    """Kitabxana hələ idxal olunmayıb - except blokları üçün yer tutucu"""
+
+
+SessionPasswordNeeded = ApiIdInvalid = PhoneCodeInvalid = _NotLoaded
+PhoneCodeExpired = PhoneNumberInvalid = PhoneNumberUnoccupied = BadRequest = _NotLoaded
+ApiIdInvalidError = PhoneNumberInvalidError = PhoneCodeInvalidError = _NotLoaded
+PhoneCodeExpiredError = SessionPasswordNeededError = FloodWaitError = _NotLoaded
+
+# Modul adı -> mümkün paylama (distribution) adları
+LIBRARY_DISTRIBUTIONS = {
+    'pyrogram': ('pyrogram', 'pyrofork', 'kurigram', 'pyrotgfork'),
+    'telethon': ('telethon',),
+}
+
+
+def get_distribution_version(module_name):
+    """Paketin versiyasını idxal etmədən metadata-dan oxuyun"""
+    importlib_metadata = load_importlib_metadata()
+    if importlib_metadata is None:
+        return None
+    for dist_name in LIBRARY_DISTRIBUTIONS.get(module_name, (module_name,)):
+        try:
+            return importlib_metadata.version(dist_name)
+        except importlib_metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+def probe_library(module_name):
+    """Kitabxananın mövcudluğunu və versiyasını idxal etmədən yoxlayın"""
+    try:
+        if importlib.util.find_spec(module_name) is None:
+            return False, "0.0.0"
+    except (ImportError, ValueError):
+        return False, "0.0.0"
+    return True, get_distribution_version(module_name) or "0.0.0"
+
+
+def refresh_availability(use_cache: bool = True):
+    """Mövcudluq bayraqlarını keşdən və ya paket metadata-sından yeniləyin"""
+    global pyro_available, telethon_available, pyro_version, tele_version, detected_environment
+
+    cache = RequirementsCache()
+    data = cache.load() if use_cache else None
+    if data is not None:
+        packages = data['packages']
+        detected_environment = data['environment']
+    else:
+        importlib.invalidate_caches()
+        packages = {name: probe_library(name) for name in LIBRARY_DISTRIBUTIONS}
+        detected_environment = SystemDetector.detect_environment()
+        cache.save(detected_environment, packages)
+    
+    if not pyro_loaded:
+        pyro_available, pyro_version = packages['pyrogram']
+    if not telethon_loaded:
+        telethon_available, tele_version = packages['telethon']
+
+
+def load_pyrogram(force: bool = False) -> bool:
+    """Pyrogram-ı ilk istifadədə idxal edin"""
+    global pyro_loaded, pyro_available, pyro_version, PyroClient
+    global SessionPasswordNeeded, ApiIdInvalid, PhoneCodeInvalid
+    global PhoneCodeExpired, PhoneNumberInvalid, PhoneNumberUnoccupied, BadRequest
+
+    if pyro_loaded and not force:
+        return True
+    try:
+        from pyrogram import Client as PyroClient
+        from pyrogram import __version__ as pyro_version
+        from pyrogram.errors import (
+            SessionPasswordNeeded, ApiIdInvalid, PhoneCodeInvalid, 
+            PhoneCodeExpired, PhoneNumberInvalid, PhoneNumberUnoccupied,
+            BadRequest
+        )
+        pyro_loaded = pyro_available = True
+    except ImportError:
+        pyro_loaded = pyro_available = False
+    if pyro_loaded and auth_key_pool is not None:
+        auth_key_pool.install()
+    return pyro_loaded
+
+
+def load_telethon(force: bool = False) -> bool:
+    """Telethon-u ilk istifadədə idxal edin"""
+    global telethon_loaded, telethon_available, tele_version, TeleClient, TeleString
+    global ApiIdInvalidError, PhoneNumberInvalidError, PhoneCodeInvalidError
+    global PhoneCodeExpiredError, SessionPasswordNeededError, FloodWaitError
+
+    if telethon_loaded and not force:
+        return True
+    try:
+        from telethon import TelegramClient as TeleClient
+        from telethon import __version__ as tele_version
+        from telethon.sessions import StringSession as TeleString
+        from telethon.errors import (
+            ApiIdInvalidError, PhoneNumberInvalidError, 
+            PhoneCodeInvalidError, PhoneCodeExpiredError,
+            SessionPasswordNeededError, FloodWaitError
+        )
+        telethon_loaded = telethon_available = True
+    except ImportError:
+        telethon_loaded = telethon_available = False
+    if telethon_loaded and auth_key_pool is not None:
+        auth_key_pool.install()
+    return telethon_loaded
+
 
 # Color codes for terminal
 class Colors:
@@ -96,20 +223,150 @@ class SystemDetector:
         }
         return commands.get(package_manager, 'pip install')
 
+# Cached requirements probe
+class RequirementsCache:
+    """Mühit və paket versiyaları üçün disk keşi - site-packages dəyişəndə etibarsız olur"""
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(self.cache_directory(), 'requirements.json')
+    
+    @staticmethod
+    def cache_directory():
+        """İstifadəçinin keş qovluğu"""
+        base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'ssg')
+    
+    @staticmethod
+    def site_directories():
+        """sys.path-dakı paket qovluqları"""
+        return sorted({
+            path for path in sys.path
+            if os.path.basename(path) in ('site-packages', 'dist-packages') and os.path.isdir(path)
+        })
+    
+    def fingerprint(self):
+        """Keşin etibarlılığını müəyyən edən dəyərlər"""
+        sites = {}
+        for path in self.site_directories():
+            try:
+                sites[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return {
+            'executable': sys.executable,
+            'python': sys.version,
+            'prefix': os.environ.get('PREFIX', ''),
+            'sites': sites,
+        }
+    
+    def load(self):
+        """Etibarlı keşi qaytarın, əks halda None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('format') != self.FORMAT_VERSION or data.get('fingerprint') != self.fingerprint():
+            return None
+        data['packages'] = {name: tuple(value) for name, value in data['packages'].items()}
+        return data
+    
+    def save(self, environment, packages):
+        """Keşi yazın (yazıla bilmirsə, səssizcə keçin)"""
+        data = {
+            'format': self.FORMAT_VERSION,
+            'fingerprint': self.fingerprint(),
+            'environment': environment,
+            'packages': {name: list(value) for name, value in packages.items()},
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+    
+    def clear(self):
+        """Keşi silin"""
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+VERSION_PATTERN = re.compile(
+    r'^\s*v?(?P<release>\d+(?:\.\d+)*)'
+    r'(?:[-_.]?(?P<pre>a|alpha|b|beta|rc|c|pre|preview)[-_.]?(?P<pre_n>\d*))?'
+    r'(?:[-_.]?(?P<post>post|rev|r)[-_.]?(?P<post_n>\d*))?'
+    r'(?:[-_.]?(?P<dev>dev)[-_.]?(?P<dev_n>\d*))?',
+    re.IGNORECASE
+)
+PRE_RELEASE_ORDER = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'rc': 2, 'c': 2, 'pre': 2, 'preview': 2}
+
+
+def parse_version(version):
+    """PEP 440-a yaxın müqayisə açarı: 1.0.dev1 < 1.0a1 < 1.0rc1 < 1.0 < 1.0.post1"""
+    match = VERSION_PATTERN.match(str(version))
+    if not match:
+        raise ValueError(f"Invalid version: {version!r}")
+    
+    release = [int(part) for part in match.group('release').split('.')]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    
+    if match.group('pre'):
+        pre = (PRE_RELEASE_ORDER[match.group('pre').lower()], int(match.group('pre_n') or 0))
+    elif match.group('dev') and not match.group('post'):
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+    post = int(match.group('post_n') or 0) if match.group('post') else -1
+    dev = int(match.group('dev_n') or 0) if match.group('dev') else float('inf')
+    return tuple(release), pre, post, dev
+
+
+# Wheel faylının adı: ad-versiya(-build)?-python-abi-platforma.whl
+WHEEL_PATTERN = re.compile(r'^(?P<name>[^-]+)-(?P<version>[^-]+)(?:-\d[^-]*)?-[^-]+-[^-]+-[^-]+\.whl$', re.IGNORECASE)
+
+
+def normalize_distribution(name):
+    """PEP 503 paylama adı"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def installed_distribution_version(name):
+    """İxtiyari paylamanın quraşdırılmış versiyası (yoxdursa None)"""
+    importlib_metadata = load_importlib_metadata()
+    if importlib_metadata is None:
+        return None
+    try:
+        return importlib_metadata.version(name)
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+
 # Enhanced requirements management
 class RequirementsManager:
-    def __init__(self):
-        self.environment = SystemDetector.detect_environment()
+    def __init__(self, wheelhouse: Optional[str] = None):
+        self.environment = detected_environment or SystemDetector.detect_environment()
+        # Şəbəkəsiz quraşdırma üçün yerli wheel qovluğu (--wheelhouse və ya SSG_WHEELHOUSE)
+        self.wheelhouse = wheelhouse or os.environ.get('SSG_WHEELHOUSE') or None
         self.required_packages = {
             'pyrogram': {
                 'package': 'pyrogram',
                 'min_version': '2.0.0',
-                'install_cmd': 'pip install pyrogram tgcrypto'
+                'install_cmd': 'pip install pyrogram tgcrypto',
+                'distributions': ('pyrogram', 'tgcrypto'),
             },
             'telethon': {
                 'package': 'telethon', 
                 'min_version': '1.24.0',
-                'install_cmd': 'pip install telethon'
+                'install_cmd': 'pip install telethon',
+                'distributions': ('telethon',),
             }
         }
     
@@ -125,9 +382,10 @@ class RequirementsManager:
                     return False, "0.0.0"
                 current_version = tele_version
             else:
-                # Digər paketlər üçün importlib istifadə edin
-                module = importlib.import_module(package_name)
-                current_version = getattr(module, '__version__', '0.0.0')
+                # Digər paketlər üçün versiyanı metadata-dan oxuyun
+                current_version = get_distribution_version(package_name)
+                if current_version is None:
+                    return False, "0.0.0"
             
             min_version = self.required_packages[package_name]['min_version']
             return self.compare_versions(current_version, min_version), current_version
@@ -137,16 +395,8 @@ class RequirementsManager:
     def compare_versions(self, current, minimum):
         """Versiya sətirlərini müqayisə edin"""
         try:
-            current_parts = list(map(int, current.split('.')))
-            min_parts = list(map(int, minimum.split('.')))
-            
-            # Uzunluqlar uyğun gəlmirsə, sıfırlarla doldurun
-            max_len = max(len(current_parts), len(min_parts))
-            current_parts += [0] * (max_len - len(current_parts))
-            min_parts += [0] * (max_len - len(min_parts))
-            
-            return current_parts >= min_parts
-        except (ValueError, AttributeError):
+            return parse_version(current) >= parse_version(minimum)
+        except (ValueError, TypeError):
             return False
     
     def install_package(self, package_name):
@@ -177,8 +427,8 @@ class RequirementsManager:
             if result.returncode == 0:
                 print(f"{Colors.GREEN}✅ {package_name} uğurla yükləndi!{Colors.END}")
                 
-                # Quraşdırmadan sonra modulları yenidən yükləyin
-                self._reload_modules()
+                # Quraşdırmadan sonra mövcudluğu yeniləyin
+                self.refresh_modules()
                 return True
             else:
                 print(f"{Colors.RED}❌ {package_name} yüklənə bilmədi!{Colors.END}")
@@ -195,7 +445,7 @@ class RequirementsManager:
                         timeout=300
                     )
                     print(f"{Colors.GREEN}✅ {package_name} alternativ üsulla yükləndi!{Colors.END}")
-                    self._reload_modules()
+                    self.refresh_modules()
                     return True
                 except subprocess.CalledProcessError:
                     print(f"{Colors.RED}❌ Alternativ metod da uğursuz oldu!{Colors.END}")
@@ -208,36 +458,137 @@ class RequirementsManager:
             print(f"{Colors.RED}❌ Gözlənilməz quraşdırma xətası: {e}{Colors.END}")
             return False
     
-    def _reload_modules(self):
-        """Quraşdırmadan sonra modulları yenidən yükləyin"""
-        global pyro_available, telethon_available, pyro_version, tele_version
+    def refresh_modules(self):
+        """Quraşdırmadan sonra mövcudluğu metadata-dan yeniləyin (modullar ilk istifadədə idxal olunur)"""
+        print(f"{Colors.CYAN}🔄 Paket məlumatları yenilənir...{Colors.END}")
+        refresh_availability(use_cache=False)
+        
+        # Artıq idxal olunmuş modul yaddaşda köhnə versiya ilə qalır - importlib.reload etibarlı deyil
+        if pyro_loaded or telethon_loaded:
+            print(f"{Colors.YELLOW}⚠️ Yeni versiyanın tətbiqi üçün proqramı yenidən başladın{Colors.END}")
         
-        print(f"{Colors.CYAN}🔄 Modullar yenidən yüklənir...{Colors.END}")
+        if pyro_available:
+            print(f"{Colors.GREEN}✅ Pyrogram {pyro_version} mövcuddur{Colors.END}")
+        else:
+            print(f"{Colors.RED}❌ Pyrogram tapılmadı{Colors.END}")
         
-        # Pyrogram-ı yenidən yükləyin
+        if telethon_available:
+            print(f"{Colors.GREEN}✅ Telethon {tele_version} mövcuddur{Colors.END}")
+        else:
+            print(f"{Colors.RED}❌ Telethon tapılmadı{Colors.END}")
+    
+    def scan_wheelhouse(self):
+        """Wheelhouse-dakı wheel-lər: normallaşdırılmış ad -> ən yeni versiyanın faylı"""
+        wheels = {}
         try:
-            if 'pyrogram' in sys.modules:
-                importlib.reload(sys.modules['pyrogram'])
-            from pyrogram import Client as PyroClient
-            from pyrogram import __version__ as pyro_version
-            pyro_available = True
-            print(f"{Colors.GREEN}✅ Pyrogram {pyro_version} yenidən yükləndi{Colors.END}")
-        except ImportError:
-            pyro_available = False
-            print(f"{Colors.RED}❌ Pyrogram yenidən yüklənə bilmədi{Colors.END}")
-        
-        # Telethon-u yenidən yükləyin
-        try:
-            if 'telethon' in sys.modules:
-                importlib.reload(sys.modules['telethon'])
-            from telethon import TelegramClient as TeleClient
-            from telethon import __version__ as tele_version
-            from telethon.sessions import StringSession as TeleString
-            telethon_available = True
-            print(f"{Colors.GREEN}✅ Telethon {tele_version} yenidən yükləndi{Colors.END}")
-        except ImportError:
-            telethon_available = False
-            print(f"{Colors.RED}❌ Telethon yenidən yüklənə bilmədi{Colors.END}")
+            names = os.listdir(self.wheelhouse)
+        except OSError:
+            return wheels
+        for filename in names:
+            match = WHEEL_PATTERN.match(filename)
+            if not match:
+                continue
+            name = normalize_distribution(match.group('name'))
+            try:
+                version = parse_version(match.group('version'))
+            except ValueError:
+                continue
+            if name not in wheels or version > wheels[name][0]:
+                wheels[name] = (version, os.path.join(self.wheelhouse, filename))
+        return {name: path for name, (version, path) in wheels.items()}
+    
+    @staticmethod
+    def wheel_requirements(path):
+        """Wheel METADATA-sından asılılıq adları (extra asılılıqları istisna olmaqla)"""
+        import zipfile
+        requirements = []
+        try:
+            with zipfile.ZipFile(path) as wheel:
+                metadata = next((name for name in wheel.namelist()
+                                 if name.endswith('.dist-info/METADATA') and name.count('/') == 1), None)
+                if metadata is None:
+                    return requirements
+                text = wheel.read(metadata).decode('utf-8', 'replace')
+        except (OSError, zipfile.BadZipFile):
+            return requirements
+        
+        for line in text.split('\n\n', 1)[0].splitlines():
+            if not line.startswith('Requires-Dist:'):
+                continue
+            requirement, _, marker = line[len('Requires-Dist:'):].partition(';')
+            if 'extra' in marker:
+                continue
+            match = re.match(r'\s*([A-Za-z0-9][A-Za-z0-9._-]*)', requirement)
+            if match:
+                requirements.append(normalize_distribution(match.group(1)))
+        return requirements
+    
+    def wheelhouse_plan(self, package_names):
+        """Quraşdırılacaq paylamalar və wheelhouse-da tapılmayan asılılıqlar"""
+        wheels = self.scan_wheelhouse()
+        # Əsas paylamalar həmişə yenilənir, asılılıqlar yalnız yoxdursa quraşdırılır
+        pending = [normalize_distribution(dist) for name in package_names
+                   for dist in self.required_packages[name]['distributions']]
+        primary = set(pending)
+        plan, missing, seen = [], [], set()
+        while pending:
+            name = pending.pop(0)
+            if name in seen:
+                continue
+            seen.add(name)
+            if name not in primary and installed_distribution_version(name) is not None:
+                continue
+            if name not in wheels:
+                missing.append(name)
+                continue
+            plan.append(name)
+            pending.extend(self.wheel_requirements(wheels[name]))
+        return plan, missing
+    
+    def _pip_install_wheels(self, distributions):
+        """Planı wheelhouse-dan bir pip prosesi ilə, shell olmadan quraşdırın
+        
+        pip prosesləri arasında kilid yoxdur: eyni site-packages-a paralel yazan bir neçə pip
+        ortaq faylları (RECORD, namespace paketlərinin __pycache__) korlaya bilər.
+        """
+        command = [
+            sys.executable, '-m', 'pip', 'install',
+            '--no-index', '--find-links', self.wheelhouse, '--no-deps', '--upgrade',
+            '--disable-pip-version-check', '--no-warn-script-location', '--quiet',
+        ] + list(distributions)
+        started = time.perf_counter()
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=600)
+            error = None if result.returncode == 0 else (result.stderr.strip().splitlines() or ['pip failed'])[-1]
+        except subprocess.TimeoutExpired:
+            error = 'timeout'
+        return {'distributions': list(distributions), 'ok': error is None, 'error': error,
+                'elapsed': round(time.perf_counter() - started, 3)}
+    
+    def install_from_wheelhouse(self, package_names):
+        """Paketləri yerli wheelhouse-dan bir pip çağırışı ilə quraşdırın"""
+        if not self.wheelhouse or not os.path.isdir(self.wheelhouse):
+            print(f"{Colors.RED}❌ Wheelhouse qovluğu tapılmadı: {self.wheelhouse}{Colors.END}")
+            return False
+        
+        started = time.perf_counter()
+        plan, missing = self.wheelhouse_plan(package_names)
+        for name in missing:
+            print(f"{Colors.YELLOW}⚠️ {name} wheelhouse-da yoxdur, atlanır{Colors.END}")
+        if not plan:
+            print(f"{Colors.YELLOW}⚠️ Quraşdırılacaq wheel tapılmadı{Colors.END}")
+            return False
+        
+        print(f"\n{Colors.YELLOW}📦 {len(plan)} paket {self.wheelhouse} qovluğundan yüklənir: {', '.join(plan)}{Colors.END}")
+        result = self._pip_install_wheels(plan)
+        if result['ok']:
+            print(f"{Colors.GREEN}✅ {', '.join(plan)} ({result['elapsed']} s){Colors.END}")
+        else:
+            print(f"{Colors.RED}❌ pip: {result['error']}{Colors.END}")
+        
+        self.refresh_modules()
+        print(f"{Colors.CYAN}⏱️  Quraşdırma: {time.perf_counter() - started:.2f} s{Colors.END}")
+        return result['ok']
     
     def check_and_install_all(self):
         """Bütün tələb olunan paketləri yoxlayın və quraşdırın"""
@@ -247,6 +598,9 @@ class RequirementsManager:
         packages_to_check = list(self.required_packages.keys())
         installation_successful = True
         
+        if self.wheelhouse:
+            return self.check_and_install_from_wheelhouse(packages_to_check)
+        
         for package_name in packages_to_check:
             is_ok, version = self.check_package(package_name)
             
@@ -272,212 +626,2727 @@ class RequirementsManager:
                     print(f"{Colors.YELLOW}⚠️ {package_name} atlandı, bəzi xüsusiyyətlər işləməyə bilər.{Colors.END}")
         
         return installation_successful
+    
+    def check_and_install_from_wheelhouse(self, package_names, ask: bool = True):
+        """Çatışmayan paketləri bir sorğu ilə wheelhouse-dan birlikdə quraşdırın"""
+        missing = []
+        for package_name in package_names:
+            is_ok, version = self.check_package(package_name)
+            if is_ok:
+                print(f"{Colors.GREEN}✅ {package_name} {version} - OK{Colors.END}")
+            else:
+                print(f"{Colors.YELLOW}⚠️ {package_name} tapılmadı və ya aktuallaşdırılmadı ({version}){Colors.END}")
+                missing.append(package_name)
+        if not missing:
+            return True
+        
+        if ask:
+            choice = input(f"{Colors.CYAN}📥 {', '.join(missing)} wheelhouse-dan yüklənsin? (e/h): {Colors.END}").lower().strip()
+            if choice not in ['e', 'y', 'yes', 'he', 'evet']:
+                print(f"{Colors.YELLOW}⚠️ Quraşdırma atlandı, bəzi xüsusiyyətlər işləməyə bilər.{Colors.END}")
+                return False
+        
+        self.install_from_wheelhouse(missing)
+        installation_successful = True
+        for package_name in missing:
+            is_ok_after, new_version = self.check_package(package_name)
+            if is_ok_after:
+                print(f"{Colors.GREEN}✅ {package_name} {new_version} uğurla yükləndi!{Colors.END}")
+            else:
+                print(f"{Colors.RED}❌ {package_name} yükləndikdən sonra hələ də işləmir!{Colors.END}")
+                installation_successful = False
+        return installation_successful
 
-# Enhanced session generator with better error handling
-class PremiumSessionGenerator:
-    def __init__(self):
-        self.requirements = RequirementsManager()
-        self.setup_directories()
+# Offline session string conversion
+class SessionConverter:
+    """Pyrogram və Telethon session sətirləri arasında şəbəkəsiz çevirmə"""
     
-    def setup_directories(self):
-        """Zəruri qovluqları yaradın"""
-        directories = ['sessions', 'logs', 'backups']
-        for directory in directories:
-            os.makedirs(directory, exist_ok=True)
+    # Pyrogram: dc_id, api_id, test_mode, auth_key, user_id, is_bot
+    PYROGRAM_FORMAT = '>BI?256sQ?'
+    # Köhnə Pyrogram formatları (api_id olmadan)
+    PYROGRAM_OLD_FORMAT_64 = '>B?256sQ?'
+    PYROGRAM_OLD_FORMAT = '>B?256sI?'
+    # Telethon: dc_id, server IP (4 və ya 16 bayt), port, auth_key
+    TELETHON_FORMAT = '>B{}sH256s'
+    TELETHON_VERSION = '1'
     
-    def clear_screen(self):
-        """Ekranı təmizləyin"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+    DC_ADDRESSES = {
+        1: '149.154.175.53',
+        2: '149.154.167.51',
+        3: '149.154.175.100',
+        4: '149.154.167.91',
+        5: '91.108.56.130',
+    }
+    TEST_DC_ADDRESSES = {
+        1: '149.154.175.10',
+        2: '149.154.167.40',
+        3: '149.154.175.117',
+    }
+    DC_PORT = 443
     
-    def show_banner(self):
-        """Premium banner göstərin"""
-        banner = f"""
-{Colors.CYAN}{Colors.BOLD}
-╔══════════════════════════════════════════════════════════════╗
-║                                                              ║
-║  🌐 SESSION GENERATOR v2.0                ║
-║  🔧 Yaradan: Rzayeffdi / Ağa                                ║
-║  🚀 Gelişmiş Xüsusiyyətlərlə Təkmilləşdirilmiş              ║
-║                                                              ║
-║  📊 Sistem: {platform.system()} {platform.release()}{' '*(30-len(platform.system()+platform.release()))}║
-║  🐍 Python: {platform.python_version()}{' '*(38-len(platform.python_version()))}║
-║  🌍 Mühit: {self.requirements.environment}{' '*(30-len(self.requirements.environment))}║
-║  🔥 Pyrogram: {pyro_version if pyro_available else 'MÖVCUD DEYİL'}{' '*(35-len(pyro_version if pyro_available else 'MÖVCUD DEYİL'))}║
-║  ⚡ Telethon: {tele_version if telethon_available else 'MÖVCUD DEYİL'}{' '*(36-len(tele_version if telethon_available else 'MÖVCUD DEYİL'))}║
-║                                                              ║
-╚══════════════════════════════════════════════════════════════╝
-{Colors.END}
-        """
-        print(banner)
+    @staticmethod
+    def _b64decode(value):
+        """Doldurma (padding) olmadan urlsafe base64 deşifrəsi"""
+        value = value.strip()
+        return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
     
-    async def get_credentials(self, bot: bool = False) -> Tuple[str, str, Optional[str]]:
-        """İstifadəçidən şəxsiyyət vəsiqələrini alın"""
-        print(f"\n{Colors.CYAN}🔐 Şəxsiyyət vəsiqələrinizi daxil edin:{Colors.END}")
+    @classmethod
+    def decode_pyrogram(cls, session_string):
+        """Pyrogram session sətrini hissələrə ayırın"""
+        try:
+            data = cls._b64decode(session_string)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Pyrogram session sətri deyil: {e}")
         
-        while True:
-            api_id = input(f"{Colors.BLUE}🔹 API_ID: {Colors.END}").strip()
-            if api_id.isdigit() and len(api_id) >= 5:
-                break
-            print(f"{Colors.RED}❌ Yanlış API_ID! Zəhmət olmasa rəqəmlərdən ibarət etibarlı API_ID daxil edin.{Colors.END}")
+        api_id = None
+        if len(data) == struct.calcsize(cls.PYROGRAM_FORMAT):
+            dc_id, api_id, test_mode, auth_key, user_id, is_bot = struct.unpack(cls.PYROGRAM_FORMAT, data)
+        elif len(data) == struct.calcsize(cls.PYROGRAM_OLD_FORMAT_64):
+            dc_id, test_mode, auth_key, user_id, is_bot = struct.unpack(cls.PYROGRAM_OLD_FORMAT_64, data)
+        elif len(data) == struct.calcsize(cls.PYROGRAM_OLD_FORMAT):
+            dc_id, test_mode, auth_key, user_id, is_bot = struct.unpack(cls.PYROGRAM_OLD_FORMAT, data)
+        else:
+            raise ValueError(f"Naməlum Pyrogram session uzunluğu: {len(data)} bayt")
         
-        api_hash = input(f"{Colors.BLUE}🔹 API_HASH: {Colors.END}").strip()
-        if not api_hash:
-            print(f"{Colors.RED}❌ API_HASH boş ola bilməz!{Colors.END}")
-            return await self.get_credentials(bot)
+        return {
+            'dc_id': dc_id,
+            'api_id': api_id,
+            'test_mode': test_mode,
+            'auth_key': auth_key,
+            'user_id': user_id,
+            'is_bot': is_bot,
+        }
+    
+    @classmethod
+    def encode_pyrogram(cls, dc_id, auth_key, user_id, is_bot, api_id=0, test_mode=False):
+        """Pyrogram (v2) session sətri yaradın"""
+        data = struct.pack(cls.PYROGRAM_FORMAT, dc_id, api_id or 0, test_mode, auth_key, user_id, is_bot)
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+    
+    @classmethod
+    def decode_telethon(cls, session_string):
+        """Telethon StringSession sətrini hissələrə ayırın"""
+        session_string = session_string.strip()
+        if not session_string.startswith(cls.TELETHON_VERSION):
+            raise ValueError("Telethon session sətri deyil: versiya '1' ilə başlamalıdır")
+        try:
+            data = cls._b64decode(session_string[1:])
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Telethon session sətri deyil: {e}")
         
-        bot_token = None
-        if bot:
-            bot_token = input(f"{Colors.BLUE}🤖 Bot Token: {Colors.END}").strip()
-            if not bot_token:
-                print(f"{Colors.RED}❌ Bot Token boş ola bilməz!{Colors.END}")
-                return await self.get_credentials(bot)
+        ip_length = len(data) - struct.calcsize(cls.TELETHON_FORMAT.format(0))
+        if ip_length not in (4, 16):
+            raise ValueError(f"Naməlum Telethon session uzunluğu: {len(data)} bayt")
         
-        return api_id, api_hash, bot_token
+        import ipaddress
+        dc_id, ip, port, auth_key = struct.unpack(cls.TELETHON_FORMAT.format(ip_length), data)
+        server_address = str(ipaddress.ip_address(ip))
+        return {
+            'dc_id': dc_id,
+            'server_address': server_address,
+            'port': port,
+            'auth_key': auth_key,
+            'test_mode': server_address in cls.TEST_DC_ADDRESSES.values(),
+        }
     
-    async def handle_user_authentication(self, client):
-        """İstifadəçi autentifikasiya əməliyyatları"""
-        phone_number = input(f"{Colors.BLUE}📞 Telefon Nömrəsi (+994...): {Colors.END}").strip()
-        
-        sent_code = await client.send_code(phone_number)
-        print(f"{Colors.YELLOW}📲 Doğrulama kodu göndərildi...{Colors.END}")
+    @classmethod
+    def encode_telethon(cls, dc_id, auth_key, server_address=None, port=None, test_mode=False):
+        """Telethon StringSession sətri yaradın"""
+        addresses = cls.TEST_DC_ADDRESSES if test_mode else cls.DC_ADDRESSES
+        server_address = server_address or addresses.get(dc_id)
+        if server_address is None:
+            raise ValueError(f"DC {dc_id} üçün server ünvanı məlum deyil")
         
+        import ipaddress
+        ip = ipaddress.ip_address(server_address).packed
+        data = struct.pack(cls.TELETHON_FORMAT.format(len(ip)), dc_id, ip, port or cls.DC_PORT, auth_key)
+        return cls.TELETHON_VERSION + base64.urlsafe_b64encode(data).decode('ascii')
+    
+    @classmethod
+    def detect(cls, session_string):
+        """Session sətrinin kitabxanasını müəyyən edin"""
+        try:
+            cls.decode_telethon(session_string)
+            return 'telethon'
+        except ValueError:
+            pass
+        cls.decode_pyrogram(session_string)
+        return 'pyrogram'
+    
+    @classmethod
+    def auth_key_hash(cls, session_string, library=None):
+        """Auth key-in sha256-sı: eyni hesab girişinin müxtəlif formatlardakı dublikatlarını tapmaq üçün"""
+        library = library or cls.detect(session_string)
+        parts = cls.decode_telethon(session_string) if library == 'telethon' else cls.decode_pyrogram(session_string)
+        return hashlib.sha256(parts['auth_key']).hexdigest()
+    
+    @classmethod
+    def pyrogram_to_telethon(cls, session_string):
+        """Pyrogram sətrini Telethon StringSession-a çevirin"""
+        parts = cls.decode_pyrogram(session_string)
+        return cls.encode_telethon(parts['dc_id'], parts['auth_key'], test_mode=parts['test_mode'])
+    
+    @classmethod
+    def telethon_to_pyrogram(cls, session_string, user_id, is_bot=False, api_id=0):
+        """Telethon sətrini Pyrogram sətrinə çevirin (user_id Telethon sətrində saxlanılmır)"""
+        if not user_id:
+            raise ValueError("Pyrogram sessionu üçün user_id tələb olunur")
+        parts = cls.decode_telethon(session_string)
+        return cls.encode_pyrogram(
+            parts['dc_id'], parts['auth_key'], int(user_id), bool(is_bot),
+            api_id=int(api_id or 0), test_mode=parts['test_mode']
+        )
+
+
+# Indexed session store
+class SessionStore:
+    """sessions/*.txt faylları üçün SQLite indeksi"""
+    
+    # Sütun adı -> SQL tipi; yeni sütunlar köhnə bazalara avtomatik əlavə olunur
+    COLUMNS = {
+        'name': 'TEXT PRIMARY KEY',
+        'library': 'TEXT NOT NULL',
+        'type': 'TEXT NOT NULL',
+        'user_id': 'INTEGER',
+        'username': 'TEXT',
+        'created_at': 'REAL NOT NULL',
+        'path': 'TEXT NOT NULL',
+        'status': 'TEXT',
+        'latency_ms': 'REAL',
+        'checked_at': 'REAL',
+        'last_error': 'TEXT',
+        'auth_key_hash': 'TEXT',
+    }
+    INDEXES = {
+        'idx_sessions_created': '(created_at DESC, name DESC)',
+        'idx_sessions_filter': '(library, type, created_at DESC, name DESC)',
+        'idx_sessions_user': '(user_id)',
+        'idx_sessions_auth_key': '(auth_key_hash)',
+    }
+    HEADER_RE = re.compile(r'^# (\w+) SESSION')
+    CREATED_RE = re.compile(r'^# Yaradıldı: (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})')
+    NAME_RE = re.compile(r'^(pyrogram|telethon)_(bot|user)_')
+    
+    def __init__(self, directory: str = 'sessions', db_name: str = 'index.db'):
+        self.directory = directory
+        self.path = os.path.join(directory, db_name)
+        self._conn = None
+        self._identities = None
+    
+    @property
+    def identities(self):
+        """Eyni bazadakı hesab kimliyi keşi (bax: IdentityCache)"""
+        if self._identities is None:
+            self._identities = IdentityCache(self)
+        return self._identities
+    
+    @property
+    def conn(self):
+        """Bazaya bağlantını ilk istifadədə açın"""
+        if self._conn is None:
+            import sqlite3
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._migrate()
+        return self._conn
+    
+    def _migrate(self):
+        """Cədvəli yaradın və çatışmayan sütunları/indeksləri əlavə edin"""
+        columns = ', '.join(f"{name} {sql_type}" for name, sql_type in self.COLUMNS.items())
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS sessions ({columns})")
+        existing = {row['name'] for row in self._conn.execute('PRAGMA table_info(sessions)')}
+        for name, sql_type in self.COLUMNS.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} {sql_type.replace('PRIMARY KEY', '')}")
+        for index, columns in self.INDEXES.items():
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON sessions {columns}")
+        self._conn.commit()
+    
+    def close(self):
+        """Bağlantını bağlayın"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._identities = None
+    
+    def add(self, name, library, kind, path, user_id=None, username=None, created_at=None, auth_key_hash=None,
+            commit=True):
+        """Sessionu indeksə əlavə edin və ya yeniləyin"""
+        self.conn.execute(
+            'INSERT INTO sessions (name, library, type, user_id, username, created_at, path, auth_key_hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET library = excluded.library, type = excluded.type, '
+            'user_id = excluded.user_id, username = excluded.username, '
+            'created_at = excluded.created_at, path = excluded.path, '
+            'auth_key_hash = COALESCE(excluded.auth_key_hash, auth_key_hash)',
+            (name, library, kind, user_id, username, created_at or time.time(), path, auth_key_hash)
+        )
+        if commit:
+            self.conn.commit()
+    
+    def _ensure_client_state(self):
+        """'shared' saxlama rejimi üçün cədvəl: bütün client vəziyyətləri bir bazada"""
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS client_state (name TEXT PRIMARY KEY, library TEXT NOT NULL, '
+            'dc_id INTEGER, session_string TEXT NOT NULL, updated_at REAL NOT NULL)'
+        )
+    
+    def put_client_state(self, name, library, session_string, commit=True):
+        """Client vəziyyətini ortaq bazaya yazın (ayrıca .session faylı yaradılmır)"""
+        self._ensure_client_state()
+        self.conn.execute(
+            'INSERT OR REPLACE INTO client_state (name, library, dc_id, session_string, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (name, library, SessionValidator.session_dc(library, session_string), session_string, time.time())
+        )
+        if commit:
+            self.conn.commit()
+    
+    def get_client_state(self, name):
+        """Ortaq bazadakı client vəziyyəti (session sətri) və ya None"""
+        self._ensure_client_state()
+        row = self.conn.execute('SELECT session_string FROM client_state WHERE name = ?', (name,)).fetchone()
+        return row['session_string'] if row else None
+    
+    def update_status(self, results):
+        """Yoxlama nəticələrini bir tranzaksiyada yazın"""
+        self.conn.executemany(
+            'UPDATE sessions SET status = ?, latency_ms = ?, checked_at = ?, last_error = ? WHERE name = ?',
+            [(r['status'], r['latency_ms'], r['checked_at'], r['error'], r['name']) for r in results]
+        )
+        self.conn.commit()
+    
+    def remove(self, name):
+        """Sessionu indeksdən silin"""
+        self.conn.execute('DELETE FROM sessions WHERE name = ?', (name,))
+        self.conn.commit()
+    
+    def remove_many(self, names):
+        """Sessionları və onların client vəziyyətini bir tranzaksiyada silin"""
+        self._ensure_client_state()
+        params = [(name,) for name in names]
+        self.conn.executemany('DELETE FROM sessions WHERE name = ?', params)
+        self.conn.executemany('DELETE FROM client_state WHERE name = ?', params)
+        self.conn.commit()
+    
+    def auth_key_hashes(self):
+        """İndeksdəki bütün auth key hash-ləri"""
+        return {row[0] for row in self.conn.execute('SELECT auth_key_hash FROM sessions WHERE auth_key_hash IS NOT NULL')}
+    
+    def get(self, name):
+        """Ada görə bir sessionu qaytarın"""
+        row = self.conn.execute('SELECT * FROM sessions WHERE name = ?', (name,)).fetchone()
+        return dict(row) if row else None
+    
+    @staticmethod
+    def _where(library=None, kind=None, search=None, older_than=None, status=None, newer_than=None):
+        """Filtrlər üçün WHERE ifadəsi və parametrləri"""
+        clauses, params = [], []
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if library:
+            clauses.append('library = ?')
+            params.append(library)
+        if kind:
+            clauses.append('type = ?')
+            params.append(kind)
+        if search:
+            clauses.append('(name LIKE ? OR username LIKE ? OR CAST(user_id AS TEXT) = ?)')
+            params.extend([f"%{search}%", f"%{search}%", search])
+        if older_than is not None:
+            clauses.append('created_at < ?')
+            params.append(older_than)
+        if newer_than is not None:
+            clauses.append('created_at >= ?')
+            params.append(newer_than)
+        return clauses, params
+    
+    def count(self, **filters):
+        """Filtrə uyğun session sayı"""
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self.conn.execute(f"SELECT COUNT(*) FROM sessions {where}", params).fetchone()[0]
+    
+    def page(self, limit: int = 20, after=None, **filters):
+        """Keyset səhifələmə: ən yenidən köhnəyə, `after` əvvəlki səhifənin son sətridir"""
+        clauses, params = self._where(**filters)
+        if after is not None:
+            clauses.append('(created_at, name) < (?, ?)')
+            params.extend([after['created_at'], after['name']])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self.conn.execute(
+            f"SELECT * FROM sessions {where} ORDER BY created_at DESC, name DESC LIMIT ?",
+            params + [limit]
+        )
+        return [dict(row) for row in rows]
+    
+    def iter_all(self, batch_size: int = 500, **filters):
+        """Bütün uyğun sessionları səhifə-səhifə gəzin"""
+        after = None
         while True:
-            phone_code = input(f"{Colors.BLUE}🔐 SMS ilə gələn kodu daxil edin: {Colors.END}").strip()
-            
-            try:
-                await client.sign_in(phone_number, sent_code.phone_code_hash, phone_code)
-                break
-            except PhoneCodeInvalid:
-                print(f"{Colors.RED}❌ Yanlış kod! Yenidən cəhd edin.{Colors.END}")
-            except PhoneCodeExpired:
-                print(f"{Colors.RED}❌ Kodun müddəti bitmiş! Yenidən kod istəyirəm...{Colors.END}")
-                sent_code = await client.resend_code(phone_number, sent_code.phone_code_hash)
-            except SessionPasswordNeeded:
-                print(f"{Colors.YELLOW}🔒 2FA aktiv, şifrə tələb olunur...{Colors.END}")
-                password = getpass.getpass(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
-                await client.check_password(password)
-                break
+            rows = self.page(limit=batch_size, after=after, **filters)
+            if not rows:
+                return
+            for row in rows:
+                yield row
+            after = rows[-1]
     
-    async def create_pyrogram_session(self, bot: bool):
-        """Təkmilləşdirilmiş Pyrogram session yaradın"""
-        if not pyro_available:
-            print(f"{Colors.RED}❌ Pyrogram kitabxanası mövcud deyil!{Colors.END}")
-            print(f"{Colors.YELLOW}📦 Zəhmət olmasa əvvəlcə Pyrogram quraşdırın.{Colors.END}")
-            return
+    @staticmethod
+    def read_session_string(path):
+        """Session faylından başlıq sətirlərini atıb session sətrini qaytarın"""
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        return lines[-1] if lines else ''
+    
+    def parse_session_file(self, path):
+        """Session faylının başlığından metadata çıxarın"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        library, kind = None, 'user'
+        created_at = os.path.getmtime(path)
+        
+        match = self.NAME_RE.match(name)
+        if match:
+            library, kind = match.group(1), match.group(2)
         
-        print(f"\n{Colors.MAGENTA}🚀 Pyrogram {'BOT' if bot else 'İSTİFADƏÇİ'} Sessionu Yaradılır...{Colors.END}")
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for _ in range(3):
+                line = f.readline()
+                header = self.HEADER_RE.match(line)
+                created = self.CREATED_RE.match(line)
+                if header:
+                    library = header.group(1).lower()
+                elif created:
+                    created_at = time.mktime(time.strptime(created.group(1), '%Y-%m-%d %H:%M:%S'))
+        
+        info = {
+            'name': name,
+            'library': library or 'unknown',
+            'kind': kind,
+            'path': path,
+            'created_at': created_at,
+            'user_id': None,
+            'auth_key_hash': None,
+        }
         
         try:
-            api_id, api_hash, bot_token = await self.get_credentials(bot)
-            session_name = f"pyrogram_{'bot' if bot else 'user'}_{int(time.time())}"
-            
-            # Client konfiqurasiyası - YALNIZCA name istifadə edin
-            client_config = {
-                "name": session_name,
-                "api_id": int(api_id),
-                "api_hash": api_hash,
-                "workdir": "./sessions",
-                "in_memory": False
-            }
-            
-            if bot:
-                client_config["bot_token"] = bot_token
-            
-            # Client-i başlatmaq üçün xüsusi metod
-            client = await self._start_pyrogram_client(client_config, bot)
-            
-            if not client:
-                return
-            
-            # Session məlumatlarını alın
-            me = await client.get_me()
-            session_string = await client.export_session_string()
-            
-            # Nəticələri göstərin
-            await self.show_session_results(client, me, session_string, "Pyrogram", "son", bot)
-            
-            # Sessionu fayla saxlayın
-            await self.save_session_to_file(session_name, session_string, "pyrogram")
-            
-            await client.stop()
-            
-        except ApiIdInvalid:
-            print(f"{Colors.RED}❌ Yanlış API_ID və ya API_HASH!{Colors.END}")
-        except PhoneNumberInvalid:
-            print(f"{Colors.RED}❌ Yanlış telefon nömrəsi!{Colors.END}")
-        except Exception as e:
-            print(f"{Colors.RED}❌ Gözlənilməz xəta: {e}{Colors.END}")
+            session_string = self.read_session_string(path)
+            if info['library'] in ('pyrogram', 'telethon'):
+                info['auth_key_hash'] = SessionConverter.auth_key_hash(session_string, info['library'])
+            # Pyrogram sətrində user_id və bot bayrağı saxlanılır
+            if info['library'] == 'pyrogram':
+                parts = SessionConverter.decode_pyrogram(session_string)
+                info['user_id'] = parts['user_id'] or None
+                info['kind'] = 'bot' if parts['is_bot'] else 'user'
+        except (ValueError, OSError, struct.error):
+            pass
+        return info
     
-    async def _start_pyrogram_client(self, client_config, bot: bool):
-        """Pyrogram client-i xüsusi başlatma metodu"""
-        client = PyroClient(**client_config)
+    def rebuild(self):
+        """Mövcud qovluğu yenidən indeksləyin"""
+        indexed = 0
+        existing = set()
+        known = {row['name']: row for row in self.conn.execute('SELECT name, user_id, username FROM sessions')}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith('.txt'):
+                    continue
+                info = self.parse_session_file(os.path.join(self.directory, entry.name))
+                existing.add(info['name'])
+                current = known.get(info['name'])
+                self.add(
+                    info['name'], info['library'], info['kind'], info['path'],
+                    user_id=current['user_id'] if current and current['user_id'] else info['user_id'],
+                    username=current['username'] if current else None,
+                    created_at=info['created_at'],
+                    auth_key_hash=info['auth_key_hash'],
+                    commit=False
+                )
+                indexed += 1
         
-        try:
-            if bot:
-                # Bot üçün sadə başlatma
-                await client.start()
-            else:
-                # İstifadəçi üçün xüsusi başlatma
-                await client.connect()
-                
-                # Telefon nömrəsini alın
-                phone_number = input(f"{Colors.BLUE}📞 Telefon Nömrəsi (+994...): {Colors.END}").strip()
-                
-                # Kodu göndərin
-                sent_code = await client.send_code(phone_number)
-                print(f"{Colors.YELLOW}📲 Doğrulama kodu göndərildi...{Colors.END}")
+        # Faylı silinmiş sətirləri təmizləyin
+        stale = [name for name in known if name not in existing]
+        self.conn.executemany('DELETE FROM sessions WHERE name = ?', [(name,) for name in stale])
+        self.conn.commit()
+        return indexed, len(stale)
+
+
+# Cached account identities
+class IdentityCache:
+    """get_me() nəticələrinin TTL və LRU ilə yerli keşi; açar session sətrinin sha256-sıdır"""
+    
+    COLUMNS = {
+        'key': 'TEXT PRIMARY KEY',
+        'user_id': 'INTEGER',
+        'first_name': 'TEXT',
+        'username': 'TEXT',
+        'bot': 'INTEGER',
+        'dc_id': 'INTEGER',
+        'validated_at': 'REAL NOT NULL',
+        'accessed_at': 'REAL NOT NULL',
+    }
+    
+    def __init__(self, store, ttl: float = 7 * 86400, max_entries: int = 100000):
+        self.store = store
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._ready = False
+    
+    @property
+    def conn(self):
+        """SessionStore bağlantısı; cədvəl ilk istifadədə yaradılır"""
+        conn = self.store.conn
+        if not self._ready:
+            columns = ', '.join(f"{name} {sql_type}" for name, sql_type in self.COLUMNS.items())
+            conn.execute(f"CREATE TABLE IF NOT EXISTS identities ({columns})")
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_identities_accessed ON identities (accessed_at)')
+            conn.commit()
+            self._ready = True
+        return conn
+    
+    @staticmethod
+    def key(session_string):
+        return hashlib.sha256(session_string.encode()).hexdigest()
+    
+    @staticmethod
+    def identity_from(me, dc_id=None):
+        """get_me() nəticəsini (Pyrogram və ya Telethon User) lüğətə çevirin"""
+        return {
+            'user_id': getattr(me, 'id', None),
+            'first_name': getattr(me, 'first_name', None),
+            'username': getattr(me, 'username', None),
+            'bot': bool(getattr(me, 'is_bot', None) or getattr(me, 'bot', None)),
+            'dc_id': dc_id,
+        }
+    
+    def is_stale(self, entry):
+        return time.time() - entry['validated_at'] > self.ttl
+    
+    def put_many(self, entries, commit: bool = True):
+        """(açar, kimlik) cütlərini bir dəfəyə yazın"""
+        now = time.time()
+        rows = []
+        for key, identity in entries:
+            rows.append((
+                key, identity.get('user_id'), identity.get('first_name'), identity.get('username'),
+                int(bool(identity.get('bot'))), identity.get('dc_id'), identity.get('validated_at') or now, now
+            ))
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO identities (key, user_id, first_name, username, bot, dc_id, validated_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+        )
+        self.evict(commit=False)
+        if commit:
+            self.conn.commit()
+    
+    def put(self, session_string, me, dc_id=None, commit: bool = True):
+        self.put_many([(self.key(session_string), self.identity_from(me, dc_id))], commit)
+    
+    def get(self, session_string, touch: bool = True):
+        """Keşdəki kimlik (köhnəlibsə 'stale': True) və ya None"""
+        key = self.key(session_string)
+        row = self.conn.execute('SELECT * FROM identities WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if touch:
+            self.conn.execute('UPDATE identities SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+        entry = dict(row)
+        entry['bot'] = bool(entry['bot'])
+        entry['stale'] = self.is_stale(entry)
+        return entry
+    
+    def get_many(self, session_strings):
+        """Bir neçə session üçün kimliklər {açar: qeyd}; istifadə vaxtı bir tranzaksiyada yenilənir"""
+        keys = [self.key(session_string) for session_string in session_strings]
+        if not keys:
+            return {}
+        placeholders = ', '.join('?' * len(keys))
+        entries = {}
+        for row in self.conn.execute(f"SELECT * FROM identities WHERE key IN ({placeholders})", keys):
+            entry = dict(row)
+            entry['bot'] = bool(entry['bot'])
+            entry['stale'] = self.is_stale(entry)
+            entries[entry['key']] = entry
+        if entries:
+            now = time.time()
+            self.conn.executemany('UPDATE identities SET accessed_at = ? WHERE key = ?', [(now, key) for key in entries])
+            self.conn.commit()
+        return entries
+    
+    def evict(self, commit: bool = True):
+        """max_entries-dən artıq qeydləri ən az istifadə olunandan başlayaraq silin"""
+        excess = self.conn.execute('SELECT COUNT(*) FROM identities').fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                'DELETE FROM identities WHERE key IN '
+                '(SELECT key FROM identities ORDER BY accessed_at LIMIT ?)', (excess,)
+            )
+            if commit:
+                self.conn.commit()
+        return max(0, excess)
+    
+    async def resolve(self, session_string, fetch, dc_id=None):
+        """Kimliyi keşdən qaytarın; yalnız yoxdursa və ya köhnəlibsə fetch() ilə yeniləyin"""
+        entry = self.get(session_string)
+        if entry is not None and not entry['stale']:
+            return entry
+        me = await fetch()
+        self.put(session_string, me, dc_id)
+        return self.get(session_string, touch=False)
+
+
+# Offline import of .session SQLite files
+def read_session_database(path):
+    """Pyrogram və ya Telethon .session faylından auth key-i oxuyun və session sətri yaradın (proses hovuzunda)"""
+    import sqlite3
+    import urllib.parse
+    info = {'path': path, 'library': None, 'ok': False, 'error': None}
+    try:
+        # Yalnız oxuma: jurnal faylı yaradılmır, işləyən client-in bazası dəyişmir
+        uri = 'file:' + urllib.parse.quote(os.path.abspath(path)) + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, timeout=5)
+        try:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(sessions)')}
+            if 'server_address' in columns:
+                row = conn.execute('SELECT dc_id, server_address, port, auth_key FROM sessions').fetchone()
+                if not row or not row[3]:
+                    raise ValueError('no auth key')
+                dc_id, server_address, port, auth_key = row
+                info.update(library='telethon', dc_id=dc_id, user_id=None, is_bot=False,
+                            session_string=SessionConverter.encode_telethon(dc_id, bytes(auth_key), server_address, port))
+            elif 'is_bot' in columns:
+                # Pyrogram 1.x bazasında api_id sütunu yoxdur
+                api_id_column = 'api_id' if 'api_id' in columns else '0'
+                row = conn.execute(
+                    f"SELECT dc_id, {api_id_column}, test_mode, auth_key, user_id, is_bot FROM sessions"
+                ).fetchone()
+                if not row or not row[3]:
+                    raise ValueError('no auth key')
+                dc_id, api_id, test_mode, auth_key, user_id, is_bot = row
+                if not user_id:
+                    raise ValueError('session is not authorized (no user_id)')
+                info.update(library='pyrogram', dc_id=dc_id, user_id=user_id, is_bot=bool(is_bot),
+                            session_string=SessionConverter.encode_pyrogram(
+                                dc_id, bytes(auth_key), user_id, bool(is_bot), api_id=api_id or 0, test_mode=bool(test_mode)))
+            else:
+                raise ValueError('not a Pyrogram/Telethon session database')
+        finally:
+            conn.close()
+        info['auth_key_hash'] = hashlib.sha256(bytes(auth_key)).hexdigest()
+        info['ok'] = True
+    except (sqlite3.Error, ValueError, struct.error, OSError) as e:
+        info['error'] = f"{type(e).__name__}: {e}"
+    return info
+
+
+class SessionImporter:
+    """.session fayllarını proses hovuzunda oxuyub string session kimi indeksə əlavə edin"""
+    
+    def __init__(self, generator, workers: Optional[int] = None, chunksize: int = 32):
+        self.generator = generator
+        self.workers = workers
+        self.chunksize = max(1, chunksize)
+    
+    @staticmethod
+    def find(roots):
+        """Qovluqlarda .session fayllarını tapın"""
+        for root in roots:
+            if os.path.isfile(root):
+                yield root
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.session'):
+                        yield os.path.join(dirpath, filename)
+    
+    def session_name(self, info, taken):
+        """İdxal olunan session üçün ad (mövcud adlarla toqquşmur)"""
+        base = os.path.splitext(os.path.basename(info['path']))[0]
+        kind = 'bot' if info['is_bot'] else 'user'
+        name = base if SessionStore.NAME_RE.match(base) else f"{info['library']}_{kind}_{base}"
+        if name in taken or self.generator.store.get(name):
+            name = f"{name}_{info['auth_key_hash'][:8]}"
+        taken.add(name)
+        return name
+    
+    async def run(self, roots, library=None):
+        """Faylları idxal edin; nəticə: (idxal, dublikat, uğursuz siyahısı)"""
+        paths = list(self.find(roots))
+        if not paths:
+            return 0, 0, []
+        
+        from concurrent.futures import ProcessPoolExecutor
+        loop = asyncio.get_event_loop()
+        with ProcessPoolExecutor(self.workers) as pool:
+            infos = await loop.run_in_executor(
+                None, lambda: list(pool.map(read_session_database, paths, chunksize=self.chunksize))
+            )
+        
+        known = self.generator.store.auth_key_hashes()
+        taken, saves, failed, duplicates = set(), [], [], 0
+        for info in infos:
+            if not info['ok']:
+                failed.append((info['path'], info['error']))
+                continue
+            if library and info['library'] != library:
+                continue
+            if info['auth_key_hash'] in known:
+                duplicates += 1
+                continue
+            known.add(info['auth_key_hash'])
+            me = argparse.Namespace(id=info['user_id'], username=None)
+            saves.append(self.generator.save_session_to_file(
+                self.session_name(info, taken), info['session_string'], info['library'], me,
+                info['is_bot'], identity=False
+            ))
+        
+        saved = [path for path in await asyncio.gather(*saves) if path]
+        return len(saved), duplicates, failed
+
+
+# Streaming export to deployment formats
+class SessionExporter:
+    """İndeksi bir dəfə gəzərək sessionları .env, JSON və CSV formatlarına axınla yazın"""
+    
+    FORMATS = ('env', 'json', 'csv')
+    FIELDS = ('name', 'library', 'type', 'user_id', 'username', 'first_name', 'dc_id', 'validated_at',
+              'created_at', 'session_string')
+    
+    def __init__(self, store):
+        self.store = store
+        self.missing = 0
+        self.stale = 0
+    
+    def records(self, **filters):
+        """Filtrə uyğun qeydlər (session sətri ilə); hər dəfə yalnız bir səhifə yaddaşda olur"""
+        for row in self.store.iter_all(**filters):
+            try:
+                session_string = SessionStore.read_session_string(row['path'])
+            except OSError:
+                self.missing += 1
+                continue
+            if not session_string:
+                self.missing += 1
+                continue
+            record = {field: row.get(field) for field in self.FIELDS}
+            record['session_string'] = session_string
+            # Kimlik şəbəkəsiz, keşdən götürülür
+            identity = self.store.identities.get(session_string, touch=False)
+            if identity is None or identity['stale']:
+                self.stale += 1
+            if identity is not None:
+                record['user_id'] = record['user_id'] or identity['user_id']
+                record['username'] = record['username'] or identity['username']
+                record.update(first_name=identity['first_name'], dc_id=identity['dc_id'],
+                              validated_at=identity['validated_at'])
+            yield record
+    
+    @staticmethod
+    def env_key(name):
+        """Session adından .env dəyişən adı"""
+        return 'SESSION_' + re.sub(r'[^A-Z0-9]+', '_', name.upper()).strip('_')
+    
+    @contextlib.contextmanager
+    def _open(self, path):
+        """Çıxış faylını temp fayl kimi açın (0600); uğurla bitdikdə atomik əvəz edin. '-' - stdout"""
+        if path == '-':
+            yield sys.stdout
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                yield f
+            os.replace(temp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+    
+    def export(self, outputs, **filters):
+        """outputs: {'env'|'json'|'csv': yol}; bütün formatlar bir keçiddə yazılır, yazılan qeyd sayı qaytarılır"""
+        unknown = set(outputs) - set(self.FORMATS)
+        if unknown:
+            raise ValueError(f"unknown export format: {', '.join(sorted(unknown))}")
+        
+        count = 0
+        with contextlib.ExitStack() as stack:
+            files = {fmt: stack.enter_context(self._open(path)) for fmt, path in outputs.items()}
+            csv_writer = None
+            if 'csv' in files:
+                import csv
+                csv_writer = csv.DictWriter(files['csv'], fieldnames=self.FIELDS)
+                csv_writer.writeheader()
+            if 'json' in files:
+                files['json'].write('[')
+            
+            for record in self.records(**filters):
+                if 'env' in files:
+                    files['env'].write(f"{self.env_key(record['name'])}={record['session_string']}\n")
+                if 'json' in files:
+                    files['json'].write((',\n ' if count else '\n ') + json.dumps(record, ensure_ascii=False))
+                if csv_writer is not None:
+                    csv_writer.writerow(record)
+                count += 1
+            
+            if 'json' in files:
+                files['json'].write('\n]\n' if count else ']\n')
+        return count
+
+
+# Atomic background session writer
+class IndexUpdateError(Exception):
+    """Session faylı yazıldı, amma indeks tranzaksiyası alınmadı ('reindex' ilə bərpa olunur)"""
+    
+    def __init__(self, path, error):
+        super().__init__(f"{path}: index update failed: {error}")
+        self.path = path
+        self.error = error
+
+
+class SessionWriter:
+    """Session fayllarını arxa plan axınında atomik yazın (temp fayl + os.replace)"""
+    
+    def __init__(self, directory: str = 'sessions', batch_size: int = 64, fsync: bool = True):
+        self.directory = directory
+        self.batch_size = max(1, batch_size)
+        self.fsync = fsync
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Yazıcı axınının öz bağlantısı olur (SQLite bağlantıları axınlar arasında paylaşılmır)
+        self._store = None
+    
+    def _ensure_thread(self):
+        """Yazıcı axınını ilk tələbdə başladın"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='session-writer', daemon=True)
+                self._thread.start()
+    
+    def submit(self, path, content, index_row=None) -> Future:
+        """Yazma tapşırığını növbəyə qoyun"""
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((path, content, index_row, future))
+        return future
+    
+    async def write(self, path, content, index_row=None):
+        """Event loop-u bloklamadan faylı yazın və nəticəni gözləyin"""
+        return await asyncio.wrap_future(self.submit(path, content, index_row))
+    
+    def close(self):
+        """Növbədəki bütün yazılar bitənə qədər gözləyin və axını dayandırın"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+    
+    def _run(self):
+        """Növbəni partiyalarla emal edin"""
+        self._store = SessionStore(self.directory)
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                batch = [item]
+                stop = False
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._flush(batch)
+                if stop:
+                    return
+        finally:
+            self._store.close()
+    
+    def _flush(self, batch):
+        """Partiyanı yazın: temp fayllar (hər biri fsync), os.replace, qovluğa bir fsync və bir indeks tranzaksiyası"""
+        staged = []
+        for path, content, index_row, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                directory = os.path.dirname(path) or '.'
+                fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                        f.flush()
+                        # Məzmun os.replace-dən əvvəl diskdə olmalıdır, əks halda qəzadan sonra boş fayl qala bilər
+                        if self.fsync:
+                            os.fsync(f.fileno())
+                except BaseException:
+                    with contextlib.suppress(OSError):
+                        os.unlink(temp_path)
+                    raise
+                staged.append((path, temp_path, index_row, future))
+            except Exception as e:
+                future.set_exception(e)
+        
+        directories = set()
+        committed = []
+        for path, temp_path, index_row, future in staged:
+            try:
+                os.replace(temp_path, path)
+                directories.add(os.path.dirname(path) or '.')
+                committed.append((path, index_row, future))
+            except Exception as e:
+                future.set_exception(e)
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+        
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            for directory in directories:
+                try:
+                    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
+                except OSError:
+                    pass
+        
+        try:
+            for path, index_row, future in committed:
+                if index_row:
+                    index_row = dict(index_row)
+                    identity = index_row.pop('identity', None)
+                    client_state = index_row.pop('client_state', None)
+                    self._store.add(commit=False, **index_row)
+                    if identity:
+                        self._store.identities.put_many([identity], commit=False)
+                    if client_state:
+                        self._store.put_client_state(index_row['name'], index_row['library'], client_state, commit=False)
+            self._store.conn.commit()
+        except Exception as e:
+            # Fayllar artıq yazılıb; indeks 'reindex' ilə bərpa oluna bilər
+            try:
+                self._store.conn.rollback()
+            except Exception:
+                pass
+            for path, index_row, future in committed:
+                future.set_exception(IndexUpdateError(path, e))
+            return
+        
+        for path, index_row, future in committed:
+            future.set_result(path)
+
+
+# FloodWait-aware rate limiting
+class TokenBucket:
+    """Sadə token bucket: saniyədə `rate` sorğu, `capacity` qədər partlayış"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        # Server FloodWait qaytardıqda bucket bu ana qədər bağlı qalır
+        self.blocked_until = 0.0
+    
+    def block(self, seconds):
+        """Bucket-i bütün istifadəçilər üçün bağlayın"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+    
+    def delay(self):
+        """Növbəti tokenə qədər gözləmə müddəti (0 - token götürüldü)"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - max(self.updated, self.blocked_until)) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    async def acquire(self):
+        """Token əldə olunana qədər gözləyin"""
+        while True:
+            wait = self.delay()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class FloodScheduler:
+    """api_id və DC üzrə ortaq limitlər; FloodWait gəldikdə gözləyib yenidən cəhd edir"""
+    
+    # Pyrogram: FloodWait (.value, köhnə versiyalarda .x); Telethon: FloodWaitError (.seconds)
+    FLOOD_ERRORS = {
+        'FloodWait', 'FloodWaitError', 'FloodPremiumWait', 'FloodPremiumWaitError',
+        'FloodTestPhoneWait', 'FloodTestPhoneWaitError',
+    }
+    
+    def __init__(self, api_rate: float = 5.0, api_burst: float = 10, dc_rate: float = 100.0, dc_burst: float = 100,
+                 max_retries: int = 3, max_wait: float = 300.0, metrics=None):
+        self.api_rate = api_rate
+        self.api_burst = api_burst
+        self.dc_rate = dc_rate
+        self.dc_burst = dc_burst
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self.buckets = {}
+        self.flood_waits = 0
+    
+    @classmethod
+    def flood_wait_seconds(cls, error):
+        """FloodWait xətasından gözləmə müddətini çıxarın (başqa xətalar üçün None)"""
+        if type(error).__name__ not in cls.FLOOD_ERRORS:
+            return None
+        for attribute in ('value', 'seconds', 'x'):
+            value = getattr(error, attribute, None)
+            if isinstance(value, (int, float)):
+                return float(value)
+        return 1.0
+    
+    def bucket(self, kind, key):
+        """('api', api_id) və ya ('dc', dc_id) üçün bucket"""
+        bucket = self.buckets.get((kind, key))
+        if bucket is None:
+            rate, burst = (self.api_rate, self.api_burst) if kind == 'api' else (self.dc_rate, self.dc_burst)
+            bucket = self.buckets[(kind, key)] = TokenBucket(rate, burst)
+        return bucket
+    
+    def _buckets(self, api_id, dc_id):
+        """Sorğuya aid bucket-lər (rate <= 0 - limit yoxdur)"""
+        buckets = []
+        if api_id is not None and self.api_rate > 0:
+            buckets.append(self.bucket('api', str(api_id)))
+        if dc_id is not None and self.dc_rate > 0:
+            buckets.append(self.bucket('dc', int(dc_id)))
+        return buckets
+    
+    async def call(self, func, *args, api_id=None, dc_id=None, library=None, **kwargs):
+        """func(*args, **kwargs) korutinini limitlərə uyğun çağırın; FloodWait-də gözləyib təkrarlayın"""
+        buckets = self._buckets(api_id, dc_id)
+        attempt = 0
+        while True:
+            for bucket in buckets:
+                await bucket.acquire()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                wait = self.flood_wait_seconds(e)
+                if wait is None or attempt >= self.max_retries or wait > self.max_wait:
+                    raise
+                attempt += 1
+                self.flood_waits += 1
+                if self.metrics is not None:
+                    self.metrics.observe('flood_wait', wait, library, type(e).__name__)
+                # Gözləmə bütün paralel istifadəçilər üçün ortaqdır: eyni api_id/DC-yə sorğular da dayanır
+                for bucket in buckets:
+                    bucket.block(wait)
+                if not buckets:
+                    await asyncio.sleep(wait)
+
+
+# Manifest adı: YYYYmmdd-HHMMSS, eyni saniyədə təkrar olunarsa -N sayğacı ilə
+MANIFEST_NAME_PATTERN = re.compile(r'^(?P<stamp>\d{8}-\d{6})(?:-(?P<counter>\d+))?$')
+
+
+# Content-addressed incremental backups
+class BackupManager:
+    """sessions/ qovluğunun artımlı ehtiyat nüsxələri: hər unikal fayl bir dəfə objects/ altında saxlanılır"""
+    
+    # İndeks 'reindex' ilə bərpa olunur; yarımçıq yazılar ehtiyat nüsxəyə düşmür
+    SKIP_SUFFIXES = ('.tmp', '-wal', '-shm', '-journal')
+    SKIP_NAMES = {'index.db'}
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, root: str = 'backups', source: str = 'sessions'):
+        self.root = root
+        self.source = source
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifests_dir = os.path.join(root, 'manifests')
+    
+    def object_path(self, digest):
+        """Blob-un yolu: objects/ab/abcdef..."""
+        return os.path.join(self.objects_dir, digest[:2], digest)
+    
+    @staticmethod
+    def manifest_key(name):
+        """Manifest adının sıralama açarı: (vaxt damğası, sayğac), beləliklə '-10' '-2'-dən sonra gəlir"""
+        match = MANIFEST_NAME_PATTERN.match(name)
+        if not match:
+            return (name, 0, name)
+        return (match.group('stamp'), int(match.group('counter') or 0), name)
+    
+    def manifests(self):
+        """Mövcud manifest adları (köhnədən yeniyə)"""
+        try:
+            names = os.listdir(self.manifests_dir)
+        except FileNotFoundError:
+            return []
+        return sorted((name[:-5] for name in names if name.endswith('.json')), key=self.manifest_key)
+    
+    def load_manifest(self, name=None):
+        """Manifesti oxuyun (ad verilməzsə, ən sonuncu)"""
+        if name is None:
+            names = self.manifests()
+            if not names:
+                return None
+            name = names[-1]
+        with open(os.path.join(self.manifests_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def iter_source_files(self):
+        """Ehtiyat nüsxəyə düşən faylları gəzin: (nisbi yol, os.stat_result)"""
+        for dirpath, dirnames, filenames in os.walk(self.source):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename in self.SKIP_NAMES or filename.endswith(self.SKIP_SUFFIXES) or filename.startswith('.'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield os.path.relpath(path, self.source).replace(os.sep, '/'), st
+    
+    def _store_blob(self, path):
+        """Faylı bir keçiddə həm hash-ləyin, həm də obyekt kimi yazın; (sha256, yeni_yazıldı) qaytarın"""
+        os.makedirs(self.objects_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.objects_dir, prefix='.blob.', suffix='.tmp')
+        try:
+            with open(path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(functools.partial(src.read, self.CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+            
+            sha = digest.hexdigest()
+            target = self.object_path(sha)
+            if os.path.exists(target):
+                os.unlink(temp_path)
+                return sha, False
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(temp_path, target)
+            return sha, True
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+    
+    def backup(self):
+        """Yeni snapshot yaradın; dəyişməmiş fayllar (ölçü + mtime) yenidən oxunmur"""
+        started = time.perf_counter()
+        previous = self.load_manifest() or {'files': []}
+        known = {entry['path']: entry for entry in previous['files']}
+        
+        files = []
+        stats = {'files': 0, 'unchanged': 0, 'new_objects': 0, 'bytes_written': 0}
+        for rel_path, st in self.iter_source_files():
+            entry = known.get(rel_path)
+            if (entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns
+                    and os.path.exists(self.object_path(entry['sha256']))):
+                sha = entry['sha256']
+                stats['unchanged'] += 1
+            else:
+                try:
+                    sha, created = self._store_blob(os.path.join(self.source, rel_path))
+                except FileNotFoundError:
+                    continue
+                if created:
+                    stats['new_objects'] += 1
+                    stats['bytes_written'] += st.st_size
+            files.append({'path': rel_path, 'sha256': sha, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns})
+            stats['files'] += 1
+        
+        os.makedirs(self.manifests_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        name = stamp
+        existing = set(self.manifests())
+        suffix = 1
+        while name in existing:
+            name = f"{stamp}-{suffix}"
+            suffix += 1
+        
+        manifest = {'name': name, 'created_at': time.time(), 'source': self.source, 'files': files}
+        fd, temp_path = tempfile.mkstemp(dir=self.manifests_dir, prefix='.manifest.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, os.path.join(self.manifests_dir, f"{name}.json"))
+        
+        stats['manifest'] = name
+        stats['elapsed'] = round(time.perf_counter() - started, 3)
+        return stats
+    
+    def restore(self, name=None, target=None, overwrite: bool = False):
+        """Manifestdəki faylları obyektlərdən axınla bərpa edin (hash yoxlanılır)"""
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"no backups in {self.manifests_dir}")
+        target = target or self.source
+        stats = {'manifest': manifest['name'], 'restored': 0, 'skipped': 0, 'bytes': 0}
+        
+        for entry in manifest['files']:
+            path = os.path.join(target, *entry['path'].split('/'))
+            if os.path.exists(path) and not overwrite:
+                stats['skipped'] += 1
+                continue
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            digest = hashlib.sha256()
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.restore.', suffix='.tmp')
+            try:
+                with open(self.object_path(entry['sha256']), 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                    for chunk in iter(functools.partial(src.read, self.CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                if digest.hexdigest() != entry['sha256']:
+                    raise ValueError(f"corrupted object for {entry['path']}")
+                os.replace(temp_path, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+                raise
+            # Orijinal mtime saxlanılır ki, növbəti ehtiyat nüsxə faylı yenidən oxumasın
+            os.utime(path, ns=(entry['mtime_ns'], entry['mtime_ns']))
+            stats['restored'] += 1
+            stats['bytes'] += entry['size']
+        return stats
+
+
+# Session health checks
+class TelegramClientFactory:
+    """Saxlanılmış session sətrindən real Pyrogram/Telethon client-i yaradın"""
+    
+    def __init__(self, api_id=None, api_hash=None):
+        self.api_id = int(api_id) if api_id else None
+        self.api_hash = api_hash
+    
+    def __call__(self, library, session_string, name='ssg_check'):
+        if library == 'pyrogram':
+            if not load_pyrogram():
+                raise RuntimeError('pyrogram not available')
+            config = {'name': name, 'session_string': session_string, 'in_memory': True, 'no_updates': True}
+            if self.api_id:
+                config.update(api_id=self.api_id, api_hash=self.api_hash)
+            return PyroClient(**config)
+        
+        if not load_telethon():
+            raise RuntimeError('telethon not available')
+        if not self.api_id or not self.api_hash:
+            raise RuntimeError('Telethon requires API_ID/API_HASH')
+        return TeleClient(TeleString(session_string), self.api_id, self.api_hash)
+
+
+class ConnectedClientPool:
+    """Bağlı client-lərin LRU hovuzu: eyni sessionun təkrar yoxlanışında yenidən qoşulma lazım olmur"""
+    
+    def __init__(self, client_factory, max_clients: int = 100):
+        self.client_factory = client_factory
+        self.max_clients = max(1, max_clients)
+        self._clients = OrderedDict()
+    
+    def __len__(self):
+        return len(self._clients)
+    
+    @staticmethod
+    async def _disconnect(client):
+        """Client-i səssizcə ayırın"""
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+    
+    async def acquire(self, library, name, session_string):
+        """Hovuzdan bağlı client götürün və ya yenisini qoşun"""
+        key = (library, name, hashlib.sha256(session_string.encode()).hexdigest())
+        client = self._clients.pop(key, None)
+        if client is None:
+            client = self.client_factory(library, session_string, name)
+            try:
+                await client.connect()
+            except BaseException:
+                # Zaman aşımı (ləğv) və ya xəta: yarımçıq qoşulmuş client-in soketi açıq qalmasın
+                await self._disconnect(client)
+                raise
+        return key, client
+    
+    async def release(self, key, client, healthy: bool = True):
+        """Client-i hovuza qaytarın; köhnələri LRU qaydasında ayırın"""
+        if not healthy:
+            await self._disconnect(client)
+            return
+        self._clients[key] = client
+        while len(self._clients) > self.max_clients:
+            _, oldest = self._clients.popitem(last=False)
+            await self._disconnect(oldest)
+    
+    async def close(self):
+        """Bütün client-ləri ayırın"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*[self._disconnect(client) for client in clients])
+
+
+class SessionValidator:
+    """Saxlanılmış sessionları məhdud sayda bağlı client ilə paralel yoxlayın"""
+    
+    # Sessionun ləğv edildiyini göstərən xəta adları (Pyrogram və Telethon)
+    REVOKED_ERRORS = {
+        'AuthKeyUnregistered', 'AuthKeyUnregisteredError',
+        'AuthKeyInvalid', 'AuthKeyInvalidError',
+        'AuthKeyDuplicated', 'AuthKeyDuplicatedError',
+        'SessionRevoked', 'SessionRevokedError',
+        'SessionExpired', 'SessionExpiredError',
+        'UserDeactivated', 'UserDeactivatedError',
+        'UserDeactivatedBan', 'UserDeactivatedBanError',
+    }
+    
+    def __init__(self, store, client_factory, concurrency: int = 50, timeout: float = 30.0, flush_every: int = 100,
+                 client_pool: Optional[ConnectedClientPool] = None, flood: Optional[FloodScheduler] = None):
+        self.store = store
+        self.client_factory = client_factory
+        # Verilərsə, client-lər yoxlamadan sonra bağlı saxlanılır (daemon rejimi)
+        self.client_pool = client_pool
+        self.flood = flood or FloodScheduler()
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.flush_every = max(1, flush_every)
+    
+    @classmethod
+    def classify_error(cls, error):
+        """Xətanı 'revoked' və ya 'error' statusuna çevirin"""
+        return 'revoked' if type(error).__name__ in cls.REVOKED_ERRORS else 'error'
+    
+    @staticmethod
+    def session_dc(library, session_string):
+        """Session sətrindəki DC nömrəsi (oxunmazsa None)"""
+        try:
+            if library == 'telethon':
+                return SessionConverter.decode_telethon(session_string)['dc_id']
+            return SessionConverter.decode_pyrogram(session_string)['dc_id']
+        except ValueError:
+            return None
+    
+    async def _request_me(self, client, library, dc_id):
+        """get_me: zaman aşımı hər cəhdə aiddir, FloodWait gözləməsinə yox"""
+        # Avtorizasiya olunmuş sessionlar üçün api_id limiti yoxdur, yalnız DC limiti tətbiq olunur
+        return await self.flood.call(
+            lambda: asyncio.wait_for(client.get_me(), self.timeout), dc_id=dc_id, library=library
+        )
+    
+    async def _get_me(self, row, session_string):
+        """Client-i qoşun (və ya hovuzdan götürün) və get_me çağırın"""
+        dc_id = self.session_dc(row['library'], session_string)
+        if self.client_pool is not None:
+            key, client = await asyncio.wait_for(
+                self.client_pool.acquire(row['library'], row['name'], session_string), self.timeout
+            )
+            healthy = False
+            try:
+                me = await self._request_me(client, row['library'], dc_id)
+                healthy = me is not None
+                return me
+            finally:
+                await self.client_pool.release(key, client, healthy)
+        
+        client = self.client_factory(row['library'], session_string, row['name'])
+        try:
+            # Qoşulma da try daxilindədir: zaman aşımında yarımçıq client ayrılır
+            await asyncio.wait_for(client.connect(), self.timeout)
+            return await self._request_me(client, row['library'], dc_id)
+        finally:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+    
+    async def check(self, row):
+        """Bir sessionu yoxlayın"""
+        result = {'name': row['name'], 'status': 'error', 'latency_ms': None, 'checked_at': time.time(), 'error': None}
+        started = time.perf_counter()
+        try:
+            session_string = SessionStore.read_session_string(row['path'])
+            me = await self._get_me(row, session_string)
+            result['status'] = 'alive' if me is not None else 'revoked'
+            if me is not None:
+                result['identity'] = dict(
+                    IdentityCache.identity_from(me, self.session_dc(row['library'], session_string)),
+                    key=IdentityCache.key(session_string)
+                )
+        except asyncio.TimeoutError:
+            result['error'] = f"timeout after {self.timeout}s"
+        except Exception as e:
+            result['status'] = self.classify_error(e)
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        result['checked_at'] = time.time()
+        return result
+    
+    def flush(self, results):
+        """Statusları və təsdiqlənmiş kimlikləri bir tranzaksiyada yazın"""
+        identities = [(result['identity']['key'], result['identity']) for result in results if result.get('identity')]
+        if identities:
+            self.store.identities.put_many(identities, commit=False)
+        self.store.update_status(results)
+    
+    async def run(self, rows, on_result=None, on_flush=None):
+        """Bütün sessionları yoxlayın və nəticələri partiyalarla indeksə yazın
+        
+        on_flush partiya indeksə yazıldıqdan sonra çağırılır (məs. journal qeydləri üçün).
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        summary = {'alive': 0, 'revoked': 0, 'error': 0}
+        pending = []
+        
+        async def worker(row):
+            async with semaphore:
+                return await self.check(row)
+        
+        def flush(results):
+            self.flush(results)
+            if on_flush:
+                on_flush(results)
+        
+        started = time.perf_counter()
+        for future in asyncio.as_completed([worker(row) for row in rows]):
+            result = await future
+            summary[result['status']] += 1
+            pending.append(result)
+            if on_result:
+                on_result(result)
+            if len(pending) >= self.flush_every:
+                flush(pending)
+                pending = []
+        if pending:
+            flush(pending)
+        
+        summary['total'] = sum(summary.values())
+        summary['elapsed'] = round(time.perf_counter() - started, 3)
+        return summary
+
+
+# Bulk session revocation
+class SessionRevoker:
+    """Seçilmiş sessionları paralel log_out edin, faylları arxivləyin və ya silin, indeksi yeniləyin"""
+    
+    def __init__(self, store, client_factory, concurrency: int = 10, timeout: float = 30.0,
+                 flood: Optional[FloodScheduler] = None, archive: Optional[str] = os.path.join('backups', 'revoked')):
+        self.store = store
+        self.client_factory = client_factory
+        self.flood = flood or FloodScheduler()
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        # None - fayllar silinir
+        self.archive = archive
+    
+    async def _log_out(self, row, session_string):
+        """Client-i qoşun və log_out çağırın (FloodWait planlayıcı tərəfindən gözlənilir)"""
+        client = self.client_factory(row['library'], session_string, row['name'])
+        try:
+            # Qoşulma da try daxilindədir: zaman aşımında yarımçıq client ayrılır
+            await asyncio.wait_for(client.connect(), self.timeout)
+            await self.flood.call(
+                lambda: asyncio.wait_for(client.log_out(), self.timeout),
+                dc_id=SessionValidator.session_dc(row['library'], session_string), library=row['library']
+            )
+        finally:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+    
+    def local_files(self, row):
+        """Sessionun diskdəki faylları (.txt və sqlite rejimində .session)"""
+        paths = [row['path']]
+        companion = os.path.join(os.path.dirname(row['path']), f"{row['name']}.session")
+        if companion != row['path'] and os.path.exists(companion):
+            paths.append(companion)
+        return paths
+    
+    def discard(self, row):
+        """Faylları arxivə köçürün və ya silin; arxiv yolunu qaytarın"""
+        archived = None
+        for path in self.local_files(row):
+            if not os.path.exists(path):
+                continue
+            if self.archive is None:
+                os.unlink(path)
+                continue
+            import shutil
+            os.makedirs(self.archive, exist_ok=True)
+            target = os.path.join(self.archive, os.path.basename(path))
+            if os.path.exists(target):
+                stem, ext = os.path.splitext(target)
+                target = f"{stem}_{int(time.time())}{ext}"
+            shutil.move(path, target)
+            archived = archived or target
+        return archived
+    
+    async def revoke(self, row):
+        """Bir sessionu ləğv edin"""
+        result = {'name': row['name'], 'library': row['library'], 'status': 'error', 'error': None,
+                  'archived': None, 'latency_ms': None}
+        started = time.perf_counter()
+        try:
+            session_string = SessionStore.read_session_string(row['path'])
+            await self._log_out(row, session_string)
+            result['status'] = 'revoked'
+        except asyncio.TimeoutError:
+            result['error'] = f"timeout after {self.timeout}s"
+        except Exception as e:
+            # Artıq ləğv edilmiş session da yerli olaraq təmizlənir
+            if SessionValidator.classify_error(e) == 'revoked':
+                result['status'] = 'already_revoked'
+            else:
+                result['error'] = f"{type(e).__name__}: {e}"
+        result['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        
+        if result['status'] != 'error':
+            try:
+                result['archived'] = self.discard(row)
+            except OSError as e:
+                result['error'] = f"local cleanup failed: {e}"
+        return result
+    
+    async def run(self, rows, on_result=None):
+        """Bütün seçilmiş sessionları ləğv edin; uğurlu olanlar indeksdən bir dəfəyə silinir"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        summary = {'revoked': 0, 'already_revoked': 0, 'error': 0}
+        removed = []
+        
+        async def worker(row):
+            async with semaphore:
+                return await self.revoke(row)
+        
+        started = time.perf_counter()
+        for future in asyncio.as_completed([worker(row) for row in rows]):
+            result = await future
+            summary[result['status']] += 1
+            # Yerli təmizləmə alınmayıbsa, sessionu indeksdə saxlayın
+            if result['status'] != 'error' and not result['error']:
+                removed.append(result['name'])
+            if on_result:
+                on_result(result)
+        
+        if removed:
+            self.store.remove_many(removed)
+        summary['total'] = sum(summary.values())
+        summary['elapsed'] = round(time.perf_counter() - started, 3)
+        summary['archive'] = self.archive
+        return summary
+
+
+# Background MTProto key-exchange precomputation
+# Telegram-ın auth key mübadiləsində istifadə etdiyi 2048-bit DH sadə ədədi
+TELEGRAM_DH_PRIME = int(
+    "C71CAEB9C6B1C9048E6C522F70F13F73980D40238E3E21C14934D037563D930F"
+    "48198A0AA7C14058229493D22530F4DBFA336F6E0AC925139543AED44CCE7C37"
+    "20FD51F69458705AC68CD4FE6B6B13ABDC9746512969328454F18FAF8C595F64"
+    "2477FE96BB2A941D5BCD1D4AC8CC49880708FA9B378E3C4F3A9060BEE67CF9A4"
+    "A4A695811051907E162753B56B0F6B410DBA74D8A84B2A14B3144E0EF1284754"
+    "FD17ED950D5965B4B9DD46582DB1178D169C6BC465B0D6FF9CA3928FEF5B9AE4"
+    "E418FC15E83EBEA0F87FA9FF5EED70050DED2849F47BF959D956850CE929851F"
+    "0D8115F635B105EE2E4E15D04B2454BF6F4FADF034B10403119CD8E3B92FCC5B",
+    16
+)
+
+
+def compute_dh_entry(generators, dh_prime=TELEGRAM_DH_PRIME):
+    """Gizli b və hər g üçün g^b mod p hesablayın (proses hovuzunda icra olunur)"""
+    b_bytes = os.urandom(256)
+    b = int.from_bytes(b_bytes, 'big')
+    return b_bytes, {g: pow(g, b, dh_prime) for g in generators}
+
+
+class AuthKeyPool:
+    """Auth key mübadiləsinin müştəri tərəfi DH hesablamasını əvvəlcədən proses hovuzunda hazırlayın
+    
+    Pyrogram və Telethon-un auth modullarında `urandom(256)` ilə yaradılan gizli b və ondan
+    hesablanan `pow(g, b, dh_prime)` hovuzdan götürülür. pq faktorizasiyası serverin cavabından
+    asılı olduğu üçün əvvəlcədən hesablana bilməz. Auth modullarının dəyişdirilməsi yalnız
+    `--keygen-patch-auth` ilə və yoxlanılmış kitabxana versiyalarında edilir.
+    """
+    
+    # Telegram-ın istifadə etdiyi g dəyərləri
+    GENERATORS = (2, 3, 4, 5, 6, 7)
+    # Auth modulunun quruluşu yoxlanılmış versiyalar: [minimum, maksimum)
+    PATCHABLE_VERSIONS = {
+        'pyrogram': ('2.0.0', '2.1.0'),
+        'telethon': ('1.24.0', '2.0.0'),
+    }
+    # Verilmiş, amma hələ pow-da istifadə olunmamış gizli açarların limiti
+    MAX_ISSUED = 8
+    
+    def __init__(self, size: int = 4, workers: int = 1, generators=GENERATORS):
+        self.size = max(1, size)
+        self.workers = max(1, workers)
+        self.generators = tuple(generators)
+        self._executor = None
+        self._futures = deque()
+        # b -> {g: g^b mod p}, urandom ilə verilmiş və pow-un gözlədiyi dəyərlər (istifadədən sonra silinir)
+        self._issued = OrderedDict()
+        self._lock = threading.Lock()
+        self._patched = set()
+        self.hits = 0
+        self.misses = 0
+    
+    def start(self):
+        """Proses hovuzunu işə salın və hovuzu doldurun"""
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (ImportError, OSError, NotImplementedError) as e:
+                print(f"{Colors.YELLOW}⚠️ Açar hovuzu başladıla bilmədi ({e}), adi rejimdə davam edilir.{Colors.END}")
+                return self
+        self._refill()
+        return self
+    
+    def _refill(self):
+        """Hovuzu hədəf ölçüyə qədər doldurun"""
+        if self._executor is None:
+            return
+        with self._lock:
+            while len(self._futures) < self.size:
+                self._futures.append(self._executor.submit(compute_dh_entry, self.generators))
+    
+    def ready(self):
+        """Hazır olan girişlərin sayı"""
+        with self._lock:
+            return sum(1 for future in self._futures if future.done() and not future.exception())
+    
+    def take(self):
+        """Hazır girişi götürün (yoxdursa, None - gözləmədən)"""
+        entry = None
+        with self._lock:
+            for future in list(self._futures):
+                if future.done():
+                    self._futures.remove(future)
+                    if future.exception() is None:
+                        entry = future.result()
+                        break
+        if entry is not None:
+            self._refill()
+        return entry
+    
+    def urandom(self, n, byteorder='big'):
+        """os.urandom əvəzi: 256 baytlıq sorğu DH gizli açarıdır, hovuzdan verilir
+        
+        byteorder kitabxananın baytları ədədə necə çevirdiyidir: Pyrogram 'big',
+        Telethon (get_int) 'little' - baytlar elə verilir ki, oxunan b hovuzdakı ilə eyni olsun.
+        """
+        if n == 256:
+            entry = self.take()
+            if entry is not None:
+                b_bytes, powers = entry
+                b = int.from_bytes(b_bytes, 'big')
+                with self._lock:
+                    # İstifadə olunmamış köhnə gizli açarları yaddaşda saxlamayın
+                    while len(self._issued) >= self.MAX_ISSUED:
+                        self._issued.popitem(last=False)
+                    self._issued[b] = powers
+                return b.to_bytes(256, byteorder)
+        return os.urandom(n)
+    
+    def pow(self, base, exp, mod=None):
+        """pow əvəzi: hovuzdan verilmiş b üçün g^b mod p hazır nəticəsini qaytarın"""
+        if mod == TELEGRAM_DH_PRIME:
+            with self._lock:
+                # Gizli açar yalnız bir dəfə istifadə olunur: g^b götürüldükdən sonra silinir
+                powers = self._issued.pop(exp, None)
+            if powers is not None and base in powers:
+                self.hits += 1
+                return powers[base]
+            self.misses += 1
+        return pow(base, exp) if mod is None else pow(base, exp, mod)
+    
+    def patchable(self, library, version):
+        """Kitabxana versiyası auth modulunun yoxlanılmış aralığındadırmı"""
+        minimum, maximum = self.PATCHABLE_VERSIONS[library]
+        try:
+            return parse_version(minimum) <= parse_version(version) < parse_version(maximum)
+        except ValueError:
+            return False
+    
+    def install(self):
+        """Yüklənmiş kitabxanaların auth modullarına urandom/pow əvəzlərini quraşdırın"""
+        pool = self
+        
+        pyrogram_auth = sys.modules.get('pyrogram.session.auth')
+        if pyrogram_auth is None and pyro_loaded:
+            try:
+                pyrogram_auth = importlib.import_module('pyrogram.session.auth')
+            except ImportError:
+                pyrogram_auth = None
+        if pyrogram_auth is not None and 'pyrogram' not in self._patched:
+            self._patched.add('pyrogram')
+            if not self.patchable('pyrogram', pyro_version) or not hasattr(pyrogram_auth, 'urandom'):
+                print(f"{Colors.YELLOW}⚠️ Açar hovuzu Pyrogram {pyro_version} ilə yoxlanılmayıb, quraşdırılmadı.{Colors.END}")
+                pyrogram_auth = None
+        if pyrogram_auth is not None:
+            pyrogram_auth.urandom = self.urandom
+            pyrogram_auth.pow = self.pow
+        
+        telethon_auth = sys.modules.get('telethon.network.authenticator')
+        if telethon_auth is None and telethon_loaded:
+            try:
+                telethon_auth = importlib.import_module('telethon.network.authenticator')
+            except ImportError:
+                telethon_auth = None
+        if telethon_auth is not None and 'telethon' not in self._patched:
+            self._patched.add('telethon')
+            if not self.patchable('telethon', tele_version) or getattr(telethon_auth, 'os', None) is not os:
+                print(f"{Colors.YELLOW}⚠️ Açar hovuzu Telethon {tele_version} ilə yoxlanılmayıb, quraşdırılmadı.{Colors.END}")
+                telethon_auth = None
+        if telethon_auth is not None:
+            class PooledOs(types.ModuleType):
+                def __getattr__(self, name):
+                    return getattr(os, name)
+            
+            pooled_os = PooledOs('os')
+            # Telethon b-ni get_int(..., signed=False) ilə little-endian oxuyur
+            pooled_os.urandom = functools.partial(pool.urandom, byteorder='little')
+            telethon_auth.os = pooled_os
+            telethon_auth.pow = self.pow
+        return self
+    
+    def close(self):
+        """Proses hovuzunu dayandırın"""
+        if self._executor is not None:
+            with self._lock:
+                for future in self._futures:
+                    future.cancel()
+                self._futures.clear()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def start_auth_key_pool(size: int, workers: int = 1):
+    """Qlobal açar hovuzunu işə salın və yüklənmiş kitabxanalara quraşdırın"""
+    global auth_key_pool
+    if auth_key_pool is None:
+        auth_key_pool = AuthKeyPool(size, workers).start()
+        auth_key_pool.install()
+    return auth_key_pool
+
+
+def stop_auth_key_pool():
+    """Qlobal açar hovuzunu dayandırın"""
+    global auth_key_pool
+    if auth_key_pool is not None:
+        auth_key_pool.close()
+        auth_key_pool = None
+
+
+# Per-stage timing metrics
+class Metrics:
+    """Session yaradılmasının hər mərhələsi üçün gecikmə histoqramları və xəta sayları"""
+    
+    # Histoqram sərhədləri (saniyə)
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    def __init__(self, log_directory: Optional[str] = None, max_bytes: int = 5 * 1024 * 1024,
+                 backup_count: int = 5, sample_limit: int = 10000):
+        # Persentillər üçün son ölçümlər (benchmark hesabatı)
+        self.samples = defaultdict(lambda: deque(maxlen=sample_limit))
+        # (stage, library) -> [bucket sayları..., +Inf, cəm]
+        self.histograms = {}
+        # (stage, library, xəta tipi) -> say
+        self.errors = defaultdict(int)
+        self.log_directory = log_directory
+        self._queue_handler = None
+        self._listener = None
+        if log_directory:
+            self._setup_log(max_bytes, backup_count)
+    
+    def _setup_log(self, max_bytes, backup_count):
+        """JSON-lines log-u arxa plan axını ilə fırlanan fayla yazın"""
+        import logging
+        import logging.handlers
+        os.makedirs(self.log_directory, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(self.log_directory, 'metrics.jsonl'),
+            maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        log_queue = queue.Queue()
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._listener = logging.handlers.QueueListener(log_queue, handler)
+        self._listener.start()
+    
+    @contextlib.contextmanager
+    def stage(self, name, library=None):
+        """Blokun icra vaxtını və xətasını mərhələ adı altında qeyd edin"""
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, library, error)
+    
+    def observe(self, name, seconds, library=None, error=None):
+        """Bir ölçümü qeyd edin"""
+        self.samples[name].append(seconds)
+        
+        key = (name, library or '')
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [0] * (len(self.BUCKETS) + 1) + [0.0]
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[len(self.BUCKETS)] += 1
+        histogram[-1] += seconds
+        
+        if error:
+            self.errors[(name, library or '', error)] += 1
+        
+        if self._queue_handler is not None:
+            import logging
+            event = {'ts': round(time.time(), 3), 'stage': name, 'duration_ms': round(seconds * 1000, 3)}
+            if library:
+                event['library'] = library
+            if error:
+                event['error'] = error
+            self._queue_handler.handle(logging.makeLogRecord({'msg': json.dumps(event), 'levelno': logging.INFO}))
+    
+    def reset(self):
+        """Toplanmış ölçümləri silin"""
+        self.samples.clear()
+        self.histograms.clear()
+        self.errors.clear()
+    
+    @staticmethod
+    def percentile(sorted_values, fraction):
+        """Sıralanmış siyahıdan en yaxın sıralı persentil"""
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+        return sorted_values[index]
+    
+    def summary(self):
+        """Hər mərhələ üçün say, orta və p50/p90/p99/max (ms)"""
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            result[name] = {
+                'count': len(ordered),
+                'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+                'p50_ms': round(self.percentile(ordered, 0.50) * 1000, 3),
+                'p90_ms': round(self.percentile(ordered, 0.90) * 1000, 3),
+                'p99_ms': round(self.percentile(ordered, 0.99) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+            }
+        return result
+    
+    def prometheus(self):
+        """Prometheus mətn formatında snapshot"""
+        lines = [
+            '# HELP ssg_stage_duration_seconds Session generation stage latency.',
+            '# TYPE ssg_stage_duration_seconds histogram',
+        ]
+        for (name, library), histogram in sorted(self.histograms.items()):
+            labels = f'stage="{name}",library="{library}"'
+            for bound, count in zip(self.BUCKETS, histogram):
+                lines.append(f'ssg_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            count = histogram[len(self.BUCKETS)]
+            lines.append(f'ssg_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'ssg_stage_duration_seconds_sum{{{labels}}} {histogram[-1]:.6f}')
+            lines.append(f'ssg_stage_duration_seconds_count{{{labels}}} {count}')
+        
+        lines.append('# HELP ssg_stage_errors_total Session generation stage errors by exception type.')
+        lines.append('# TYPE ssg_stage_errors_total counter')
+        for (name, library, error), count in sorted(self.errors.items()):
+            lines.append(f'ssg_stage_errors_total{{stage="{name}",library="{library}",error="{error}"}} {count}')
+        return '\n'.join(lines) + '\n'
+    
+    def write_snapshot(self, path=None):
+        """Prometheus snapshot-ını atomik yazın"""
+        path = path or (os.path.join(self.log_directory, 'metrics.prom') if self.log_directory else None)
+        if not path or not self.histograms:
+            return None
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        os.replace(temp_path, path)
+        return path
+    
+    def close(self):
+        """Snapshot yazın və log axınını dayandırın"""
+        try:
+            self.write_snapshot()
+        except OSError as e:
+            print(f"{Colors.YELLOW}⚠️ Metrik snapshot-ı yazıla bilmədi: {e}{Colors.END}")
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            self._queue_handler = None
+
+
+# Low-overhead profiling
+class Profiler:
+    """Fon axınında stack nümunələri (flamegraph), istəyə bağlı cProfile və tracemalloc"""
+    
+    def __init__(self, mode: str = 'sample', interval: float = 0.01, memory: bool = False,
+                 directory: str = 'logs', top: int = 25, memory_frames: int = 1):
+        self.mode = mode
+        self.interval = max(0.001, interval)
+        self.memory = memory
+        self.directory = directory
+        self.top = top
+        self.memory_frames = memory_frames
+        # (axın adı, çərçivə, ...) -> nümunə sayı
+        self.stacks = defaultdict(int)
+        self.samples = 0
+        self.elapsed = 0.0
+        self.memory_snapshot = None
+        self.memory_peak = 0
+        self._labels = {}
+        self._cprofile = None
+        self._own_tracemalloc = False
+        self._thread = None
+        self._stop = threading.Event()
+        self._started = None
+    
+    def start(self):
+        """Profilləşdirməni başladın"""
+        import tracemalloc
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.memory_frames)
+            self._own_tracemalloc = True
+        if self.mode == 'cprofile':
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name='ssg-profiler', daemon=True)
+        self._thread.start()
+        return self
+    
+    def _label(self, code):
+        """Çərçivə adı: funksiya (fayl:sətir) - kod obyekti üzrə keşlənir"""
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+            self._labels[code] = label
+        return label
+    
+    def _sample_loop(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+            self.samples += 1
+    
+    def stop(self):
+        """Profilləşdirməni dayandırın və nəticələri toplayın"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        import tracemalloc
+        if self._own_tracemalloc and tracemalloc.is_tracing():
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            self.memory_snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            tracemalloc.stop()
+    
+    def report(self):
+        """Mətn hesabatı: axınlar, ən çox vaxt aparan funksiyalar, yaddaş ayırma yerləri"""
+        lines = [f"Profile: {self.mode}, wall {self.elapsed:.3f} s, {self.samples} samples every {self.interval * 1000:g} ms"]
+        
+        per_thread = defaultdict(lambda: defaultdict(int))
+        totals = defaultdict(int)
+        for stack, count in self.stacks.items():
+            per_thread[stack[0]][stack[-1]] += count
+            for label in set(stack[1:]):
+                totals[label] += count
+        
+        for thread, leaves in sorted(per_thread.items(), key=lambda item: -sum(item[1].values())):
+            thread_samples = sum(leaves.values())
+            lines.append(f"\n[{thread}] {thread_samples} samples - top functions (self)")
+            for label, count in sorted(leaves.items(), key=lambda item: -item[1])[:self.top]:
+                lines.append(f"  {count / thread_samples * 100:6.2f}%  {count:7d}  {label}")
+        
+        if totals:
+            all_samples = sum(self.stacks.values())
+            lines.append("\nTop functions (total, share of all thread samples)")
+            for label, count in sorted(totals.items(), key=lambda item: -item[1])[:self.top]:
+                lines.append(f"  {count / all_samples * 100:6.2f}%  {count:7d}  {label}")
+        
+        if self.memory_snapshot is not None:
+            lines.append(f"\nTop allocation sites (peak {self.memory_peak / 1024:.1f} KiB)")
+            for stat in self.memory_snapshot.statistics('lineno')[:self.top]:
+                frame = stat.traceback[0]
+                lines.append(f"  {stat.size / 1024:10.1f} KiB  {stat.count:7d}  {frame.filename}:{frame.lineno}")
+        
+        if self._cprofile is not None:
+            import io
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(self._cprofile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+            lines.append("\ncProfile (cumulative)")
+            lines.append(stream.getvalue().strip())
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, name: str = 'run'):
+        """Hesabatları logs/ qovluğuna yazın: .txt, .folded (flamegraph) və .pstats"""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"profile_{name}_{time.strftime('%Y%m%d_%H%M%S')}")
+        paths = {'report': f"{base}.txt", 'stacks': f"{base}.folded"}
+        
+        with open(paths['stacks'], 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+        with open(paths['report'], 'w', encoding='utf-8') as f:
+            f.write(self.report())
+        if self._cprofile is not None:
+            paths['pstats'] = f"{base}.pstats"
+            self._cprofile.dump_stats(paths['pstats'])
+        return paths
+
+
+# Async terminal prompts
+class AsyncPrompt:
+    """input()/getpass() çağırışlarını tək uzunömürlü oxuyucu axında icra edin ki, event loop bloklanmasın"""
+    
+    def __init__(self, reader=input, secret_reader=getpass.getpass):
+        self.reader = reader
+        self.secret_reader = secret_reader
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        # Hazırda oxunan sorğu (ləğv olunubsa, növbəti sorğu onun sətrini götürür)
+        self._current = None
+        self._thread = None
+    
+    def _serve(self):
+        """Sorğuları növbə ilə oxuyun; oxuyucu axın proses boyu bir dənədir"""
+        while True:
+            request = self._requests.get()
+            if request.future.cancelled():
+                continue
+            with self._lock:
+                self._current = request
+            try:
+                value, error = request.func(request.text), None
+            except BaseException as e:
+                value, error = None, e
+            with self._lock:
+                # Oxuma zamanı sorğu yeni sorğuya ötürülmüş ola bilər
+                request = self._current
+                self._current = None
+            request.loop.call_soon_threadsafe(self._deliver, request.future, value, error)
+    
+    @staticmethod
+    def _deliver(future, value, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+    
+    async def _run(self, func, text):
+        """Oxuma sorğusunu oxuyucu axına verin və nəticəni gözləyin"""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        adopted = False
+        with self._lock:
+            current = self._current
+            if current is not None and current.future.done() and current.func is func:
+                # Ləğv olunmuş sorğu hələ sətir gözləyir: həmin sətir bu sorğuya çatdırılır
+                current.loop, current.future, current.text = loop, future, text
+                adopted = True
+            else:
+                self._requests.put(types.SimpleNamespace(func=func, text=text, loop=loop, future=future))
+                if self._thread is None:
+                    # Daemon axın: cavab gözlənilərkən proqram çıxsa, axın prosesi saxlamır
+                    self._thread = threading.Thread(target=self._serve, name='ssg-prompt', daemon=True)
+                    self._thread.start()
+        if adopted:
+            print(text, end='', flush=True)
+        return await future
+    
+    async def ask(self, text):
+        """Sətir oxuyun (boşluqlar kəsilir)"""
+        return (await self._run(self.reader, text)).strip()
+    
+    async def secret(self, text):
+        """Şifrəni ekranda göstərmədən oxuyun"""
+        return await self._run(self.secret_reader, text)
+
+
+# Background Saved Messages notifications
+class NotificationQueue:
+    """Session bildirişlərini arxa planda göndərin; bot nəticələri bir sahib üçün bir mesajda birləşdirilir"""
+    
+    # Telegram mesaj limiti 4096 simvoldur
+    MAX_MESSAGE_LENGTH = 4000
+    
+    def __init__(self, metrics=None, flood=None, enabled: bool = True, coalesce_window: float = 2.0,
+                 max_retries: int = 3, backoff: float = 1.0, quiet: bool = False):
+        self.metrics = metrics
+        self.flood = flood
+        self.enabled = enabled
+        self.coalesce_window = coalesce_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.quiet = quiet
+        # chat -> [(client, library, mətn, close)], birləşdirmə pəncərəsi bitənə qədər
+        self.pending = {}
+        self._timers = {}
+        self._tasks = set()
+        self.sent = 0
+        self.failed = 0
+    
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    def submit(self, client, library, text, close, chat_id='me', coalesce: bool = False):
+        """Bildirişi növbəyə qoyun; client-in bağlanması (close) artıq növbənin işidir"""
+        entry = (client, library, text, close)
+        if not coalesce:
+            self._spawn(self._deliver(chat_id, [entry]))
+            return
+        self.pending.setdefault(chat_id, []).append(entry)
+        if chat_id not in self._timers:
+            self._timers[chat_id] = self._spawn(self._flush_later(chat_id))
+    
+    async def _flush_later(self, chat_id):
+        """Birləşdirmə pəncərəsindən sonra göndərin"""
+        await asyncio.sleep(self.coalesce_window)
+        self._timers.pop(chat_id, None)
+        entries = self.pending.pop(chat_id, [])
+        if entries:
+            await self._deliver(chat_id, entries)
+    
+    def _messages(self, entries):
+        """Mətnləri limitə sığan mesajlara bölün"""
+        if len(entries) == 1:
+            return [entries[0][2]]
+        header = f"**🤖 {len(entries)} Bot Sessionu Yaradıldı**"
+        messages, current = [], header
+        for _, _, text, _ in entries:
+            if len(current) + len(text) + 2 > self.MAX_MESSAGE_LENGTH:
+                messages.append(current)
+                current = header
+            current += '\n\n' + text
+        messages.append(current)
+        return messages
+    
+    async def _send(self, clients, chat_id, message):
+        """Mesajı göndərin; uğursuz olduqda gözləyib növbəti client ilə yenidən cəhd edin"""
+        for attempt in range(self.max_retries + 1):
+            client, library = clients[attempt % len(clients)]
+            try:
+                if self.flood is not None:
+                    await self.flood.call(client.send_message, chat_id, message, library=library)
+                else:
+                    await client.send_message(chat_id, message)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    if not self.quiet:
+                        print(f"{Colors.YELLOW}⚠️ Saxlanılmış Mesajlara göndərilə bilmədi: {e}{Colors.END}")
+                    return False
+                wait = FloodScheduler.flood_wait_seconds(e)
+                await asyncio.sleep(wait if wait is not None else self.backoff * 2 ** attempt)
+    
+    async def _deliver(self, chat_id, entries):
+        """Bildirişləri göndərin və client-ləri bağlayın"""
+        clients = [(client, library) for client, library, _, _ in entries]
+        try:
+            delivered = True
+            for message in self._messages(entries):
+                started = time.perf_counter()
+                ok = await self._send(clients, chat_id, message)
+                if self.metrics is not None:
+                    self.metrics.observe('saved_messages', time.perf_counter() - started, clients[0][1],
+                                         None if ok else 'SendFailed')
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                    delivered = False
+            if not self.quiet and delivered:
+                print(f"{Colors.GREEN}💾 Session məlumatları Saxlanılmış Mesajlara göndərildi!{Colors.END}")
+        finally:
+            for _, _, _, close in entries:
+                try:
+                    await close()
+                except Exception:
+                    pass
+    
+    async def drain(self):
+        """Gözləyən bütün bildirişləri dərhal göndərin və bitməsini gözləyin"""
+        while self._tasks or self.pending:
+            for chat_id in list(self.pending):
+                timer = self._timers.pop(chat_id, None)
+                if timer is not None:
+                    timer.cancel()
+                self._spawn(self._deliver(chat_id, self.pending.pop(chat_id)))
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+# QR-code login
+def login_token_url(token):
+    """auth.ExportLoginToken tokenindən tg://login linki"""
+    return 'tg://login?token=' + base64.urlsafe_b64encode(token).decode().rstrip('=')
+
+
+def render_qr(url):
+    """Linki terminalda QR kod kimi göstərin (istəyə bağlı `qrcode` paketi; yoxdursa, yalnız link)"""
+    try:
+        import qrcode
+    except ImportError:
+        qrcode = None
+    
+    if qrcode is not None:
+        qr = qrcode.QRCode(border=2)
+        qr.add_data(url)
+        qr.make(fit=True)
+        matrix = qr.get_matrix()
+        if len(matrix) % 2:
+            matrix.append([False] * len(matrix[0]))
+        # İki sıra bir simvolda: tünd fonlu terminal üçün açıq modullar dolu blokdur
+        blocks = {(False, False): '█', (False, True): '▀', (True, False): '▄', (True, True): ' '}
+        for top, bottom in zip(matrix[::2], matrix[1::2]):
+            print(''.join(blocks[pair] for pair in zip(top, bottom)))
+    else:
+        print(f"{Colors.YELLOW}💡 QR kodu göstərmək üçün: pip install qrcode{Colors.END}")
+    print(f"{Colors.WHITE}{url}{Colors.END}")
+
+
+class PyrogramQrLogin:
+    """Pyrogram üçün Telethon QRLogin interfeysi: auth.ExportLoginToken/ImportLoginToken, DC köçürməsi ilə"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.token = None
+        self.expires = None
+        self.user = None
+        self._scanned = asyncio.Event()
+        # Skan edildikdə Telegram updateLoginToken göndərir
+        handle_updates = client.handle_updates
+        
+        async def watch(updates):
+            found = [getattr(updates, 'update', None)] + list(getattr(updates, 'updates', None) or [])
+            if any(type(update).__name__ == 'UpdateLoginToken' for update in found):
+                self._scanned.set()
+            return await handle_updates(updates)
+        
+        client.handle_updates = watch
+    
+    @property
+    def url(self):
+        return login_token_url(self.token)
+    
+    async def _migrate(self, dc_id):
+        """Hesabın DC-sinə keçin (Pyrogram-ın send_code-dakı PhoneMigrate məntiqi ilə eyni)"""
+        from pyrogram.session import Auth, Session
+        client = self.client
+        await client.session.stop()
+        await client.storage.dc_id(dc_id)
+        test_mode = await client.storage.test_mode()
+        await client.storage.auth_key(await Auth(client, dc_id, test_mode).create())
+        client.session = Session(client, dc_id, await client.storage.auth_key(), test_mode)
+        await client.session.start()
+    
+    async def recreate(self):
+        """Yeni token alın; skan artıq təsdiqlənibsə, girişi tamamlayın"""
+        from pyrogram import raw
+        result = await self.client.invoke(raw.functions.auth.ExportLoginToken(
+            api_id=self.client.api_id, api_hash=self.client.api_hash, except_ids=[]
+        ))
+        if isinstance(result, raw.types.auth.LoginTokenMigrateTo):
+            await self._migrate(result.dc_id)
+            result = await self.client.invoke(raw.functions.auth.ImportLoginToken(token=result.token))
+        if isinstance(result, raw.types.auth.LoginTokenSuccess):
+            self.user = result.authorization.user
+            await self.client.storage.user_id(self.user.id)
+            await self.client.storage.is_bot(False)
+            return None
+        self.token = result.token
+        self.expires = datetime.fromtimestamp(result.expires, timezone.utc)
+        return self.token
+    
+    async def wait(self, timeout=None):
+        """Skanı gözləyin; müddət bitərsə asyncio.TimeoutError"""
+        while self.user is None:
+            # recreate() ilə wait() arasında gələn skan itməsin deyə hadisə gözləmədən sonra sıfırlanır
+            await asyncio.wait_for(self._scanned.wait(), timeout)
+            self._scanned.clear()
+            await self.recreate()
+        return self.user
+
+
+# Enhanced session generator with better error handling
+class PremiumSessionGenerator:
+    def __init__(self, quiet: bool = False, client_overrides=None):
+        self.requirements = RequirementsManager()
+        # quiet=True olduqda (batch rejimi) session nəticələri ekrana çıxarılmır
+        self.quiet = quiet
+        # Benchmark və testlər üçün: {'pyrogram': Client, 'telethon': Client, 'telethon_session': StringSession}
+        self.client_overrides = client_overrides or {}
+        self.prompt = AsyncPrompt()
+        self.setup_directories()
+        self.metrics = Metrics('logs')
+        self.store = SessionStore()
+        self.writer = SessionWriter()
+        # Bütün paralel girişlər üçün ortaq FloodWait limitləri
+        self.flood = FloodScheduler(metrics=self.metrics)
+        self.notifier = NotificationQueue(self.metrics, self.flood, quiet=quiet)
+        # Bot sessionları haqqında birləşdirilmiş bildirişlərin göndəriləcəyi sahib (chat ID və ya @username)
+        self.notify_chat = None
+        # Client vəziyyətinin saxlanması: auto, memory, sqlite, shared (bax: _storage_for)
+        self.storage = 'auto'
+        # İstifadəçi girişi: 'code' (SMS/Telegram kodu) və ya 'qr'
+        self.login_method = 'code'
+        self.qr_timeout = 300.0
+        # Bu prosesdə verilmiş və hazırda yazılan session adları (eyni saniyədə yaradılanlar toqquşmasın)
+        self._session_names = set()
+        self._saving = set()
+    
+    def unique_session_name(self, base):
+        """Nə bu prosesdə, nə diskdə, nə də indeksdə olan ad: toqquşmada _2, _3, ... əlavə olunur"""
+        name, counter = base, 1
+        while name in self._session_names or os.path.exists(f"sessions/{name}.txt") or self.store.get(name):
+            counter += 1
+            name = f"{base}_{counter}"
+        self._session_names.add(name)
+        return name
+    
+    def _library_ready(self, library):
+        """Kitabxananı yükləyin (əvəzedici client verilibsə, yükləmə lazım deyil)"""
+        if library in self.client_overrides:
+            return True
+        return load_pyrogram() if library == 'pyrogram' else load_telethon()
+    
+    def _client_class(self, library):
+        """İstifadə olunacaq client sinfi"""
+        if library in self.client_overrides:
+            return self.client_overrides[library]
+        return PyroClient if library == 'pyrogram' else TeleClient
+    
+    def _storage_for(self, library):
+        """Kitabxana üçün saxlama rejimi.
+        
+        memory - vəziyyət yalnız yaddaşda, nəticə .txt faylıdır; sqlite - hər session üçün ayrıca
+        .session faylı; shared - vəziyyət index.db-dəki client_state cədvəlinə yazılır.
+        auto: interaktiv rejimdə köhnə davranış (Pyrogram sqlite, Telethon memory), batch/daemon-da memory.
+        """
+        if self.storage != 'auto':
+            return self.storage
+        if self.quiet:
+            return 'memory'
+        return 'sqlite' if library == 'pyrogram' else 'memory'
+    
+    def setup_directories(self):
+        """Zəruri qovluqları yaradın"""
+        directories = ['sessions', 'logs', 'backups']
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+    
+    def configure(self, args):
+        """Ümumi CLI parametrlərini tətbiq edin"""
+        self.storage = getattr(args, 'storage', None) or 'auto'
+        if getattr(args, 'qr', False):
+            self.login_method = 'qr'
+        if getattr(args, 'wheelhouse', None):
+            self.requirements.wheelhouse = args.wheelhouse
+        self.configure_notifications(not getattr(args, 'no_notify', False), getattr(args, 'notify_chat', None))
+    
+    def configure_notifications(self, enabled: bool = True, notify_chat=None):
+        """Bildiriş parametrləri (--no-notify, --notify-chat)"""
+        self.notifier.enabled = enabled
+        if notify_chat:
+            notify_chat = str(notify_chat)
+            self.notify_chat = int(notify_chat) if notify_chat.lstrip('-').isdigit() else notify_chat
+    
+    def close(self):
+        """Gözləyən yazıları tamamlayın və resursları bağlayın"""
+        self.writer.close()
+        self.store.close()
+        self.metrics.close()
+    
+    def clear_screen(self):
+        """Ekranı təmizləyin"""
+        os.system('cls' if os.name == 'nt' else 'clear')
+    
+    def show_banner(self):
+        """Premium banner göstərin"""
+        banner = f"""
+{Colors.CYAN}{Colors.BOLD}
+╔══════════════════════════════════════════════════════════════╗
+║                                                              ║
+║  🌐 SESSION GENERATOR v2.0                ║
+║  🔧 Yaradan: Rzayeffdi / Ağa                                ║
+║  🚀 Gelişmiş Xüsusiyyətlərlə Təkmilləşdirilmiş              ║
+║                                                              ║
+║  📊 Sistem: {platform.system()} {platform.release()}{' '*(30-len(platform.system()+platform.release()))}║
+║  🐍 Python: {platform.python_version()}{' '*(38-len(platform.python_version()))}║
+║  🌍 Mühit: {self.requirements.environment}{' '*(30-len(self.requirements.environment))}║
+║  🔥 Pyrogram: {pyro_version if pyro_available else 'MÖVCUD DEYİL'}{' '*(35-len(pyro_version if pyro_available else 'MÖVCUD DEYİL'))}║
+║  ⚡ Telethon: {tele_version if telethon_available else 'MÖVCUD DEYİL'}{' '*(36-len(tele_version if telethon_available else 'MÖVCUD DEYİL'))}║
+║                                                              ║
+╚══════════════════════════════════════════════════════════════╝
+{Colors.END}
+        """
+        print(banner)
+    
+    async def get_credentials(self, bot: bool = False) -> Tuple[str, str, Optional[str]]:
+        """İstifadəçidən şəxsiyyət vəsiqələrini alın"""
+        print(f"\n{Colors.CYAN}🔐 Şəxsiyyət vəsiqələrinizi daxil edin:{Colors.END}")
+        
+        while True:
+            api_id = await self.prompt.ask(f"{Colors.BLUE}🔹 API_ID: {Colors.END}")
+            if api_id.isdigit() and len(api_id) >= 5:
+                break
+            print(f"{Colors.RED}❌ Yanlış API_ID! Zəhmət olmasa rəqəmlərdən ibarət etibarlı API_ID daxil edin.{Colors.END}")
+        
+        api_hash = await self.prompt.ask(f"{Colors.BLUE}🔹 API_HASH: {Colors.END}")
+        if not api_hash:
+            print(f"{Colors.RED}❌ API_HASH boş ola bilməz!{Colors.END}")
+            return await self.get_credentials(bot)
+        
+        bot_token = None
+        if bot:
+            bot_token = await self.prompt.ask(f"{Colors.BLUE}🤖 Bot Token: {Colors.END}")
+            if not bot_token:
+                print(f"{Colors.RED}❌ Bot Token boş ola bilməz!{Colors.END}")
+                return await self.get_credentials(bot)
+        
+        return api_id, api_hash, bot_token
+    
+    async def handle_user_authentication(self, client):
+        """İstifadəçi autentifikasiya əməliyyatları"""
+        phone_number = await self.prompt.ask(f"{Colors.BLUE}📞 Telefon Nömrəsi (+994...): {Colors.END}")
+        
+        sent_code = await client.send_code(phone_number)
+        print(f"{Colors.YELLOW}📲 Doğrulama kodu göndərildi...{Colors.END}")
+        
+        while True:
+            phone_code = await self.prompt.ask(f"{Colors.BLUE}🔐 SMS ilə gələn kodu daxil edin: {Colors.END}")
+            
+            try:
+                await client.sign_in(phone_number, sent_code.phone_code_hash, phone_code)
+                break
+            except PhoneCodeInvalid:
+                print(f"{Colors.RED}❌ Yanlış kod! Yenidən cəhd edin.{Colors.END}")
+            except PhoneCodeExpired:
+                print(f"{Colors.RED}❌ Kodun müddəti bitmiş! Yenidən kod istəyirəm...{Colors.END}")
+                sent_code = await client.resend_code(phone_number, sent_code.phone_code_hash)
+            except SessionPasswordNeeded:
+                print(f"{Colors.YELLOW}🔒 2FA aktiv, şifrə tələb olunur...{Colors.END}")
+                password = await self.prompt.secret(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
+                await client.check_password(password)
+                break
+    
+    def _new_result(self, lib_type, bot, session_name=None):
+        """Session yaradılması üçün strukturlaşdırılmış nəticə"""
+        return {
+            'library': lib_type,
+            'type': 'bot' if bot else 'user',
+            'session_name': session_name,
+            'ok': False,
+            'user_id': None,
+            'username': None,
+            'session_string': None,
+            'file': None,
+            'error': None,
+            'elapsed': None,
+        }
+    
+    def _fail(self, result, message, error=None):
+        """Xətanı nəticəyə yazın və göstərin"""
+        result['error'] = f"{type(error).__name__}: {error}" if error is not None else message
+        print(f"{Colors.RED}{message}{Colors.END}")
+        return result
+    
+    async def create_pyrogram_session(self, bot: bool, credentials: Optional[Tuple[str, str, Optional[str]]] = None,
+                                      session_name: Optional[str] = None):
+        """Təkmilləşdirilmiş Pyrogram session yaradın"""
+        result = self._new_result('pyrogram', bot, session_name)
+        if not self._library_ready('pyrogram'):
+            print(f"{Colors.RED}❌ Pyrogram kitabxanası mövcud deyil!{Colors.END}")
+            print(f"{Colors.YELLOW}📦 Zəhmət olmasa əvvəlcə Pyrogram quraşdırın.{Colors.END}")
+            result['error'] = 'pyrogram not available'
+            return result
+        
+        if not self.quiet:
+            print(f"\n{Colors.MAGENTA}🚀 Pyrogram {'BOT' if bot else 'İSTİFADƏÇİ'} Sessionu Yaradılır...{Colors.END}")
+        started = time.perf_counter()
+        
+        try:
+            api_id, api_hash, bot_token = credentials or await self.get_credentials(bot)
+            session_name = self.unique_session_name(session_name or f"pyrogram_{'bot' if bot else 'user'}_{int(time.time())}")
+            result['session_name'] = session_name
+            
+            # Client konfiqurasiyası - YALNIZCA name istifadə edin
+            client_config = {
+                "name": session_name,
+                "api_id": int(api_id),
+                "api_hash": api_hash,
+                "workdir": "./sessions",
+                # Yalnız 'sqlite' rejimində ayrıca .session faylı yaradılır
+                "in_memory": self._storage_for('pyrogram') != 'sqlite'
+            }
+            
+            if bot:
+                client_config["bot_token"] = bot_token
+            
+            # Client-i başlatmaq üçün xüsusi metod
+            client = await self._start_pyrogram_client(client_config, bot)
+            
+            # Session məlumatlarını alın
+            me = await self._rpc('get_me', 'pyrogram', api_id, client.get_me)
+            with self.metrics.stage('export', 'pyrogram'):
+                session_string = await client.export_session_string()
+            
+            # Nəticələri göstərin
+            with self.metrics.stage('show_results', 'pyrogram'):
+                self.show_session_results(me, session_string, "Pyrogram", "son", bot)
+            
+            # Sessionu fayla saxlayın
+            with self.metrics.stage('save', 'pyrogram'):
+                result['file'] = await self.save_session_to_file(session_name, session_string, "pyrogram", me, bot)
+            result.update(ok=True, user_id=me.id, username=me.username, session_string=session_string)
+            
+            # Bildiriş fayl saxlanıldıqdan sonra arxa planda göndərilir
+            if not self.notify_session(client, me, session_string, "Pyrogram", "son", bot, client.stop):
+                with self.metrics.stage('stop', 'pyrogram'):
+                    await client.stop()
+            
+        except ApiIdInvalid as e:
+            self._fail(result, "❌ Yanlış API_ID və ya API_HASH!", e)
+        except PhoneNumberInvalid as e:
+            self._fail(result, "❌ Yanlış telefon nömrəsi!", e)
+        except Exception as e:
+            wait = FloodScheduler.flood_wait_seconds(e)
+            if wait is not None:
+                self._fail(result, f"⏳ Telegram limiti: {int(wait)} saniyə sonra yenidən cəhd edin.", e)
+            else:
+                self._fail(result, f"❌ Gözlənilməz xəta: {e}", e)
+        
+        elapsed = time.perf_counter() - started
+        self.metrics.observe('total', elapsed, result['library'], (result['error'] or '').split(':', 1)[0] or None)
+        result['elapsed'] = round(elapsed, 3)
+        return result
+    
+    async def _timed(self, stage, library, awaitable):
+        """Arxa planda icra olunan əməliyyatın vaxtını ölçün"""
+        with self.metrics.stage(stage, library):
+            return await awaitable
+    
+    async def _rpc(self, stage, library, api_id, func, *args, **kwargs):
+        """Telegram sorğusunu ölçün və FloodWait limitləri ilə icra edin"""
+        with self.metrics.stage(stage, library):
+            return await self.flood.call(func, *args, api_id=api_id, library=library, **kwargs)
+    
+    async def _ask_phone(self):
+        """Telefon nömrəsi və ya 'qr' (QR girişi üçün None qaytarılır)"""
+        if self.login_method == 'qr':
+            return None
+        phone_number = await self.prompt.ask(f"{Colors.BLUE}📞 Telefon Nömrəsi (+994..., QR kod üçün 'qr'): {Colors.END}")
+        return None if phone_number.lower() == 'qr' else phone_number
+    
+    async def _qr_login(self, client, library, api_id):
+        """QR kodla giriş: kod müddəti bitdikdə yenilənir, skan asinxron gözlənilir"""
+        with self.metrics.stage('qr_export', library):
+            if hasattr(client, 'qr_login'):
+                qr = await client.qr_login()
+            else:
+                qr = PyrogramQrLogin(client)
+                await qr.recreate()
+        
+        deadline = time.monotonic() + self.qr_timeout
+        try:
+            while getattr(qr, 'user', None) is None:
+                # Müddət bitibsə, qəbul oluna bilməyəcək yeni kod göstərilmir
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"QR login not confirmed within {int(self.qr_timeout)}s")
+                print(f"\n{Colors.CYAN}📱 Telegram → Ayarlar → Cihazlar → Masaüstü Cihazı Qoş ilə skan edin:{Colors.END}")
+                render_qr(qr.url)
+                expires_in = (qr.expires - datetime.now(timezone.utc)).total_seconds()
+                try:
+                    return await qr.wait(max(1.0, min(remaining, expires_in)))
+                except asyncio.TimeoutError:
+                    print(f"{Colors.YELLOW}🔄 QR kodun müddəti bitdi, yenilənir...{Colors.END}")
+                    await self._rpc('qr_export', library, api_id, qr.recreate)
+            return qr.user
+        except (SessionPasswordNeeded, SessionPasswordNeededError):
+            print(f"{Colors.YELLOW}🔒 2FA aktiv, şifrə tələb olunur...{Colors.END}")
+            password = await self.prompt.secret(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
+            if library == 'telethon':
+                return await self._rpc('check_password', library, api_id, client.sign_in, password=password)
+            return await self._rpc('check_password', library, api_id, client.check_password, password)
+    
+    async def _start_pyrogram_client(self, client_config, bot: bool):
+        """Pyrogram client-i xüsusi başlatma metodu"""
+        client = self._client_class('pyrogram')(**client_config)
+        
+        try:
+            if bot:
+                # Bot üçün sadə başlatma (qoşulma + bot girişi)
+                await self._rpc('start', 'pyrogram', client_config['api_id'], client.start)
+            else:
+                # İstifadəçi üçün xüsusi başlatma: DC-yə qoşulma nömrə daxil edilərkən arxa planda gedir
+                connecting = asyncio.ensure_future(self._timed('connect', 'pyrogram', client.connect()))
+                
+                # Telefon nömrəsini alın
+                try:
+                    phone_number = await self._ask_phone()
+                except BaseException:
+                    connecting.cancel()
+                    raise
+                await connecting
+                
+                if phone_number is None:
+                    await self._qr_login(client, 'pyrogram', client_config['api_id'])
+                    return client
+                
+                # Kodu göndərin
+                sent_code = await self._rpc('send_code', 'pyrogram', client_config['api_id'], client.send_code, phone_number)
+                print(f"{Colors.YELLOW}📲 Doğrulama kodu göndərildi...{Colors.END}")
                 
                 # Kodu alın
-                phone_code = input(f"{Colors.BLUE}🔐 SMS ilə gələn kodu daxil edin: {Colors.END}").strip()
+                phone_code = await self.prompt.ask(f"{Colors.BLUE}🔐 SMS ilə gələn kodu daxil edin: {Colors.END}")
                 
                 try:
-                    await client.sign_in(phone_number, sent_code.phone_code_hash, phone_code)
+                    await self._rpc('sign_in', 'pyrogram', client_config['api_id'], client.sign_in,
+                                    phone_number, sent_code.phone_code_hash, phone_code)
                 except SessionPasswordNeeded:
                     print(f"{Colors.YELLOW}🔒 2FA aktiv, şifrə tələb olunur...{Colors.END}")
-                    password = getpass.getpass(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
-                    await client.check_password(password)
+                    password = await self.prompt.secret(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
+                    await self._rpc('check_password', 'pyrogram', client_config['api_id'], client.check_password, password)
             
             return client
             
-        except Exception as e:
-            print(f"{Colors.RED}❌ Client başlatma xətası: {e}{Colors.END}")
-            await client.disconnect()
-            return None
+        except Exception:
+            # Xəta çağıran metodda göstərilir
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+            raise
     
-    async def create_telethon_session(self, bot: bool):
+    async def create_telethon_session(self, bot: bool, credentials: Optional[Tuple[str, str, Optional[str]]] = None,
+                                      session_name: Optional[str] = None):
         """Təkmilləşdirilmiş Telethon session yaradın"""
-        if not telethon_available:
+        result = self._new_result('telethon', bot, session_name)
+        if not self._library_ready('telethon'):
             print(f"{Colors.RED}❌ Telethon kitabxanası mövcud deyil!{Colors.END}")
             print(f"{Colors.YELLOW}📦 Zəhmət olmasa əvvəlcə Telethon quraşdırın.{Colors.END}")
-            return
+            result['error'] = 'telethon not available'
+            return result
         
-        print(f"\n{Colors.MAGENTA}⚡ Telethon {'BOT' if bot else 'İSTİFADƏÇİ'} Sessionu Yaradılır...{Colors.END}")
+        if not self.quiet:
+            print(f"\n{Colors.MAGENTA}⚡ Telethon {'BOT' if bot else 'İSTİFADƏÇİ'} Sessionu Yaradılır...{Colors.END}")
+        started = time.perf_counter()
         
         try:
-            api_id, api_hash, bot_token = await self.get_credentials(bot)
-            session_name = f"telethon_{'bot' if bot else 'user'}_{int(time.time())}"
+            api_id, api_hash, bot_token = credentials or await self.get_credentials(bot)
+            session_name = self.unique_session_name(session_name or f"telethon_{'bot' if bot else 'user'}_{int(time.time())}")
+            result['session_name'] = session_name
             
-            client = TeleClient(TeleString(), int(api_id), api_hash)
+            string_session = self.client_overrides.get('telethon_session') or TeleString
+            # 'sqlite' rejimində Telethon sessions/<ad>.session faylından istifadə edir
+            session = f"sessions/{session_name}" if self._storage_for('telethon') == 'sqlite' else string_session()
+            client = self._client_class('telethon')(session, int(api_id), api_hash)
             
             if bot:
-                await client.start(bot_token=bot_token)
+                await self._rpc('start', 'telethon', api_id, client.start, bot_token=bot_token)
             else:
-                phone_number = input(f"{Colors.BLUE}📞 Telefon Nömrəsi (+994...): {Colors.END}").strip()
-                await client.start(phone=phone_number)
+                # DC-yə qoşulma nömrə daxil edilərkən arxa planda gedir
+                connecting = asyncio.ensure_future(self._timed('connect', 'telethon', client.connect()))
+                try:
+                    phone_number = await self._ask_phone()
+                except BaseException:
+                    connecting.cancel()
+                    raise
+                await connecting
+                
+                if phone_number is None:
+                    await self._qr_login(client, 'telethon', api_id)
+                else:
+                    # Telethon start() kod göndərmə və girişi birlikdə edir; sorğular asinxrondur
+                    await self._rpc(
+                        'start', 'telethon', api_id, client.start,
+                        phone=phone_number,
+                        code_callback=lambda: self.prompt.ask(f"{Colors.BLUE}🔐 SMS ilə gələn kodu daxil edin: {Colors.END}"),
+                        password=lambda: self.prompt.secret(f"{Colors.BLUE}🔑 2FA Şifrəsini daxil edin: {Colors.END}")
+                    )
             
-            me = await client.get_me()
-            session_string = client.session.save()
+            me = await self._rpc('get_me', 'telethon', api_id, client.get_me)
+            with self.metrics.stage('export', 'telethon'):
+                # SQLiteSession.save() sətir qaytarmır; StringSession.save istənilən sessionu kodlaşdırır
+                session_string = string_session.save(client.session)
             
-            await self.show_session_results(client, me, session_string, "Telethon", "son", bot)
-            await self.save_session_to_file(session_name, session_string, "telethon")
+            with self.metrics.stage('show_results', 'telethon'):
+                self.show_session_results(me, session_string, "Telethon", "son", bot)
+            with self.metrics.stage('save', 'telethon'):
+                result['file'] = await self.save_session_to_file(session_name, session_string, "telethon", me, bot)
+            result.update(ok=True, user_id=me.id, username=me.username, session_string=session_string)
             
-            await client.disconnect()
+            if not self.notify_session(client, me, session_string, "Telethon", "son", bot, client.disconnect):
+                with self.metrics.stage('stop', 'telethon'):
+                    await client.disconnect()
             
         except Exception as e:
-            print(f"{Colors.RED}❌ Xəta: {e}{Colors.END}")
+            wait = FloodScheduler.flood_wait_seconds(e)
+            if wait is not None:
+                self._fail(result, f"⏳ Telegram limiti: {int(wait)} saniyə sonra yenidən cəhd edin.", e)
+            else:
+                self._fail(result, f"❌ Xəta: {e}", e)
+        
+        elapsed = time.perf_counter() - started
+        self.metrics.observe('total', elapsed, result['library'], (result['error'] or '').split(':', 1)[0] or None)
+        result['elapsed'] = round(elapsed, 3)
+        return result
     
-    async def show_session_results(self, client, me, session_string, lib_name, version, bot):
+    def show_session_results(self, me, session_string, lib_name, version, bot):
         """Session nəticələrini göstərin"""
+        if self.quiet:
+            return
+        
         print(f"\n{Colors.GREEN}{Colors.BOLD}✅ {lib_name} Sessionu Uğurla Yaradıldı!{Colors.END}")
         print(f"{Colors.CYAN}┌───────────────────────────────────────────────{Colors.END}")
         print(f"{Colors.CYAN}│ 👤 Ad: {me.first_name or me.username}{Colors.END}")
@@ -490,12 +3359,11 @@ class PremiumSessionGenerator:
         
         print(f"\n{Colors.YELLOW}📦 Session Sətiri:{Colors.END}")
         print(f"{Colors.WHITE}{session_string}{Colors.END}\n")
-        
-        # Saxlanılmış Mesajlara göndərin
-        try:
-            await client.send_message(
-                "me",
-                f"""**✅ {lib_name} {'Bot' if bot else 'İstifadəçi'} Sessionu Yaradıldı!**
+    
+    @staticmethod
+    def session_message(me, session_string, lib_name, version, bot):
+        """Saxlanılmış Mesajlar üçün mətn"""
+        return f"""**✅ {lib_name} {'Bot' if bot else 'İstifadəçi'} Sessionu Yaradıldı!**
 
 👤 **Ad:** `{me.first_name or me.username}`
 🆔 **ID:** `{me.id}`
@@ -505,39 +3373,283 @@ class PremiumSessionGenerator:
 ⏰ **Vaxt:** `{time.strftime('%Y-%m-%d %H:%M:%S')}`
 
 `{session_string}`"""
-            )
-            print(f"{Colors.GREEN}💾 Session məlumatları Saxlanılmış Mesajlara göndərildi!{Colors.END}")
-        except Exception as e:
-            print(f"{Colors.YELLOW}⚠️ Saxlanılmış Mesajlara göndərilə bilmədi: {e}{Colors.END}")
     
-    async def save_session_to_file(self, session_name, session_string, lib_type):
-        """Sessionu fayla saxlayın"""
+    def notify_session(self, client, me, session_string, lib_name, version, bot, close):
+        """Bildirişi növbəyə qoyun; True qaytarılırsa, client-i növbə bağlayacaq"""
+        if not self.notifier.enabled:
+            return False
+        if bot:
+            # Botlar "me"-yə yaza bilməz: nəticələr sahibə bir mesajda göndərilir
+            if not self.notify_chat:
+                return False
+            text = f"🤖 `@{me.username or me.id}` ({lib_name})\n`{session_string}`"
+            self.notifier.submit(client, lib_name.lower(), text, close, chat_id=self.notify_chat, coalesce=True)
+        else:
+            message = self.session_message(me, session_string, lib_name, version, bot)
+            self.notifier.submit(client, lib_name.lower(), message, close)
+        return True
+    
+    async def save_session_to_file(self, session_name, session_string, lib_type, me=None, bot: bool = False,
+                                   identity: bool = True, overwrite: bool = False):
+        """Sessionu fayla saxlayın (identity=True: me get_me() nəticəsidir və keşə yazılır)"""
         filename = f"sessions/{session_name}.txt"
+        # os.replace mövcud faylın üzərinə səssizcə yazardı: başqa sessionu itirməmək üçün rədd edilir
+        if filename in self._saving or (not overwrite and os.path.exists(filename)):
+            print(f"{Colors.RED}❌ {filename} artıq mövcuddur, session üzərinə yazılmadı{Colors.END}")
+            return None
+        content = (
+            f"# {lib_type.upper()} SESSION SƏTİRİ\n"
+            f"# Yaradıldı: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"# BUNU HEÇ KİMƏ GÖSTƏRMEYİN!\n\n"
+            f"{session_string}"
+        )
+        index_row = {
+            'name': session_name,
+            'library': lib_type,
+            'kind': 'bot' if bot else 'user',
+            'path': filename,
+            'user_id': getattr(me, 'id', None),
+            'username': getattr(me, 'username', None),
+        }
+        try:
+            index_row['auth_key_hash'] = SessionConverter.auth_key_hash(session_string, lib_type)
+        except (ValueError, struct.error):
+            pass
+        if self._storage_for(lib_type) == 'shared':
+            index_row['client_state'] = session_string
+        if identity and me is not None:
+            dc_id = SessionValidator.session_dc(lib_type, session_string)
+            index_row['identity'] = (IdentityCache.key(session_string), IdentityCache.identity_from(me, dc_id))
+        self._saving.add(filename)
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(f"# {lib_type.upper()} SESSION SƏTİRİ\n")
-                f.write(f"# Yaradıldı: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# BUNU HEÇ KİMƏ GÖSTƏRMEYİN!\n\n")
-                f.write(session_string)
+            await self.writer.write(filename, content, index_row)
             
-            print(f"{Colors.GREEN}💾 Session fayla saxlandı: {filename}{Colors.END}")
+            if not self.quiet:
+                print(f"{Colors.GREEN}💾 Session fayla saxlandı: {filename}{Colors.END}")
+            return filename
+        except IndexUpdateError as e:
+            print(f"{Colors.YELLOW}⚠️ Session fayla saxlandı ({filename}), amma indeks yenilənmədi: {e.error} - 'reindex' edin{Colors.END}")
+            return filename
         except Exception as e:
             print(f"{Colors.RED}❌ Fayla yazma xətası: {e}{Colors.END}")
+            return None
+        finally:
+            self._saving.discard(filename)
+    
+    def attach_identities(self, rows):
+        """Sətirlərə keşdəki kimliyi əlavə edin (şəbəkəsiz)"""
+        strings = {}
+        for row in rows:
+            try:
+                strings[row['name']] = SessionStore.read_session_string(row['path'])
+            except OSError:
+                strings[row['name']] = ''
+        entries = self.store.identities.get_many([s for s in strings.values() if s])
+        for row in rows:
+            session_string = strings[row['name']]
+            entry = entries.get(IdentityCache.key(session_string)) if session_string else None
+            row['first_name'] = entry['first_name'] if entry else None
+            row['identity_stale'] = entry is None or entry['stale']
+        return rows
+    
+    @staticmethod
+    def print_session_rows(rows, start: int = 1):
+        """Session sətirlərini cədvəl şəklində göstərin (* - kimlik keşi köhnəlib)"""
+        for i, row in enumerate(rows, start):
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(row['created_at']))
+            username = f"@{row['username']}" if row['username'] else '-'
+            first_name = (row.get('first_name') or '-')[:16] + ('*' if row.get('first_name') and row.get('identity_stale') else '')
+            status = row.get('status') or '-'
+            color = {'alive': Colors.GREEN, 'revoked': Colors.RED, 'error': Colors.YELLOW}.get(status, Colors.WHITE)
+            print(f"  {i:>4}. {Colors.WHITE}{row['name']:<40}{Colors.END} {row['library']:<9} {row['type']:<5} "
+                  f"{str(row['user_id'] or '-'):<12} {username:<20} {first_name:<17} {created}  {color}{status}{Colors.END}")
     
-    async def show_session_manager(self):
+    async def show_session_manager(self, page_size: int = 20):
         """Session meneceri"""
         print(f"\n{Colors.CYAN}📊 Session Meneceri{Colors.END}")
         
-        if os.path.exists('sessions'):
-            sessions = [f for f in os.listdir('sessions') if f.endswith('.txt')]
-            if sessions:
-                print(f"{Colors.GREEN}📁 Mövcud Sessionlar:{Colors.END}")
-                for i, session in enumerate(sessions, 1):
-                    print(f"  {i}. {session}")
-            else:
-                print(f"{Colors.YELLOW}📁 Hələ ki, session faylı yoxdur.{Colors.END}")
-        else:
+        if not os.path.exists('sessions'):
             print(f"{Colors.RED}📁 Sessions qovluğu tapılmadı.{Colors.END}")
+            return
+        
+        filters = {}
+        cursors = [None]  # hər səhifənin başlanğıc nöqtəsi
+        client_factory = None  # köhnə kimlikləri yeniləmək üçün, ilk tələbdə yaradılır
+        
+        while True:
+            total = self.store.count(**filters)
+            if total == 0 and not filters:
+                print(f"{Colors.YELLOW}📁 Hələ ki, session faylı yoxdur. İndeksi yeniləmək üçün 'r' seçin.{Colors.END}")
+            
+            rows = self.attach_identities(self.store.page(limit=page_size, after=cursors[-1], **filters))
+            start = (len(cursors) - 1) * page_size + 1
+            active = ', '.join(f"{key}={value}" for key, value in filters.items()) or 'yoxdur'
+            
+            print(f"{Colors.GREEN}📁 Mövcud Sessionlar: {total} (filtr: {active}){Colors.END}")
+            self.print_session_rows(rows, start)
+            
+            command = (await self.prompt.ask(f"{Colors.CYAN}[n] növbəti  [p] əvvəlki  [f] filtr  [s] axtar  [c] filtri sıfırla  "
+                                             f"[i] köhnə kimlikləri yenilə  [r] yenidən indekslə  [q] çıxış: {Colors.END}")).lower()
+            
+            if command == 'n' and len(rows) == page_size:
+                cursors.append(rows[-1])
+            elif command == 'p' and len(cursors) > 1:
+                cursors.pop()
+            elif command == 'f':
+                library = (await self.prompt.ask(f"{Colors.BLUE}📚 Kitabxana (pyrogram/telethon, boş = hamısı): {Colors.END}")).lower()
+                kind = (await self.prompt.ask(f"{Colors.BLUE}🤖 Növ (bot/user, boş = hamısı): {Colors.END}")).lower()
+                filters.pop('library', None)
+                filters.pop('kind', None)
+                if library:
+                    filters['library'] = library
+                if kind:
+                    filters['kind'] = kind
+                cursors = [None]
+            elif command == 's':
+                search = (await self.prompt.ask(f"{Colors.BLUE}🔎 Ad, istifadəçi adı və ya ID: {Colors.END}")).lstrip('@')
+                if search:
+                    filters['search'] = search
+                else:
+                    filters.pop('search', None)
+                cursors = [None]
+            elif command == 'c':
+                filters = {}
+                cursors = [None]
+            elif command == 'i':
+                stale = [row for row in rows if row['identity_stale']]
+                if not stale:
+                    print(f"{Colors.GREEN}✅ Bu səhifədəki kimliklər aktualdır.{Colors.END}")
+                    continue
+                if client_factory is None:
+                    api_id, api_hash, _ = await self.get_credentials(False)
+                    client_factory = TelegramClientFactory(api_id, api_hash)
+                validator = SessionValidator(self.store, client_factory, flood=self.flood)
+                self.print_validation_summary(await validator.run(stale))
+            elif command == 'r':
+                indexed, removed = self.store.rebuild()
+                print(f"{Colors.GREEN}🔄 {indexed} fayl indeksləndi, {removed} köhnə qeyd silindi.{Colors.END}")
+                cursors = [None]
+            elif command in ('q', ''):
+                break
+    
+    def converted_session_name(self, name, target):
+        """Çevrilmiş session üçün ad: kitabxana prefiksini hədəflə əvəz edin"""
+        match = SessionStore.NAME_RE.match(name)
+        if match:
+            return f"{target}_{name[len(match.group(1)) + 1:]}"
+        return f"{target}_{name}"
+    
+    def convert_session_row(self, row, target, api_id=0):
+        """İndeksdəki bir sessionu digər kitabxananın formatına çevirin"""
+        session_string = SessionStore.read_session_string(row['path'])
+        if target == 'telethon':
+            return SessionConverter.pyrogram_to_telethon(session_string)
+        return SessionConverter.telethon_to_pyrogram(
+            session_string, row['user_id'], row['type'] == 'bot', api_id
+        )
+    
+    async def convert_sessions(self, target, api_id=0, kind=None, overwrite=False):
+        """İndeksdəki bütün uyğun sessionları hədəf formata çevirin və saxlayın"""
+        source = 'pyrogram' if target == 'telethon' else 'telethon'
+        saves, failed, skipped = [], [], 0
+        
+        for row in list(self.store.iter_all(library=source, kind=kind)):
+            name = self.converted_session_name(row['name'], target)
+            if not overwrite and self.store.get(name):
+                skipped += 1
+                continue
+            try:
+                converted = self.convert_session_row(row, target, api_id)
+            except (ValueError, OSError) as e:
+                failed.append((row['name'], str(e)))
+                continue
+            me = argparse.Namespace(id=row['user_id'], username=row['username'])
+            saves.append(self.save_session_to_file(name, converted, target, me, row['type'] == 'bot', identity=False,
+                                                   overwrite=overwrite))
+        
+        saved = [path for path in await asyncio.gather(*saves) if path]
+        return len(saved), failed, skipped
+    
+    async def show_session_converter(self):
+        """Session çeviricisi (şəbəkəsiz)"""
+        print(f"\n{Colors.CYAN}🔁 Session Çeviricisi (Pyrogram ⇄ Telethon, şəbəkəsiz){Colors.END}")
+        
+        session_string = await self.prompt.ask(f"{Colors.BLUE}📦 Session sətri: {Colors.END}")
+        try:
+            source = SessionConverter.detect(session_string)
+        except ValueError as e:
+            print(f"{Colors.RED}❌ {e}{Colors.END}")
+            return
+        
+        try:
+            if source == 'pyrogram':
+                parts = SessionConverter.decode_pyrogram(session_string)
+                target = 'telethon'
+                converted = SessionConverter.pyrogram_to_telethon(session_string)
+                user_id, bot = parts['user_id'], parts['is_bot']
+            else:
+                target = 'pyrogram'
+                user_id = await self.prompt.ask(f"{Colors.BLUE}🆔 Hesabın user ID-si: {Colors.END}")
+                bot = (await self.prompt.ask(f"{Colors.BLUE}🤖 Bot sessionudur? (e/h): {Colors.END}")).lower() in ('e', 'y', 'yes', 'he', 'bəli')
+                api_id = await self.prompt.ask(f"{Colors.BLUE}🔹 API_ID (boş buraxıla bilər): {Colors.END}")
+                converted = SessionConverter.telethon_to_pyrogram(
+                    session_string, int(user_id) if user_id.isdigit() else 0, bot,
+                    int(api_id) if api_id.isdigit() else 0
+                )
+                user_id = int(user_id)
+        except ValueError as e:
+            print(f"{Colors.RED}❌ Çevirmə xətası: {e}{Colors.END}")
+            return
+        
+        print(f"\n{Colors.GREEN}✅ {source.capitalize()} → {target.capitalize()}{Colors.END}")
+        print(f"{Colors.WHITE}{converted}{Colors.END}\n")
+        
+        if (await self.prompt.ask(f"{Colors.CYAN}💾 Fayla saxlanılsın? (e/h): {Colors.END}")).lower() in ('e', 'y', 'yes', 'he', 'bəli'):
+            session_name = self.unique_session_name(f"{target}_{'bot' if bot else 'user'}_{int(time.time())}")
+            me = argparse.Namespace(id=user_id, username=None)
+            await self.save_session_to_file(session_name, converted, target, me, bot)
+    
+    async def validate_sessions(self, client_factory, concurrency: int = 50, timeout: float = 30.0,
+                                client_pool=None, journal=None, retry_failed: bool = False, **filters):
+        """İndeksdəki sessionları yoxlayın və statusu yeniləyin (journal verilərsə, bitmişlər atlanır)"""
+        rows = list(self.store.iter_all(**filters))
+        skipped = 0
+        if journal is not None:
+            pending = [row for row in rows if not journal.finished(row['name'], retry_failed)]
+            skipped = len(rows) - len(pending)
+            rows = pending
+        
+        def record(results):
+            # Yalnız indeksə yazılmış statuslar bitmiş sayılır, əks halda davam etmədə itərdi
+            for result in results:
+                journal.record(result['name'], result['status'] != 'error', status=result['status'], error=result['error'])
+        
+        validator = SessionValidator(self.store, client_factory, concurrency, timeout,
+                                     client_pool=client_pool, flood=self.flood)
+        summary = await validator.run(rows, on_flush=record if journal is not None else None)
+        summary['skipped'] = skipped
+        return summary
+    
+    async def show_session_validator(self):
+        """Saxlanılmış sessionları yoxlayın"""
+        print(f"\n{Colors.CYAN}🩺 Session Yoxlanışı{Colors.END}")
+        total = self.store.count()
+        if total == 0:
+            print(f"{Colors.YELLOW}📁 İndeksdə session yoxdur.{Colors.END}")
+            return
+        
+        print(f"{Colors.WHITE}📁 {total} session yoxlanılacaq (Telethon üçün API məlumatları tələb olunur).{Colors.END}")
+        api_id, api_hash, _ = await self.get_credentials(False)
+        summary = await self.validate_sessions(TelegramClientFactory(api_id, api_hash))
+        self.print_validation_summary(summary)
+    
+    @staticmethod
+    def print_validation_summary(summary):
+        """Yoxlama xülasəsini göstərin"""
+        print(f"{Colors.GREEN}✅ Aktiv: {summary['alive']}{Colors.END}  "
+              f"{Colors.RED}⛔ Ləğv edilib: {summary['revoked']}{Colors.END}  "
+              f"{Colors.YELLOW}⚠️ Xəta: {summary['error']}{Colors.END}")
+        print(f"{Colors.CYAN}⏱️  {summary['total']} session, {summary['elapsed']} s{Colors.END}")
     
     async def system_info(self):
         """Sistem məlumatlarını göstərin"""
@@ -570,6 +3682,8 @@ class PremiumSessionGenerator:
 {Colors.BLUE}4️⃣  Telethon Bot Sessionu{Colors.END}
 {Colors.YELLOW}5️⃣  Session Meneceri{Colors.END}
 {Colors.MAGENTA}6️⃣  Sistem Məlumatları{Colors.END}
+{Colors.WHITE}7️⃣  Session Çeviricisi (Pyrogram ⇄ Telethon){Colors.END}
+{Colors.GREEN}8️⃣  Sessionları Yoxla{Colors.END}
 {Colors.RED}0️⃣  Çıxış{Colors.END}
 
 {Colors.CYAN}┌───────────────────────────────────────────────{Colors.END}
@@ -579,7 +3693,7 @@ class PremiumSessionGenerator:
             """
             print(menu)
             
-            choice = input(f"{Colors.BOLD}🔸 Seçiminiz (0-6): {Colors.END}").strip()
+            choice = await self.prompt.ask(f"{Colors.BOLD}🔸 Seçiminiz (0-8): {Colors.END}")
             
             if choice == "1":
                 if pyro_available:
@@ -605,6 +3719,10 @@ class PremiumSessionGenerator:
                 await self.show_session_manager()
             elif choice == "6":
                 await self.system_info()
+            elif choice == "7":
+                await self.show_session_converter()
+            elif choice == "8":
+                await self.show_session_validator()
             elif choice == "0":
                 print(f"\n{Colors.GREEN}👋 Görüşənədək!{Colors.END}")
                 break
@@ -612,11 +3730,1119 @@ class PremiumSessionGenerator:
                 print(f"{Colors.RED}❌ Yanlış seçim!{Colors.END}")
             
             if choice != "0":
-                input(f"\n{Colors.CYAN}⏎ Davam etmək üçün Enter düyməsini basın...{Colors.END}")
+                await self.prompt.ask(f"\n{Colors.CYAN}⏎ Davam etmək üçün Enter düyməsini basın...{Colors.END}")
+
+# Multiple API_ID/API_HASH pairs
+class ApiCredential:
+    """Bir API_ID/API_HASH cütü və onun istifadə statistikası"""
+    
+    def __init__(self, api_id, api_hash):
+        self.api_id = str(api_id)
+        self.api_hash = api_hash
+        self.in_flight = 0
+        self.used = 0
+        self.succeeded = 0
+        self.errors = 0
+        self.flood_waits = 0
+    
+    def record(self, result):
+        """Session yaradılmasının nəticəsini qeyd edin"""
+        if result['ok']:
+            self.succeeded += 1
+            return
+        self.errors += 1
+        if (result['error'] or '').split(':', 1)[0] in FloodScheduler.FLOOD_ERRORS:
+            self.flood_waits += 1
+    
+    def stats(self):
+        return {
+            'api_id': self.api_id,
+            'in_flight': self.in_flight,
+            'used': self.used,
+            'succeeded': self.succeeded,
+            'errors': self.errors,
+            'flood_waits': self.flood_waits,
+        }
+
+
+class CredentialPool:
+    """İşi bir neçə API cütü arasında bölün: FloodWait gözləməsində olmayan və ən az yüklənmiş cüt seçilir"""
+    
+    def __init__(self, credentials, flood: Optional[FloodScheduler] = None):
+        self.credentials = [cred if isinstance(cred, ApiCredential) else ApiCredential(*cred) for cred in credentials]
+        if not self.credentials:
+            raise ValueError('at least one API_ID/API_HASH pair is required')
+        # Gözləmə vəziyyəti FloodScheduler-in api_id bucket-lərindən oxunur
+        self.flood = flood
+    
+    def __len__(self):
+        return len(self.credentials)
+    
+    @classmethod
+    def from_file(cls, path, flood=None):
+        """JSON faylından oxuyun: [{"api_id": ..., "api_hash": ...}] və ya {"api_id": "api_hash"}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            pairs = list(data.items())
+        else:
+            pairs = [(item['api_id'], item['api_hash']) for item in data]
+        return cls(pairs, flood)
+    
+    @classmethod
+    def parse(cls, values, flood=None):
+        """'API_ID:API_HASH' sətirlərindən yaradın"""
+        pairs = []
+        for value in values:
+            api_id, sep, api_hash = value.partition(':')
+            if not sep or not api_id.strip().isdigit() or not api_hash.strip():
+                raise ValueError(f"expected API_ID:API_HASH, got {value!r}")
+            pairs.append((api_id.strip(), api_hash.strip()))
+        return cls(pairs, flood)
+    
+    def cooldown(self, credential):
+        """Cütün FloodWait səbəbilə bloklu qalacağı müddət (saniyə)"""
+        if self.flood is None:
+            return 0.0
+        bucket = self.flood.buckets.get(('api', credential.api_id))
+        if bucket is None:
+            return 0.0
+        return max(0.0, bucket.blocked_until - time.monotonic())
+    
+    def pick(self):
+        """Gözləmədə olmayan, ən az aktiv tapşırığı olan cütü seçin"""
+        return min(self.credentials, key=lambda cred: (self.cooldown(cred), cred.in_flight, cred.used))
+    
+    @contextlib.contextmanager
+    def lease(self):
+        """Cütü tapşırıq müddətinə götürün"""
+        credential = self.pick()
+        credential.in_flight += 1
+        credential.used += 1
+        try:
+            yield credential
+        finally:
+            credential.in_flight -= 1
+    
+    def stats(self):
+        return [credential.stats() for credential in self.credentials]
+
+
+# Crash-resumable job journal
+class JobJournal:
+    """Batch/validate işləri üçün yalnız əlavə olunan JSONL jurnal; yenidən başladıldıqda bitmiş elementlər atlanır"""
+    
+    def __init__(self, path, kind, params=None):
+        self.path = path
+        self.kind = kind
+        self.params = params or {}
+        # element açarı -> son vəziyyət ('done' və ya 'failed')
+        self.states = {}
+        self._file = None
+    
+    @classmethod
+    def for_job(cls, name, kind, params=None, directory='jobs'):
+        """jobs/<ad>.jsonl jurnalı"""
+        return cls(os.path.join(directory, f"{name}.jsonl"), kind, params)
+    
+    @staticmethod
+    def token_key(token):
+        """Tokenin özü jurnala yazılmır, yalnız hash-i"""
+        return hashlib.sha256(token.encode()).hexdigest()[:32]
+    
+    def open(self):
+        """Mövcud jurnalı oxuyun və əlavə etmək üçün açın"""
+        exists = os.path.exists(self.path)
+        if exists:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Qəza zamanı yarımçıq qalmış son sətir
+                        continue
+                    if 'job' in entry:
+                        if entry.get('kind') != self.kind:
+                            raise ValueError(f"{self.path} is a '{entry.get('kind')}' journal, not '{self.kind}'")
+                        continue
+                    self.states[entry['key']] = entry['state']
+        else:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if not exists:
+            self._write({'job': os.path.splitext(os.path.basename(self.path))[0], 'kind': self.kind,
+                         'created_at': time.time(), 'params': self.params})
+        return self
+    
+    def _write(self, entry):
+        # fsync yoxdur: flush proses çökməsindən qoruyur və hər element üçün mikrosaniyələr çəkir
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._file.flush()
+    
+    def finished(self, key, retry_failed: bool = False):
+        state = self.states.get(key)
+        return state == 'done' or (state == 'failed' and not retry_failed)
+    
+    def record(self, key, ok, **fields):
+        """Elementin nəticəsini yazın"""
+        state = 'done' if ok else 'failed'
+        self.states[key] = state
+        entry = {'key': key, 'state': state, 't': round(time.time(), 3)}
+        entry.update(fields)
+        self._write(entry)
+    
+    def counts(self):
+        done = sum(1 for state in self.states.values() if state == 'done')
+        return {'done': done, 'failed': len(self.states) - done}
+    
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self.open()
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Non-interactive batch mode
+class BatchRunner:
+    """Bot tokenləri üçün interaktiv olmayan paralel session yaradılması"""
+    
+    def __init__(self, generator, api_id=None, api_hash=None, library='pyrogram', concurrency: int = 10,
+                 pool: Optional[CredentialPool] = None):
+        self.generator = generator
+        self.pool = pool or CredentialPool([(api_id, api_hash)])
+        if self.pool.flood is None:
+            self.pool.flood = generator.flood
+        self.library = library
+        self.concurrency = max(1, concurrency)
+    
+    @staticmethod
+    def read_tokens(path):
+        """Token faylını oxuyun (boş sətirlər və # şərhləri atlanır)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            tokens = [line.strip() for line in f]
+        return [token for token in tokens if token and not token.startswith('#')]
+    
+    @staticmethod
+    def token_id(bot_token):
+        """Tokenin açıq hissəsi (bot ID) - nəticələrdə tokenin özü saxlanılmır"""
+        return bot_token.split(':', 1)[0]
+    
+    async def generate(self, bot_token):
+        """Bir bot tokeni üçün session yaradın"""
+        # Eyni saniyədə eyni bot üçün ikinci ad generator tərəfindən _2, _3, ... ilə unikallaşdırılır
+        session_name = f"{self.library}_bot_{self.token_id(bot_token)}_{int(time.time())}"
+        
+        with self.pool.lease() as credential:
+            credentials = (credential.api_id, credential.api_hash, bot_token)
+            if self.library == 'pyrogram':
+                result = await self.generator.create_pyrogram_session(True, credentials, session_name)
+            else:
+                result = await self.generator.create_telethon_session(True, credentials, session_name)
+            credential.record(result)
+        
+        result['token_id'] = self.token_id(bot_token)
+        result['api_id'] = credential.api_id
+        return result
+    
+    async def run(self, tokens, output=None, on_result=None, journal: Optional[JobJournal] = None,
+                  retry_failed: bool = False):
+        """Bütün tokenləri paralel emal edin və hər nəticəni JSON sətri kimi yazın"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        skipped = 0
+        if journal is not None:
+            pending = [token for token in tokens if not journal.finished(journal.token_key(token), retry_failed)]
+            skipped = len(tokens) - len(pending)
+            tokens = pending
+        
+        async def worker(bot_token):
+            async with semaphore:
+                result = await self.generate(bot_token)
+            if journal is not None:
+                journal.record(journal.token_key(bot_token), result['ok'], token_id=result['token_id'],
+                               session=result['session_name'], error=result['error'])
+            return result
+        
+        started = time.perf_counter()
+        succeeded = failed = 0
+        
+        with open(output, 'a', encoding='utf-8') if output else contextlib.nullcontext() as out:
+            for future in asyncio.as_completed([worker(token) for token in tokens]):
+                result = await future
+                if out is not None:
+                    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    out.flush()
+                if on_result:
+                    on_result(result)
+                
+                if result['ok']:
+                    succeeded += 1
+                else:
+                    failed += 1
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'total': len(tokens),
+            'succeeded': succeeded,
+            'failed': failed,
+            'skipped': skipped,
+            'elapsed': round(elapsed, 3),
+            'per_second': round(len(tokens) / elapsed, 2) if elapsed else 0.0,
+            'output': output,
+            'credentials': self.pool.stats(),
+        }
+
+
+# Resident daemon over a local Unix socket
+DEFAULT_SOCKET = 'ssg.sock'
+# Böyük token siyahıları bir sətirdə göndərilə bilər
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+class SessionDaemon:
+    """PremiumSessionGenerator-u isti saxlayan və JSON sorğularına Unix socket üzərindən cavab verən xidmət"""
+    
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, max_clients: int = 200, snapshot_interval: float = 60.0,
+                 credential_pool: Optional[CredentialPool] = None, options=None):
+        self.socket_path = socket_path
+        # Ümumi CLI parametrləri (--storage, --no-notify, --notify-chat)
+        self.options = options
+        self.max_clients = max_clients
+        # Sorğuda api_id verilməyibsə, bütün 'generate' sorğuları bu hovuzu paylaşır
+        self.credential_pool = credential_pool
+        self.snapshot_interval = snapshot_interval
+        self.generator = None
+        # api_id -> bağlı client hovuzu
+        self.client_pools = {}
+        self.started_at = time.time()
+        self.requests = 0
+        self._server = None
+        self._stopped = None
+    
+    def warm_up(self):
+        """Kitabxanaları, mühit keşini və generatoru əvvəlcədən yükləyin"""
+        self.generator = PremiumSessionGenerator(quiet=True)
+        if self.options is not None:
+            self.generator.configure(self.options)
+        if self.credential_pool is not None:
+            self.credential_pool.flood = self.generator.flood
+        if pyro_available:
+            load_pyrogram()
+        if telethon_available:
+            load_telethon()
+    
+    def client_pool(self, api_id, api_hash):
+        """api_id üçün bağlı client hovuzu"""
+        key = (str(api_id or ''), api_hash or '')
+        if key not in self.client_pools:
+            self.client_pools[key] = ConnectedClientPool(TelegramClientFactory(api_id, api_hash), self.max_clients)
+        return self.client_pools[key]
+    
+    async def op_ping(self, request):
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'requests': self.requests,
+            'pyrogram': pyro_version if pyro_available else None,
+            'telethon': tele_version if telethon_available else None,
+            'connected_clients': sum(len(pool) for pool in self.client_pools.values()),
+            'credentials': self.credential_pool.stats() if self.credential_pool else [],
+        }
+    
+    async def op_list(self, request):
+        filters = {key: request.get(key) for key in ('library', 'kind', 'search', 'status')}
+        return {
+            'total': self.generator.store.count(**filters),
+            'rows': self.generator.store.page(limit=int(request.get('limit', 50)), **filters),
+        }
+    
+    async def op_generate(self, request):
+        """Bot sessionları yaradın (istifadəçi girişi kod tələb etdiyi üçün yalnız interaktiv menyudadır)"""
+        tokens = request.get('bot_tokens') or []
+        if isinstance(tokens, str):
+            tokens = [tokens]
+        if not tokens:
+            raise ValueError('bot_tokens is required')
+        pool = self.credential_pool
+        if request.get('api_id') or pool is None:
+            if not request.get('api_id') or not request.get('api_hash'):
+                raise ValueError('api_id and api_hash are required (or start the daemon with --api/--api-file)')
+            pool = CredentialPool([(request['api_id'], request['api_hash'])], self.generator.flood)
+        runner = BatchRunner(
+            self.generator, library=request.get('library', 'pyrogram'),
+            concurrency=int(request.get('concurrency', 10)), pool=pool
+        )
+        results = []
+        summary = await runner.run(tokens, on_result=results.append)
+        summary['results'] = results
+        return summary
+    
+    async def op_validate(self, request):
+        api_id, api_hash = request.get('api_id'), request.get('api_hash')
+        filters = {key: request.get(key) for key in ('library', 'kind', 'search', 'status')}
+        return await self.generator.validate_sessions(
+            TelegramClientFactory(api_id, api_hash),
+            int(request.get('concurrency', 50)), float(request.get('timeout', 30.0)),
+            client_pool=self.client_pool(api_id, api_hash), **filters
+        )
+    
+    async def op_shutdown(self, request):
+        self._stopped.set()
+        return {'stopping': True}
+    
+    async def dispatch(self, request):
+        """Sorğunu uyğun əməliyyata yönləndirin"""
+        handler = getattr(self, f"op_{request.get('op', '')}", None)
+        if handler is None:
+            return {'ok': False, 'error': f"unknown op: {request.get('op')!r}"}
+        self.requests += 1
+        try:
+            return {'ok': True, 'result': await handler(request)}
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+    
+    async def handle_connection(self, reader, writer):
+        """Bir bağlantıdakı JSON sətirlərini emal edin"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"invalid JSON: {e}"}
+                else:
+                    response = await self.dispatch(request)
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+                await writer.drain()
+                if self._stopped.is_set():
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def _snapshot_loop(self):
+        """Metrik snapshot-ını vaxtaşırı yazın"""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                self.generator.metrics.write_snapshot()
+            except OSError:
+                pass
+    
+    def _remove_stale_socket(self):
+        """Köhnə socket faylını silin (başqa daemon işləyirsə, xəta verin)"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"daemon already running on {self.socket_path}")
+        finally:
+            probe.close()
+    
+    async def serve(self):
+        """Daemon-u işə salın və 'shutdown' sorğusuna qədər işləyin"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('Unix sockets are not supported on this platform')
+        self._remove_stale_socket()
+        self.warm_up()
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_unix_server(
+            self.handle_connection, path=self.socket_path, limit=MAX_REQUEST_SIZE
+        )
+        os.chmod(self.socket_path, 0o600)
+        snapshots = asyncio.ensure_future(self._snapshot_loop())
+        try:
+            await self._stopped.wait()
+        finally:
+            snapshots.cancel()
+            self._server.close()
+            await self._server.wait_closed()
+            for pool in self.client_pools.values():
+                await pool.close()
+            await self.generator.notifier.drain()
+            self.generator.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+
+def daemon_request(request, socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None):
+    """Daemon-a bir JSON sorğusu göndərin və cavabı qaytarın (asyncio olmadan, sürətli)"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        buffer = b''
+        while not buffer.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buffer += chunk
+    return json.loads(buffer)
+
+
+def parse_client_params(params):
+    """key=value cütlərini sorğu sahələrinə çevirin (@fayl - sətirlərin siyahısı)"""
+    request = {}
+    for param in params:
+        key, sep, value = param.partition('=')
+        if not sep:
+            raise ValueError(f"expected key=value, got {param!r}")
+        if value.startswith('@'):
+            with open(value[1:], 'r', encoding='utf-8') as f:
+                request[key] = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        elif value.isdigit():
+            request[key] = int(value)
+        else:
+            request[key] = value
+    return request
+
+
+def resolve_api_credentials(args):
+    """API_ID/API_HASH-ı arqumentlərdən və ya mühit dəyişənlərindən oxuyun"""
+    api_id = args.api_id or os.environ.get('API_ID', '')
+    api_hash = args.api_hash or os.environ.get('API_HASH', '')
+    
+    if not str(api_id).isdigit() or not api_hash:
+        print(f"{Colors.RED}❌ API_ID və API_HASH tələb olunur (--api-id/--api-hash və ya API_ID/API_HASH mühit dəyişənləri).{Colors.END}")
+        return None
+    return str(api_id), api_hash
+
+
+def resolve_credential_pool(args):
+    """--api/--api-file verilibsə, API cütləri hovuzunu; əks halda tək cütü qaytarın"""
+    try:
+        if getattr(args, 'api_file', None):
+            return CredentialPool.from_file(args.api_file)
+        if getattr(args, 'api', None):
+            return CredentialPool.parse(args.api)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"{Colors.RED}❌ API cütləri oxunmadı: {e}{Colors.END}")
+        return None
+    
+    credentials = resolve_api_credentials(args)
+    return CredentialPool([credentials]) if credentials else None
+
+
+async def run_batch(args):
+    """Batch rejimini icra edin"""
+    pool = resolve_credential_pool(args)
+    if pool is None:
+        return 1
+    
+    tokens = BatchRunner.read_tokens(args.tokens)
+    if not tokens:
+        print(f"{Colors.YELLOW}⚠️ Token faylında token tapılmadı: {args.tokens}{Colors.END}")
+        return 1
+    
+    generator = PremiumSessionGenerator(quiet=True)
+    generator.flood.api_rate = args.api_rate
+    runner = BatchRunner(generator, library=args.library, concurrency=args.concurrency, pool=pool)
+    output = args.output or os.path.join('sessions', f"batch_{int(time.time())}.jsonl")
+    
+    print(f"{Colors.CYAN}🚀 {len(tokens)} bot tokeni emal edilir ({args.library}, paralellik: {runner.concurrency}, "
+          f"API cütləri: {len(pool)})...{Colors.END}")
+    generator.configure(args)
+    journal = None
+    try:
+        if args.job:
+            journal = JobJournal.for_job(args.job, 'batch', {'library': args.library, 'tokens': os.path.abspath(args.tokens)})
+            journal.open()
+            counts = journal.counts()
+            if counts['done'] or counts['failed']:
+                print(f"{Colors.CYAN}📒 '{args.job}' işi davam etdirilir: {counts['done']} hazır, "
+                      f"{counts['failed']} uğursuz{Colors.END}")
+        summary = await runner.run(tokens, output, journal=journal, retry_failed=args.retry_failed)
+    except ValueError as e:
+        print(f"{Colors.RED}❌ {e}{Colors.END}")
+        return 1
+    finally:
+        if journal is not None:
+            journal.close()
+        await generator.notifier.drain()
+        generator.close()
+    
+    print(f"{Colors.GREEN}✅ Uğurlu: {summary['succeeded']}{Colors.END}  {Colors.RED}❌ Uğursuz: {summary['failed']}{Colors.END}")
+    if summary['skipped']:
+        print(f"{Colors.CYAN}⏭️  Jurnala görə atlandı: {summary['skipped']}{Colors.END}")
+    print(f"{Colors.CYAN}⏱️  {summary['elapsed']} s ({summary['per_second']} session/s){Colors.END}")
+    if generator.flood.flood_waits:
+        print(f"{Colors.YELLOW}⏳ FloodWait: {generator.flood.flood_waits} dəfə gözlənildi{Colors.END}")
+    if generator.notifier.sent or generator.notifier.failed:
+        print(f"{Colors.CYAN}📨 Bildirişlər: {generator.notifier.sent} göndərildi, {generator.notifier.failed} uğursuz{Colors.END}")
+    if len(pool) > 1:
+        for stats in summary['credentials']:
+            print(f"{Colors.WHITE}   🔑 {stats['api_id']}: {stats['used']} tapşırıq, {stats['errors']} xəta, "
+                  f"{stats['flood_waits']} FloodWait{Colors.END}")
+    print(f"{Colors.GREEN}💾 Nəticələr: {summary['output']}{Colors.END}")
+    return 0 if summary['failed'] == 0 else 2
+
+
+def run_reindex(args):
+    """Session qovluğunu yenidən indeksləyin"""
+    store = SessionStore(args.dir)
+    started = time.perf_counter()
+    indexed, removed = store.rebuild()
+    store.close()
+    print(f"{Colors.GREEN}🔄 {indexed} fayl indeksləndi, {removed} köhnə qeyd silindi "
+          f"({time.perf_counter() - started:.2f} s).{Colors.END}")
+    return 0
+
+
+def run_list(args):
+    """İndeksdəki sessionları göstərin"""
+    store = SessionStore()
+    filters = {'library': args.library, 'kind': args.kind, 'search': args.search}
+    rows = store.page(limit=args.limit, **filters)
+    if args.json:
+        for row in rows:
+            print(json.dumps(row, ensure_ascii=False))
+    else:
+        print(f"{Colors.GREEN}📁 {store.count(**filters)} session{Colors.END}")
+        PremiumSessionGenerator.print_session_rows(rows)
+    store.close()
+    return 0
+
+
+async def run_import(args):
+    """Mövcud .session fayllarını şəbəkəsiz idxal edin"""
+    generator = PremiumSessionGenerator(quiet=True)
+    generator.configure(args)
+    importer = SessionImporter(generator, args.workers)
+    started = time.perf_counter()
+    print(f"{Colors.CYAN}📥 .session faylları oxunur: {', '.join(args.paths)}{Colors.END}")
+    try:
+        imported, duplicates, failed = await importer.run(args.paths, args.library)
+    finally:
+        generator.close()
+    
+    print(f"{Colors.GREEN}✅ {imported} session idxal edildi, {duplicates} dublikat atlandı "
+          f"({time.perf_counter() - started:.2f} s).{Colors.END}")
+    for path, error in failed[:20]:
+        print(f"{Colors.YELLOW}⚠️ {path}: {error}{Colors.END}")
+    if len(failed) > 20:
+        print(f"{Colors.YELLOW}⚠️ ... və daha {len(failed) - 20} fayl{Colors.END}")
+    return 0
+
+
+async def refresh_stale_identities(store, client_factory, batch_size: int = 500, **filters):
+    """Kimliyi olmayan və ya köhnəlmiş sessionları partiyalarla yoxlayın (yaddaş sabit qalır)"""
+    validator = SessionValidator(store, client_factory)
+    batch, refreshed = [], 0
+    for row in store.iter_all(batch_size=batch_size, **filters):
+        try:
+            session_string = SessionStore.read_session_string(row['path'])
+        except OSError:
+            continue
+        entry = store.identities.get(session_string, touch=False)
+        if entry is None or entry['stale']:
+            batch.append(row)
+        if len(batch) >= batch_size:
+            await validator.run(batch)
+            refreshed += len(batch)
+            batch = []
+    if batch:
+        await validator.run(batch)
+        refreshed += len(batch)
+    return refreshed
+
+
+async def run_export(args):
+    """Sessionları .env/JSON/CSV formatlarına ixrac edin"""
+    outputs = {fmt: getattr(args, fmt) for fmt in SessionExporter.FORMATS if getattr(args, fmt)}
+    if not outputs:
+        print(f"{Colors.YELLOW}⚠️ Ən azı bir format seçin: --env, --json və ya --csv{Colors.END}")
+        return 1
+    
+    now = time.time()
+    filters = {
+        'library': args.library,
+        'kind': args.kind,
+        'status': args.status,
+        'older_than': now - args.older_than * 86400 if args.older_than is not None else None,
+        'newer_than': now - args.newer_than * 86400 if args.newer_than is not None else None,
+    }
+    
+    store = SessionStore()
+    exporter = SessionExporter(store)
+    try:
+        if args.refresh_stale:
+            credentials = resolve_api_credentials(args)
+            if credentials is None:
+                return 1
+            await refresh_stale_identities(store, TelegramClientFactory(*credentials), **filters)
+        count = exporter.export(outputs, **filters)
+    except (OSError, ValueError) as e:
+        print(f"{Colors.RED}❌ İxrac alınmadı: {e}{Colors.END}")
+        return 1
+    finally:
+        store.close()
+    
+    # stdout-a yazılırsa, məlumat mesajı stderr-ə gedir
+    report = sys.stderr if '-' in outputs.values() else sys.stdout
+    print(f"{Colors.GREEN}📤 {count} session ixrac edildi: {', '.join(outputs.values())}{Colors.END}", file=report)
+    if exporter.missing:
+        print(f"{Colors.YELLOW}⚠️ {exporter.missing} session faylı tapılmadı və ya boşdur ('reindex' edin){Colors.END}", file=report)
+    if exporter.stale:
+        print(f"{Colors.YELLOW}⚠️ {exporter.stale} sessionun kimliyi keşdə yoxdur və ya köhnəlib (--refresh-stale){Colors.END}", file=report)
+    return 0
+
+
+def run_backup(args):
+    """sessions/ qovluğunun artımlı ehtiyat nüsxəsini yaradın"""
+    stats = BackupManager(args.dest, args.source).backup()
+    print(f"{Colors.GREEN}💾 Ehtiyat nüsxə {stats['manifest']}: {stats['files']} fayl, "
+          f"{stats['unchanged']} dəyişməyib, {stats['new_objects']} yeni obyekt "
+          f"({stats['bytes_written']} bayt, {stats['elapsed']:.2f} s).{Colors.END}")
+    return 0
+
+
+def run_restore(args):
+    """Ehtiyat nüsxədən sessionları bərpa edin"""
+    manager = BackupManager(args.dest, args.target)
+    if args.list:
+        for name in manager.manifests():
+            print(name)
+        return 0
+    try:
+        stats = manager.restore(args.manifest, overwrite=args.overwrite)
+    except (OSError, ValueError) as e:
+        print(f"{Colors.RED}❌ Bərpa alınmadı: {e}{Colors.END}")
+        return 1
+    
+    store = SessionStore(args.target)
+    store.rebuild()
+    store.close()
+    print(f"{Colors.GREEN}♻️ {stats['manifest']}: {stats['restored']} fayl bərpa edildi, "
+          f"{stats['skipped']} mövcud fayl saxlanıldı ({stats['bytes']} bayt).{Colors.END}")
+    return 0
+
+
+async def run_convert(args):
+    """Session sətirlərini çevirin"""
+    if args.string:
+        try:
+            if args.target == 'telethon':
+                print(SessionConverter.pyrogram_to_telethon(args.string))
+            else:
+                print(SessionConverter.telethon_to_pyrogram(args.string, args.user_id, args.bot, args.api_id))
+        except ValueError as e:
+            print(f"{Colors.RED}❌ Çevirmə xətası: {e}{Colors.END}")
+            return 1
+        return 0
+    
+    generator = PremiumSessionGenerator(quiet=True)
+    try:
+        saved, failed, skipped = await generator.convert_sessions(args.target, args.api_id, args.kind, args.overwrite)
+    finally:
+        generator.close()
+    
+    print(f"{Colors.GREEN}✅ {saved} session {args.target} formatına çevrildi, {skipped} artıq mövcuddur.{Colors.END}")
+    for name, error in failed:
+        print(f"{Colors.RED}❌ {name}: {error}{Colors.END}")
+    return 0 if not failed else 2
+
+
+async def run_validate(args):
+    """Saxlanılmış sessionları yoxlayın"""
+    if args.fake:
+        from bench.fakes import FakeClientFactory
+        client_factory = FakeClientFactory(latency=args.fake_latency)
+    else:
+        api_id = args.api_id or os.environ.get('API_ID')
+        api_hash = args.api_hash or os.environ.get('API_HASH')
+        if args.library != 'pyrogram' and not (api_id and api_hash):
+            print(f"{Colors.YELLOW}⚠️ API_ID/API_HASH verilməyib: Telethon sessionları xəta ilə nəticələnəcək.{Colors.END}")
+        client_factory = TelegramClientFactory(api_id, api_hash)
+    
+    generator = PremiumSessionGenerator(quiet=True)
+    journal = None
+    try:
+        if args.job:
+            journal = JobJournal.for_job(args.job, 'validate', {'library': args.library, 'kind': args.kind}).open()
+        summary = await generator.validate_sessions(
+            client_factory, args.concurrency, args.timeout,
+            journal=journal, retry_failed=args.retry_failed, library=args.library, kind=args.kind
+        )
+    except ValueError as e:
+        print(f"{Colors.RED}❌ {e}{Colors.END}")
+        return 1
+    finally:
+        if journal is not None:
+            journal.close()
+        generator.close()
+    
+    PremiumSessionGenerator.print_validation_summary(summary)
+    if summary.get('skipped'):
+        print(f"{Colors.CYAN}⏭️  Jurnala görə atlandı: {summary['skipped']}{Colors.END}")
+    return 0
+
+
+async def run_revoke(args):
+    """Seçilmiş sessionları toplu şəkildə ləğv edin (log_out)"""
+    now = time.time()
+    filters = {
+        'library': args.library,
+        'kind': args.kind,
+        'status': args.status,
+        'search': args.search,
+        'older_than': now - args.older_than * 86400 if args.older_than is not None else None,
+        'newer_than': now - args.newer_than * 86400 if args.newer_than is not None else None,
+    }
+    if not args.all and not any(value is not None for value in filters.values()):
+        print(f"{Colors.YELLOW}⚠️ Filtr göstərin (--older-than, --library, --type, --status, --search) və ya --all{Colors.END}")
+        return 1
+    
+    store = SessionStore()
+    try:
+        rows = list(store.iter_all(**filters))
+        if not rows:
+            print(f"{Colors.YELLOW}⚠️ Filtrə uyğun session tapılmadı{Colors.END}")
+            return 0
+        
+        for row in rows[:20]:
+            print(f"  {Colors.WHITE}{row['name']}{Colors.END} ({row['library']}, {row['type']})")
+        if len(rows) > 20:
+            print(f"  ... və daha {len(rows) - 20}")
+        if args.dry_run:
+            print(f"{Colors.CYAN}🔎 {len(rows)} session seçildi (--dry-run: heç nə dəyişdirilmədi){Colors.END}")
+            return 0
+        
+        if args.fake:
+            from bench.fakes import FakeClientFactory
+            client_factory = FakeClientFactory(latency=args.fake_latency)
+        else:
+            credentials = resolve_api_credentials(args)
+            if credentials is None:
+                return 1
+            client_factory = TelegramClientFactory(*credentials)
+        if not args.yes:
+            choice = input(f"{Colors.RED}⛔ {len(rows)} session ləğv ediləcək. Davam edilsin? (e/h): {Colors.END}").lower().strip()
+            if choice not in ['e', 'y', 'yes', 'he', 'evet']:
+                print(f"{Colors.YELLOW}⚠️ Ləğv edildi{Colors.END}")
+                return 1
+        
+        revoker = SessionRevoker(store, client_factory, args.concurrency, args.timeout,
+                                 archive=None if args.delete else args.archive)
+        
+        def report(result):
+            if result['error']:
+                print(f"{Colors.RED}❌ {result['name']}: {result['error']}{Colors.END}")
+            else:
+                print(f"{Colors.GREEN}✅ {result['name']} ({result['status']}){Colors.END}")
+        
+        summary = await revoker.run(rows, report)
+    finally:
+        store.close()
+    
+    print(f"\n{Colors.GREEN}⛔ Ləğv edildi: {summary['revoked']}{Colors.END}  "
+          f"{Colors.YELLOW}♻️ Artıq ləğv edilmişdi: {summary['already_revoked']}{Colors.END}  "
+          f"{Colors.RED}❌ Xəta: {summary['error']}{Colors.END}")
+    location = f"arxiv: {summary['archive']}" if summary['archive'] else 'fayllar silindi'
+    print(f"{Colors.CYAN}⏱️  {summary['total']} session, {summary['elapsed']} s ({location}){Colors.END}")
+    return 0 if not summary['error'] else 1
+
+
+async def run_daemon(args):
+    """Daemon-u işə salın"""
+    credential_pool = None
+    if args.api or args.api_file:
+        credential_pool = resolve_credential_pool(args)
+        if credential_pool is None:
+            return 1
+    daemon = SessionDaemon(args.socket, args.max_clients, credential_pool=credential_pool, options=args)
+    print(f"{Colors.CYAN}🛰️  Daemon işə salınır: {args.socket} (pid {os.getpid()}){Colors.END}")
+    try:
+        await daemon.serve()
+    except RuntimeError as e:
+        print(f"{Colors.RED}❌ {e}{Colors.END}")
+        return 1
+    print(f"{Colors.YELLOW}👋 Daemon dayandırıldı.{Colors.END}")
+    return 0
+
+
+def run_client(args):
+    """Daemon-a sorğu göndərin və cavabı JSON kimi çıxarın"""
+    try:
+        request = parse_client_params(args.params)
+    except (ValueError, OSError) as e:
+        print(f"{Colors.RED}❌ {e}{Colors.END}")
+        return 1
+    request['op'] = args.op
+    # Daemon öz API cütləri hovuzu ilə işə salına bilər; mühit dəyişənləri yalnız varsa göndərilir
+    if args.op in ('generate', 'validate') and os.environ.get('API_ID') and os.environ.get('API_HASH'):
+        request.setdefault('api_id', os.environ['API_ID'])
+        request.setdefault('api_hash', os.environ['API_HASH'])
+    
+    try:
+        response = daemon_request(request, args.socket)
+    except (OSError, ValueError) as e:
+        print(f"{Colors.RED}❌ Daemon-a qoşulmaq mümkün olmadı ({args.socket}): {e}{Colors.END}")
+        return 1
+    print(json.dumps(response, ensure_ascii=False, indent=2))
+    return 0 if response.get('ok') else 2
+
+
+def build_parser():
+    """Komanda sətri arqumentlərini təyin edin"""
+    parser = argparse.ArgumentParser(
+        prog='ssg.py',
+        description='Pyrogram və Telethon session generatoru. Arqumentsiz işə salındıqda interaktiv menyu açılır.'
+    )
+    parser.add_argument('--keygen-pool', type=int, default=0, metavar='N',
+                        help='Auth key mübadiləsi üçün N DH girişini arxa planda əvvəlcədən hesablayın (--keygen-patch-auth tələb edir)')
+    parser.add_argument('--keygen-patch-auth', action='store_true',
+                        help="Hovuz üçün kitabxanaların auth modullarında urandom/pow-u əvəz etməyə icazə verin (yalnız yoxlanılmış versiyalar)")
+    parser.add_argument('--keygen-workers', type=int, default=1, help='Açar hovuzu üçün proses sayı')
+    parser.add_argument('--storage', choices=['auto', 'memory', 'sqlite', 'shared'], default='auto',
+                        help='Client vəziyyətinin saxlanması: yaddaş, hər session üçün .session faylı və ya ortaq index.db')
+    parser.add_argument('--qr', action='store_true',
+                        help='İstifadəçi sessionlarına SMS kodu əvəzinə QR kodla daxil olun (istəyə bağlı: pip install qrcode)')
+    parser.add_argument('--no-notify', action='store_true', help='Saxlanılmış Mesajlara bildiriş göndərməyin')
+    parser.add_argument('--profile', action='store_const', const='sample',
+                        help='Aşağı yüklü stack nümunələri ilə profil hesabatlarını logs/ qovluğuna yazın')
+    parser.add_argument('--cprofile', dest='profile', action='store_const', const='cprofile',
+                        help='--profile kimi, əlavə olaraq tam cProfile (.pstats) ilə - yükü daha çoxdur')
+    parser.add_argument('--profile-interval', type=float, default=10.0, metavar='MS', help='Stack nümunələri arasındakı interval (ms)')
+    parser.add_argument('--profile-memory', action='store_true', help='Yaddaş ayırma yerlərini tracemalloc ilə izləyin')
+    parser.add_argument('--wheelhouse', metavar='DIR',
+                        help='Çatışmayan paketləri bu qovluqdakı wheel-lərdən şəbəkəsiz quraşdırın (SSG_WHEELHOUSE)')
+    parser.add_argument('--notify-chat', metavar='CHAT',
+                        help='Bot sessionları haqqında birləşdirilmiş bildirişlərin göndəriləcəyi sahib (ID və ya @username)')
+    commands = parser.add_subparsers(dest='command')
+    
+    install = commands.add_parser('install', help='Pyrogram/Telethon-u yerli wheelhouse-dan quraşdırın')
+    install.add_argument('packages', nargs='*', help='Paketlər: pyrogram, telethon (standart: hamısı)')
+    
+    reindex = commands.add_parser('reindex', help='sessions/ qovluğunu yenidən indeksləyin')
+    reindex.add_argument('--dir', default='sessions', help='Session qovluğu')
+    
+    backup = commands.add_parser('backup', help='sessions/ qovluğunun artımlı ehtiyat nüsxəsini yaradın')
+    backup.add_argument('--source', default='sessions', help='Session qovluğu')
+    backup.add_argument('--dest', default='backups', help='Ehtiyat nüsxə qovluğu')
+    
+    restore = commands.add_parser('restore', help='Ehtiyat nüsxədən sessionları bərpa edin')
+    restore.add_argument('manifest', nargs='?', help='Manifest adı (default: ən sonuncu)')
+    restore.add_argument('--target', default='sessions', help='Bərpa qovluğu')
+    restore.add_argument('--dest', default='backups', help='Ehtiyat nüsxə qovluğu')
+    restore.add_argument('--overwrite', action='store_true', help='Mövcud faylların üzərinə yazın')
+    restore.add_argument('--list', action='store_true', help='Manifestləri göstərin')
+    
+    listing = commands.add_parser('list', help='İndeksdəki sessionları göstərin')
+    listing.add_argument('--library', choices=['pyrogram', 'telethon'], help='Kitabxanaya görə filtr')
+    listing.add_argument('--type', dest='kind', choices=['bot', 'user'], help='Növə görə filtr')
+    listing.add_argument('--search', help='Ad, istifadəçi adı və ya ID-yə görə axtarış')
+    listing.add_argument('--limit', type=int, default=50, help='Göstəriləcək sətir sayı')
+    listing.add_argument('--json', action='store_true', help='JSON-lines formatında çıxış')
+    
+    importer = commands.add_parser('import', help='Mövcud .session fayllarını string session kimi idxal edin (şəbəkəsiz)')
+    importer.add_argument('paths', nargs='+', help='.session faylları və ya qovluqlar')
+    importer.add_argument('--library', choices=['pyrogram', 'telethon'], help='Yalnız bu kitabxananın faylları')
+    importer.add_argument('--workers', type=int, help='Proses sayı (default: CPU sayı)')
+    
+    export = commands.add_parser('export', help='Sessionları .env, JSON və CSV formatlarına ixrac edin')
+    export.add_argument('--env', help='.env faylı (- stdout)')
+    export.add_argument('--json', help='JSON faylı (- stdout)')
+    export.add_argument('--csv', help='CSV faylı (- stdout)')
+    export.add_argument('--library', choices=['pyrogram', 'telethon'], help='Kitabxanaya görə filtr')
+    export.add_argument('--type', dest='kind', choices=['bot', 'user'], help='Növə görə filtr')
+    export.add_argument('--status', choices=['alive', 'revoked', 'error'], help='Son yoxlamanın nəticəsinə görə filtr')
+    export.add_argument('--older-than', type=float, metavar='GÜN', help='Bu qədər gündən köhnə sessionlar')
+    export.add_argument('--newer-than', type=float, metavar='GÜN', help='Son bu qədər gündə yaradılan sessionlar')
+    export.add_argument('--refresh-stale', action='store_true', help='Köhnəlmiş kimlikləri ixracdan əvvəl yeniləyin (şəbəkə)')
+    export.add_argument('--api-id', help='API_ID (default: API_ID mühit dəyişəni)')
+    export.add_argument('--api-hash', help='API_HASH (default: API_HASH mühit dəyişəni)')
+    
+    convert = commands.add_parser('convert', help='Pyrogram ⇄ Telethon session çevirmə (şəbəkəsiz)')
+    convert.add_argument('--to', dest='target', choices=['pyrogram', 'telethon'], required=True, help='Hədəf kitabxana')
+    convert.add_argument('--string', help='Yalnız bu sətri çevirin (default: indeksdəki bütün sessionlar)')
+    convert.add_argument('--user-id', type=int, help='Telethon → Pyrogram üçün user ID (--string ilə)')
+    convert.add_argument('--bot', action='store_true', help='Telethon → Pyrogram: bot sessionu (--string ilə)')
+    convert.add_argument('--api-id', type=int, default=0, help='Pyrogram sətrinə yazılacaq API_ID')
+    convert.add_argument('--type', dest='kind', choices=['bot', 'user'], help='Növə görə filtr')
+    convert.add_argument('--overwrite', action='store_true', help='Artıq çevrilmiş sessionları yenidən yazın')
+    
+    revoke = commands.add_parser('revoke', help='Seçilmiş sessionları paralel ləğv edin (log_out) və faylları arxivləyin')
+    revoke.add_argument('--library', choices=['pyrogram', 'telethon'], help='Kitabxanaya görə filtr')
+    revoke.add_argument('--type', dest='kind', choices=['bot', 'user'], help='Növə görə filtr')
+    revoke.add_argument('--status', choices=['alive', 'revoked', 'error'], help='Son yoxlamanın nəticəsinə görə filtr')
+    revoke.add_argument('--search', help='Ad, istifadəçi adı və ya ID-yə görə axtarış')
+    revoke.add_argument('--older-than', type=float, metavar='GÜN', help='Bu qədər gündən köhnə sessionlar')
+    revoke.add_argument('--newer-than', type=float, metavar='GÜN', help='Son bu qədər gündə yaradılan sessionlar')
+    revoke.add_argument('--all', action='store_true', help='Filtrsiz: bütün sessionlar')
+    revoke.add_argument('--archive', default=os.path.join('backups', 'revoked'), help='Ləğv edilmiş faylların köçürüləcəyi qovluq')
+    revoke.add_argument('--delete', action='store_true', help='Faylları arxivləmək əvəzinə silin')
+    revoke.add_argument('--dry-run', action='store_true', help='Yalnız seçilən sessionları göstərin')
+    revoke.add_argument('--yes', '-y', action='store_true', help='Təsdiq sorğusu olmadan')
+    revoke.add_argument('--concurrency', type=int, default=10, help='Eyni anda ləğv edilən session sayı')
+    revoke.add_argument('--timeout', type=float, default=30.0, help='Hər session üçün zaman aşımı (s)')
+    revoke.add_argument('--api-id', help='API_ID (default: API_ID mühit dəyişəni)')
+    revoke.add_argument('--api-hash', help='API_HASH (default: API_HASH mühit dəyişəni)')
+    revoke.add_argument('--fake', action='store_true', help='Saxta client-lərlə sınaq (şəbəkəsiz)')
+    revoke.add_argument('--fake-latency', type=float, default=0.05, help='Saxta RPC gecikməsi (s)')
+    
+    validate = commands.add_parser('validate', help='Saxlanılmış sessionları paralel yoxlayın (get_me)')
+    validate.add_argument('--library', choices=['pyrogram', 'telethon'], help='Kitabxanaya görə filtr')
+    validate.add_argument('--type', dest='kind', choices=['bot', 'user'], help='Növə görə filtr')
+    validate.add_argument('--api-id', help='API_ID (default: API_ID mühit dəyişəni)')
+    validate.add_argument('--api-hash', help='API_HASH (default: API_HASH mühit dəyişəni)')
+    validate.add_argument('--concurrency', type=int, default=50, help='Eyni anda bağlı client sayı')
+    validate.add_argument('--timeout', type=float, default=30.0, help='Hər session üçün zaman aşımı (s)')
+    validate.add_argument('--job', help='İş adı: jobs/<ad>.jsonl jurnalı; təkrar işə salındıqda bitmiş sessionlar atlanır')
+    validate.add_argument('--retry-failed', action='store_true', help='Jurnalda uğursuz qeyd olunanları yenidən yoxlayın')
+    validate.add_argument('--fake', action='store_true', help='Saxta client-lərlə sınaq (şəbəkəsiz)')
+    validate.add_argument('--fake-latency', type=float, default=0.05, help='Saxta RPC gecikməsi (s)')
+    
+    daemon = commands.add_parser('daemon', help='Unix socket üzərindən işləyən daimi xidməti başladın')
+    daemon.add_argument('--socket', default=DEFAULT_SOCKET, help='Socket faylı')
+    daemon.add_argument('--max-clients', type=int, default=200, help='Bağlı saxlanılan client-lərin maksimum sayı')
+    daemon.add_argument('--api', action='append', metavar='API_ID:API_HASH', help='API cütü (bir neçə dəfə verilə bilər)')
+    daemon.add_argument('--api-file', help='API cütləri olan JSON faylı')
+    
+    client = commands.add_parser('client', help='İşləyən daemon-a sorğu göndərin')
+    client.add_argument('op', choices=['ping', 'list', 'generate', 'validate', 'shutdown'], help='Əməliyyat')
+    client.add_argument('params', nargs='*', help='key=value parametrləri (məs. library=pyrogram bot_tokens=@tokens.txt)')
+    client.add_argument('--socket', default=DEFAULT_SOCKET, help='Socket faylı')
+    
+    batch = commands.add_parser('batch', help='Bot tokenləri faylından paralel session yaradın')
+    batch.add_argument('tokens', help='Hər sətirdə bir bot tokeni olan fayl')
+    batch.add_argument('--library', choices=['pyrogram', 'telethon'], default='pyrogram', help='İstifadə olunacaq kitabxana')
+    batch.add_argument('--api-id', help='API_ID (default: API_ID mühit dəyişəni)')
+    batch.add_argument('--api-hash', help='API_HASH (default: API_HASH mühit dəyişəni)')
+    batch.add_argument('--api', action='append', metavar='API_ID:API_HASH', help='API cütü (bir neçə dəfə verilə bilər)')
+    batch.add_argument('--api-file', help='API cütləri olan JSON faylı')
+    batch.add_argument('--concurrency', type=int, default=10, help='Eyni anda işlənən token sayı')
+    batch.add_argument('--output', help='Nəticələr üçün JSON-lines faylı (default: sessions/batch_<vaxt>.jsonl)')
+    batch.add_argument('--job', help='İş adı: jobs/<ad>.jsonl jurnalı; təkrar işə salındıqda bitmiş tokenlər atlanır')
+    batch.add_argument('--retry-failed', action='store_true', help='Jurnalda uğursuz qeyd olunan tokenləri yenidən emal edin')
+    batch.add_argument('--api-rate', type=float, default=5.0, help='Bir api_id üçün saniyədə sorğu limiti (0 - limitsiz)')
+    
+    bench = commands.add_parser('bench', help='Performans ölçümləri')
+    bench_commands = bench.add_subparsers(dest='bench_command')
+    bench_commands.required = True
+    
+    startup = bench_commands.add_parser('startup', help='Başlanğıc vaxtı: lazy vs. eager idxal')
+    startup.add_argument('--runs', type=int, default=10, help='Hər ssenari üçün ölçüm sayı')
+    startup.add_argument('--output', help='Nəticələri JSON faylına yazın')
+    
+    save = bench_commands.add_parser('save', help='Paralel session yazma sürəti')
+    save.add_argument('--count', type=int, default=500, help='Paralel yazı sayı')
+    save.add_argument('--target', type=float, default=200.0, help='Hədəf yazı/s')
+    save.add_argument('--no-fsync', action='store_true', help='fsync olmadan ölçün')
+    save.add_argument('--output', help='Nəticələri JSON faylına yazın')
+    
+    keygen = bench_commands.add_parser('keygen', help='DH açar hovuzunun session başına CPU qənaəti')
+    keygen.add_argument('--count', type=int, default=20, help='Ölçüm sayı')
+    keygen.add_argument('--workers', type=int, default=1, help='Hovuz prosesləri')
+    keygen.add_argument('--output', help='Nəticələri JSON faylına yazın')
+    
+    pipeline = bench_commands.add_parser('pipeline', help='Saxta client-lərlə session yaradılması pipeline-ı')
+    pipeline.add_argument('--library', choices=['pyrogram', 'telethon', 'both'], default='both', help='Kitabxana')
+    pipeline.add_argument('--sessions', type=int, default=200, help='Hər ölçümdə session sayı')
+    pipeline.add_argument('--concurrency', default='1,10,50', help='Vergüllə ayrılmış paralellik səviyyələri')
+    pipeline.add_argument('--latency', type=float, default=0.05, help='Saxta RPC gecikməsi (s)')
+    pipeline.add_argument('--no-fsync', action='store_true', help='fsync olmadan ölçün')
+    pipeline.add_argument('--output', help='Nəticələri JSON faylına yazın')
+    
+    return parser
+
+
+def run_install(args):
+    """Paketləri sorğusuz wheelhouse-dan quraşdırın"""
+    requirements = RequirementsManager(args.wheelhouse)
+    if not requirements.wheelhouse:
+        print(f"{Colors.RED}❌ --wheelhouse və ya SSG_WHEELHOUSE göstərilməyib{Colors.END}")
+        return 1
+    packages = args.packages or list(requirements.required_packages)
+    unknown = [name for name in packages if name not in requirements.required_packages]
+    if unknown:
+        print(f"{Colors.RED}❌ Naməlum paket: {', '.join(unknown)}{Colors.END}")
+        return 1
+    return 0 if requirements.check_and_install_from_wheelhouse(packages, ask=False) else 1
 
-async def main():
+
+async def main(argv=None):
     """Ana funksiya"""
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return await run_program(args)
+    
+    profiler = Profiler(args.profile, args.profile_interval / 1000, args.profile_memory).start()
+    try:
+        return await run_program(args)
+    finally:
+        profiler.stop()
+        paths = profiler.write(args.command or 'menu')
+        print(f"{Colors.CYAN}📊 Profil hesabatı: {paths['report']} (flamegraph: {paths['stacks']}){Colors.END}")
+
+
+async def run_program(args):
+    """Əmri icra edin (--profile olmadan birbaşa, olduqda profilləşdirici daxilində)"""
+    if args.command == 'client':
+        return run_client(args)
+    if args.command == 'bench':
+        from bench.benchmarks import run_benchmark
+        return await run_benchmark(args)
+    
+    # Mövcudluq bayraqları idxal zamanı deyil, yalnız əmr icra olunanda oxunur (keşdən)
+    refresh_availability()
+    if args.command == 'install':
+        return run_install(args)
+    
+    if args.keygen_pool and not args.keygen_patch_auth:
+        print(f"{Colors.YELLOW}⚠️ --keygen-pool kitabxanaların auth modullarını dəyişir; "
+              f"--keygen-patch-auth ilə təsdiqləyin. Hovuz işə salınmadı.{Colors.END}")
+    elif args.keygen_pool:
+        # İstifadəçi məlumatları daxil edərkən açarlar arxa planda hazırlanır
+        start_auth_key_pool(args.keygen_pool, args.keygen_workers)
+    try:
+        return await run_command(args)
+    finally:
+        stop_auth_key_pool()
+
+
+async def run_command(args):
+    """Seçilmiş əmri və ya interaktiv menyunu icra edin"""
+    if args.command == 'daemon':
+        return await run_daemon(args)
+    if args.command == 'batch':
+        return await run_batch(args)
+    if args.command == 'reindex':
+        return run_reindex(args)
+    if args.command == 'import':
+        return await run_import(args)
+    if args.command == 'export':
+        return await run_export(args)
+    if args.command == 'backup':
+        return run_backup(args)
+    if args.command == 'restore':
+        return run_restore(args)
+    if args.command == 'convert':
+        return await run_convert(args)
+    if args.command == 'validate':
+        return await run_validate(args)
+    if args.command == 'revoke':
+        return await run_revoke(args)
+    if args.command == 'list':
+        return run_list(args)
+    
     generator = PremiumSessionGenerator()
+    generator.configure(args)
     
     # Tələbləri yoxlayın
     if not generator.requirements.check_and_install_all():
@@ -630,14 +4856,20 @@ async def main():
         print(f"\n\n{Colors.YELLOW}⚠️ Proqram istifadəçi tərəfindən dayandırıldı.{Colors.END}")
     except Exception as e:
         print(f"\n\n{Colors.RED}❌ Gözlənilməz xəta: {e}{Colors.END}")
+    finally:
+        await generator.notifier.drain()
+        generator.close()
 
 if __name__ == "__main__":
+    # bench/ modulları `import ssg` edir: skriptin ikinci nüsxəsi yüklənməsin
+    sys.modules.setdefault('ssg', sys.modules[__name__])
+    
     # Python versiya yoxlaması
     if sys.version_info < (3, 7):
         print("❌ Python 3.7 və ya daha yüksək tələb olunur!")
         sys.exit(1)
     
     try:
-        asyncio.run(main())
+        sys.exit(asyncio.run(main()))
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}👋 Proqram dayandırıldı.{Colors.END}")
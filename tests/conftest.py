@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ssg  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Hər test öz boş iş qovluğunda (sessions/, jobs/, backups/)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def store(workdir):
+    store = ssg.SessionStore()
+    yield store
+    store.close()
+
+
+def add_session(store, index, library='pyrogram', kind='user'):
+    """Saxta auth key ilə session faylı yazın və indeksə əlavə edin"""
+    auth_key = index.to_bytes(4, 'big') * 64
+    if library == 'telethon':
+        session_string = ssg.SessionConverter.encode_telethon(2, auth_key)
+    else:
+        session_string = ssg.SessionConverter.encode_pyrogram(2, auth_key, 1000 + index, kind == 'bot')
+    name = f"{library}_{kind}_{index:04d}"
+    os.makedirs(store.directory, exist_ok=True)
+    path = os.path.join(store.directory, f"{name}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# {library.upper()} SESSION\n{session_string}\n")
+    store.add(name, library, kind, path, user_id=1000 + index, created_at=1700000000 + index)
+    return name, session_string
+
+
+@pytest.fixture
+def sessions(store):
+    """20 indekslənmiş session: ad -> session sətri"""
+    return dict(add_session(store, index, 'telethon' if index % 4 == 0 else 'pyrogram') for index in range(20))
@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+import ssg
+
+
+def object_count(manager):
+    return sum(len(files) for _, _, files in os.walk(manager.objects_dir))
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def manager(store, sessions):
+    # index.db ehtiyat nüsxəyə düşmür
+    store.close()
+    return ssg.BackupManager()
+
+
+def test_backup_restore_roundtrip(manager, sessions):
+    names = sorted(sessions)
+    original = {name: read(os.path.join('sessions', f"{name}.txt")) for name in names}
+    first = manager.backup()
+    assert first['files'] == len(sessions)
+    assert first['new_objects'] == len(sessions)
+
+    # Bir fayl dəyişdirilir, biri silinir
+    with open(os.path.join('sessions', f"{names[0]}.txt"), 'w') as f:
+        f.write('tampered')
+    os.unlink(os.path.join('sessions', f"{names[1]}.txt"))
+
+    stats = manager.restore(first['manifest'], overwrite=True)
+    assert stats['restored'] == len(sessions)
+    for name in names:
+        assert read(os.path.join('sessions', f"{name}.txt")) == original[name]
+
+
+def test_restore_without_overwrite_keeps_existing(manager, sessions):
+    name = sorted(sessions)[0]
+    manager.backup()
+    path = os.path.join('sessions', f"{name}.txt")
+    with open(path, 'w') as f:
+        f.write('local change')
+    os.unlink(os.path.join('sessions', f"{sorted(sessions)[1]}.txt"))
+
+    stats = manager.restore()
+    assert (stats['restored'], stats['skipped']) == (1, len(sessions) - 1)
+    assert read(path) == 'local change'
+
+
+def test_unchanged_files_are_not_stored_again(manager, sessions):
+    first = manager.backup()
+    objects = object_count(manager)
+
+    second = manager.backup()
+    assert (second['unchanged'], second['new_objects'], second['bytes_written']) == (len(sessions), 0, 0)
+    assert object_count(manager) == objects
+
+    # Eyni məzmunlu yeni fayl yeni obyekt yaratmır
+    name = sorted(sessions)[0]
+    with open(os.path.join('sessions', f"{name}.txt")) as src, open(os.path.join('sessions', 'copy.txt'), 'w') as dst:
+        dst.write(src.read())
+    third = manager.backup()
+    assert third['files'] == len(sessions) + 1
+    assert third['new_objects'] == 0
+    assert object_count(manager) == objects
+    assert first['manifest'] != second['manifest'] != third['manifest']
+
+
+def test_changed_file_gets_new_object(manager, sessions):
+    manager.backup()
+    objects = object_count(manager)
+    path = os.path.join('sessions', f"{sorted(sessions)[0]}.txt")
+    with open(path, 'a') as f:
+        f.write('\n')
+    stats = manager.backup()
+    assert (stats['unchanged'], stats['new_objects']) == (len(sessions) - 1, 1)
+    assert object_count(manager) == objects + 1
+
+
+def test_corrupted_object_is_rejected(manager, sessions):
+    first = manager.backup()
+    entry = manager.load_manifest(first['manifest'])['files'][0]
+    with open(manager.object_path(entry['sha256']), 'w') as f:
+        f.write('bit rot')
+    with pytest.raises(ValueError):
+        manager.restore(overwrite=True)
+    assert not [name for name in os.listdir('sessions') if name.endswith('.tmp')]
+
+
+def test_same_second_manifests_sort_by_counter(manager, monkeypatch):
+    monkeypatch.setattr(ssg.time, 'strftime', lambda fmt, *args: '20260101-120000')
+    names = [manager.backup()['manifest'] for _ in range(12)]
+    assert names[:3] == ['20260101-120000', '20260101-120000-1', '20260101-120000-2']
+    assert manager.manifests() == names
+    # '-11' sətir kimi '-2'-dən əvvəl gələrdi
+    assert manager.load_manifest()['name'] == '20260101-120000-11'
+
+
+def test_manifests_sort_by_timestamp_then_counter(workdir):
+    manager = ssg.BackupManager()
+    os.makedirs(manager.manifests_dir)
+    names = ['20260102-000000', '20260101-235959-10', '20260101-235959', '20260101-235959-2']
+    for name in names:
+        with open(os.path.join(manager.manifests_dir, f"{name}.json"), 'w') as f:
+            json.dump({'name': name, 'files': []}, f)
+    assert manager.manifests() == ['20260101-235959', '20260101-235959-2', '20260101-235959-10', '20260102-000000']
+    assert manager.load_manifest()['name'] == '20260102-000000'
@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import pytest
+
+import ssg
+from bench.fakes import fake_client_overrides
+
+
+@pytest.fixture
+def generator(workdir):
+    generator = ssg.PremiumSessionGenerator(quiet=True, client_overrides=fake_client_overrides(latency=0))
+    generator.configure_notifications(False)
+    yield generator
+    generator.close()
+
+
+def tokens(count, start=1):
+    return [f"{100000 + i}:AAF{i:032d}" for i in range(start, start + count)]
+
+
+def run_batch(generator, batch_tokens, journal=None, library='pyrogram', **kwargs):
+    runner = ssg.BatchRunner(generator, 12345, 'hash', library, concurrency=8)
+    results = []
+    summary = asyncio.run(runner.run(batch_tokens, on_result=results.append, journal=journal, **kwargs))
+    return summary, results
+
+
+def session_files():
+    return sorted(name for name in os.listdir('sessions') if name.endswith('.txt'))
+
+
+@pytest.mark.parametrize('library', ['pyrogram', 'telethon'])
+def test_same_bot_in_same_second_gets_unique_names(generator, monkeypatch, library):
+    monkeypatch.setattr(ssg.time, 'time', lambda: 1700000000.0)
+    token = tokens(1)[0]
+    summary, results = run_batch(generator, [token] * 4, library=library)
+
+    names = sorted(result['session_name'] for result in results)
+    base = f"{library}_bot_100001_1700000000"
+    assert names == sorted([base, f"{base}_2", f"{base}_3", f"{base}_4"])
+    assert summary['succeeded'] == 4
+    assert session_files() == sorted(f"{name}.txt" for name in names)
+    assert generator.store.count() == 4
+
+
+def test_existing_file_is_not_overwritten(generator, monkeypatch):
+    monkeypatch.setattr(ssg.time, 'time', lambda: 1700000000.0)
+    path = os.path.join('sessions', 'pyrogram_bot_100001_1700000000.txt')
+    with open(path, 'w') as f:
+        f.write('earlier session')
+
+    summary, results = run_batch(generator, tokens(1))
+    assert results[0]['session_name'] == 'pyrogram_bot_100001_1700000000_2'
+    with open(path) as f:
+        assert f.read() == 'earlier session'
+
+
+def test_save_rejects_duplicate_name(generator):
+    async def main():
+        first = generator.save_session_to_file('pyrogram_bot_1_1', 'AAAA', 'pyrogram', bot=True, identity=False)
+        second = generator.save_session_to_file('pyrogram_bot_1_1', 'BBBB', 'pyrogram', bot=True, identity=False)
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(main())
+    assert first == 'sessions/pyrogram_bot_1_1.txt'
+    assert second is None
+    assert ssg.SessionStore.read_session_string(first) == 'AAAA'
+    # Açıq icazə ilə (convert --overwrite) üzərinə yazılır
+    assert asyncio.run(generator.save_session_to_file(
+        'pyrogram_bot_1_1', 'CCCC', 'pyrogram', bot=True, identity=False, overwrite=True
+    )) == first
+    assert ssg.SessionStore.read_session_string(first) == 'CCCC'
@@ -0,0 +1,127 @@
+import base64
+import struct
+
+import pytest
+
+from ssg import SessionConverter
+
+AUTH_KEY = bytes(range(256))
+# 2^53-dən böyük 64-bit user ID (yeni hesablar)
+BIG_USER_ID = 7_123_456_789_012_345_678
+
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('user_id', [1, 2 ** 31 + 5, BIG_USER_ID, 2 ** 64 - 1])
+@pytest.mark.parametrize('is_bot', [False, True])
+def test_pyrogram_roundtrip(user_id, is_bot):
+    session = SessionConverter.encode_pyrogram(4, AUTH_KEY, user_id, is_bot, api_id=12345)
+    parts = SessionConverter.decode_pyrogram(session)
+    assert parts == {
+        'dc_id': 4, 'api_id': 12345, 'test_mode': False,
+        'auth_key': AUTH_KEY, 'user_id': user_id, 'is_bot': is_bot,
+    }
+    assert SessionConverter.detect(session) == 'pyrogram'
+
+
+def test_pyrogram_legacy_64bit_format():
+    session = b64(struct.pack(SessionConverter.PYROGRAM_OLD_FORMAT_64, 2, False, AUTH_KEY, BIG_USER_ID, False))
+    parts = SessionConverter.decode_pyrogram(session)
+    assert (parts['dc_id'], parts['api_id'], parts['user_id'], parts['auth_key']) == (2, None, BIG_USER_ID, AUTH_KEY)
+
+
+def test_pyrogram_legacy_32bit_format():
+    session = b64(struct.pack(SessionConverter.PYROGRAM_OLD_FORMAT, 5, True, AUTH_KEY, 123456789, True))
+    parts = SessionConverter.decode_pyrogram(session)
+    assert parts == {
+        'dc_id': 5, 'api_id': None, 'test_mode': True,
+        'auth_key': AUTH_KEY, 'user_id': 123456789, 'is_bot': True,
+    }
+
+
+def test_pyrogram_accepts_padded_strings():
+    session = SessionConverter.encode_pyrogram(1, AUTH_KEY, 42, False)
+    assert SessionConverter.decode_pyrogram(session + '=' * (-len(session) % 4))['user_id'] == 42
+
+
+@pytest.mark.parametrize('value', ['', 'not a session', b64(b'\x00' * 100)])
+def test_pyrogram_rejects_garbage(value):
+    with pytest.raises(ValueError):
+        SessionConverter.decode_pyrogram(value)
+
+
+@pytest.mark.parametrize('dc_id', sorted(SessionConverter.DC_ADDRESSES))
+def test_telethon_roundtrip_ipv4(dc_id):
+    session = SessionConverter.encode_telethon(dc_id, AUTH_KEY)
+    assert session.startswith('1')
+    parts = SessionConverter.decode_telethon(session)
+    assert parts == {
+        'dc_id': dc_id, 'server_address': SessionConverter.DC_ADDRESSES[dc_id],
+        'port': 443, 'auth_key': AUTH_KEY, 'test_mode': False,
+    }
+    assert SessionConverter.detect(session) == 'telethon'
+
+
+def test_telethon_roundtrip_ipv6():
+    session = SessionConverter.encode_telethon(2, AUTH_KEY, server_address='2001:67c:4e8:f002::a', port=80)
+    parts = SessionConverter.decode_telethon(session)
+    assert parts['server_address'] == '2001:67c:4e8:f002::a'
+    assert (parts['dc_id'], parts['port'], parts['auth_key']) == (2, 80, AUTH_KEY)
+    # 16 baytlıq IP ilə uzunluq 4 baytlıqdan 12 bayt çoxdur
+    ipv4 = SessionConverter.encode_telethon(2, AUTH_KEY)
+    assert len(SessionConverter._b64decode(session[1:])) - len(SessionConverter._b64decode(ipv4[1:])) == 12
+
+
+def test_telethon_test_mode_addresses():
+    session = SessionConverter.encode_telethon(2, AUTH_KEY, test_mode=True)
+    parts = SessionConverter.decode_telethon(session)
+    assert parts['test_mode'] is True
+    assert parts['server_address'] == SessionConverter.TEST_DC_ADDRESSES[2]
+
+
+def test_telethon_unknown_dc_needs_address():
+    with pytest.raises(ValueError):
+        SessionConverter.encode_telethon(9, AUTH_KEY)
+
+
+@pytest.mark.parametrize('value', ['', '2' + b64(b'\x00' * 263), '1' + b64(b'\x00' * 100)])
+def test_telethon_rejects_garbage(value):
+    with pytest.raises(ValueError):
+        SessionConverter.decode_telethon(value)
+
+
+@pytest.mark.parametrize('user_id', [777, BIG_USER_ID])
+def test_pyrogram_telethon_pyrogram(user_id):
+    original = SessionConverter.encode_pyrogram(3, AUTH_KEY, user_id, True, api_id=99)
+    telethon = SessionConverter.pyrogram_to_telethon(original)
+    assert SessionConverter.decode_telethon(telethon)['server_address'] == SessionConverter.DC_ADDRESSES[3]
+    assert SessionConverter.telethon_to_pyrogram(telethon, user_id, is_bot=True, api_id=99) == original
+
+
+def test_legacy_pyrogram_to_telethon():
+    legacy = b64(struct.pack(SessionConverter.PYROGRAM_OLD_FORMAT, 1, False, AUTH_KEY, 555, False))
+    back = SessionConverter.telethon_to_pyrogram(SessionConverter.pyrogram_to_telethon(legacy), 555)
+    assert SessionConverter.decode_pyrogram(back) == dict(SessionConverter.decode_pyrogram(legacy), api_id=0)
+
+
+def test_telethon_ipv6_to_pyrogram_and_back():
+    original = SessionConverter.encode_telethon(4, AUTH_KEY, server_address='2001:67c:4e8:f004::a')
+    pyrogram = SessionConverter.telethon_to_pyrogram(original, BIG_USER_ID)
+    parts = SessionConverter.decode_pyrogram(pyrogram)
+    assert (parts['dc_id'], parts['auth_key'], parts['user_id']) == (4, AUTH_KEY, BIG_USER_ID)
+    # Pyrogram sətri IP saxlamır: geri çevirmədə DC-nin standart ünvanı istifadə olunur
+    assert SessionConverter.decode_telethon(SessionConverter.pyrogram_to_telethon(pyrogram))['server_address'] == \
+        SessionConverter.DC_ADDRESSES[4]
+
+
+def test_telethon_to_pyrogram_requires_user_id():
+    with pytest.raises(ValueError):
+        SessionConverter.telethon_to_pyrogram(SessionConverter.encode_telethon(1, AUTH_KEY), None)
+
+
+def test_auth_key_hash_matches_across_formats():
+    pyrogram = SessionConverter.encode_pyrogram(2, AUTH_KEY, 1, False)
+    telethon = SessionConverter.pyrogram_to_telethon(pyrogram)
+    assert SessionConverter.auth_key_hash(pyrogram) == SessionConverter.auth_key_hash(telethon)
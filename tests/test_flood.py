@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+
+import ssg
+from bench.fakes import FloodWait
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ssg.time, 'monotonic', clock)
+    return clock
+
+
+class FloodWaitError(Exception):
+    """Telethon-un FloodWaitError-u kimi: müddət .seconds-dadır"""
+
+    def __init__(self, seconds):
+        super().__init__(f"A wait of {seconds} seconds is required")
+        self.seconds = seconds
+
+
+def test_bucket_burst_then_rate(clock):
+    bucket = ssg.TokenBucket(rate=2.0, capacity=3)
+    assert [bucket.delay() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now += 0.25
+    assert bucket.delay() == pytest.approx(0.25)
+    clock.now += 0.25
+    assert bucket.delay() == 0.0
+
+
+def test_bucket_refill_is_capped(clock):
+    bucket = ssg.TokenBucket(rate=10.0, capacity=4)
+    for _ in range(4):
+        bucket.delay()
+    clock.now += 60
+    assert [bucket.delay() for _ in range(4)] == [0.0] * 4
+    assert bucket.delay() == pytest.approx(0.1)
+
+
+def test_bucket_does_not_refill_while_blocked(clock):
+    bucket = ssg.TokenBucket(rate=1.0, capacity=5)
+    bucket.block(5)
+    assert bucket.delay() == pytest.approx(5)
+    clock.now += 4
+    assert bucket.delay() == pytest.approx(1)
+    # Tokenlər yalnız blokun sonundan yığılır
+    clock.now += 1.5
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.delay() == 0.0
+
+
+def test_block_only_extends(clock):
+    bucket = ssg.TokenBucket(rate=1.0, capacity=1)
+    bucket.block(10)
+    bucket.block(2)
+    assert bucket.delay() == pytest.approx(10)
+
+
+def test_flood_wait_seconds():
+    assert ssg.FloodScheduler.flood_wait_seconds(FloodWait(7)) == 7.0
+    assert ssg.FloodScheduler.flood_wait_seconds(FloodWaitError(12)) == 12.0
+    assert ssg.FloodScheduler.flood_wait_seconds(ConnectionError('x')) is None
+
+
+def flaky(failures, wait, calls):
+    """İlk `failures` çağırışda FloodWait(wait) atan korutin funksiyası"""
+    async def func():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise FloodWait(wait)
+        return 'ok'
+    return func
+
+
+def test_retries_after_flood_wait():
+    scheduler = ssg.FloodScheduler(max_retries=3)
+    calls = []
+    started = time.monotonic()
+    result = asyncio.run(scheduler.call(flaky(2, 0.05, calls), dc_id=2))
+    assert result == 'ok'
+    assert len(calls) == 3
+    assert scheduler.flood_waits == 2
+    assert time.monotonic() - started >= 0.1
+
+
+def test_retries_are_bounded():
+    scheduler = ssg.FloodScheduler(max_retries=2)
+    calls = []
+    with pytest.raises(FloodWait):
+        asyncio.run(scheduler.call(flaky(100, 0.01, calls), dc_id=2))
+    assert len(calls) == 3
+    assert scheduler.flood_waits == 2
+
+
+def test_wait_above_max_wait_is_not_retried():
+    scheduler = ssg.FloodScheduler(max_wait=60)
+    calls = []
+    with pytest.raises(FloodWait):
+        asyncio.run(scheduler.call(flaky(1, 3600, calls), dc_id=2))
+    assert len(calls) == 1
+    assert scheduler.flood_waits == 0
+
+
+def test_retry_without_buckets_still_waits():
+    scheduler = ssg.FloodScheduler(api_rate=0, dc_rate=0)
+    calls = []
+    assert asyncio.run(scheduler.call(flaky(1, 0.1, calls))) == 'ok'
+    assert calls[1] - calls[0] >= 0.1
+
+
+def test_flood_wait_blocks_other_workers():
+    scheduler = ssg.FloodScheduler(api_rate=0)
+    flooded = []
+    other_dc = []
+    sibling = []
+
+    async def first():
+        if not flooded:
+            flooded.append(time.monotonic())
+            raise FloodWait(0.3)
+        return 'first'
+
+    async def second():
+        sibling.append(time.monotonic())
+        return 'second'
+
+    async def unrelated():
+        other_dc.append(time.monotonic())
+        return 'unrelated'
+
+    async def main():
+        task = asyncio.ensure_future(scheduler.call(first, dc_id=2))
+        await asyncio.sleep(0.05)
+        return await asyncio.gather(
+            task, scheduler.call(second, dc_id=2), scheduler.call(unrelated, dc_id=4)
+        )
+
+    assert asyncio.run(main()) == ['first', 'second', 'unrelated']
+    # Eyni DC-yə sorğu FloodWait bitənə qədər gözləyir, başqa DC gözləmir
+    assert sibling[0] - flooded[0] >= 0.3 - 0.01
+    assert other_dc[0] - flooded[0] < 0.2
+
+
+def test_flood_wait_is_shared_per_api_id():
+    scheduler = ssg.FloodScheduler(dc_rate=0)
+    seen = []
+
+    async def flood_once():
+        seen.append(('a', time.monotonic()))
+        if len(seen) == 1:
+            raise FloodWait(0.2)
+        return True
+
+    async def other():
+        seen.append(('b', time.monotonic()))
+        return True
+
+    async def main():
+        task = asyncio.ensure_future(scheduler.call(flood_once, api_id=1))
+        await asyncio.sleep(0.02)
+        await asyncio.gather(task, scheduler.call(other, api_id=1))
+
+    asyncio.run(main())
+    start = seen[0][1]
+    assert all(moment - start >= 0.19 for name, moment in seen[1:])
+
+
+def test_metrics_observe_flood_waits():
+    metrics = ssg.Metrics()
+    scheduler = ssg.FloodScheduler(metrics=metrics)
+    asyncio.run(scheduler.call(flaky(1, 0.01, []), dc_id=1, library='pyrogram'))
+    assert list(metrics.samples['flood_wait']) == [0.01]
+    assert metrics.errors[('flood_wait', 'pyrogram', 'FloodWait')] == 1
@@ -0,0 +1,127 @@
+import asyncio
+import collections
+import json
+import os
+
+import pytest
+
+import ssg
+from bench.fakes import FakeClientFactory, fake_client_overrides
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def generator(workdir):
+    generator = ssg.PremiumSessionGenerator(quiet=True, client_overrides=fake_client_overrides(latency=0.01))
+    generator.configure_notifications(False)
+    # api_id limiti (5/s) testləri yalnız yavaşladır
+    generator.flood.api_rate = 0
+    yield generator
+    generator.close()
+
+
+def journal_entries(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if 'key' in json.loads(line)]
+
+
+def sessions_per_bot():
+    counts = collections.Counter()
+    for name in os.listdir('sessions'):
+        if name.endswith('.txt'):
+            counts[name.split('_')[2]] += 1
+    return counts
+
+
+def test_interrupted_batch_resumes_without_redoing_or_skipping(generator):
+    tokens = [f"{200000 + i}:AAH{i:032d}" for i in range(30)]
+    seen = []
+
+    def interrupt(result):
+        seen.append(result['token_id'])
+        if len(seen) == 10:
+            raise Interrupted()
+
+    runner = ssg.BatchRunner(generator, 1, 'hash', concurrency=4)
+    with ssg.JobJournal.for_job('bots', 'batch') as journal:
+        with pytest.raises(Interrupted):
+            asyncio.run(runner.run(tokens, on_result=interrupt, journal=journal))
+    done_before = {entry['token_id'] for entry in journal_entries(os.path.join('jobs', 'bots.jsonl'))}
+    assert 10 <= len(done_before) < len(tokens)
+
+    resumed = []
+    runner = ssg.BatchRunner(generator, 1, 'hash', concurrency=4)
+    with ssg.JobJournal.for_job('bots', 'batch') as journal:
+        summary = asyncio.run(runner.run(tokens, on_result=lambda result: resumed.append(result['token_id']), journal=journal))
+        assert journal.counts() == {'done': len(tokens), 'failed': 0}
+
+    assert summary['skipped'] == len(done_before)
+    # Bitmiş tokenlər təkrar emal olunmur, qalanların heç biri atlanmır
+    assert set(resumed).isdisjoint(done_before)
+    assert set(resumed) | done_before == {ssg.BatchRunner.token_id(token) for token in tokens}
+    counts = sessions_per_bot()
+    assert all(counts[token_id] == 1 for token_id in done_before)
+    assert set(counts) == {ssg.BatchRunner.token_id(token) for token in tokens}
+
+
+def test_failed_items_are_retried_only_on_request(generator):
+    tokens = [f"{300000 + i}:AAH{i:032d}" for i in range(3)]
+    runner = ssg.BatchRunner(generator, 1, 'hash')
+    with ssg.JobJournal.for_job('retry', 'batch') as journal:
+        journal.record(journal.token_key(tokens[0]), False, error='FloodWait')
+        journal.record(journal.token_key(tokens[1]), True)
+
+    with ssg.JobJournal.for_job('retry', 'batch') as journal:
+        assert asyncio.run(runner.run(tokens, journal=journal))['skipped'] == 2
+    with ssg.JobJournal.for_job('retry', 'batch') as journal:
+        summary = asyncio.run(runner.run(tokens, journal=journal, retry_failed=True))
+    assert (summary['skipped'], summary['succeeded']) == (2, 1)
+    assert sessions_per_bot() == {'300000': 1, '300002': 1}
+
+
+def test_interrupted_validate_resumes_from_last_flush(store, sessions, monkeypatch):
+    generator = ssg.PremiumSessionGenerator(quiet=True)
+    generator.store = store
+    factory = FakeClientFactory(latency=0)
+    flushed = []
+    flush = ssg.SessionValidator.flush
+
+    def crash_on_second_flush(self, results):
+        if flushed:
+            raise Interrupted()
+        flush(self, results)
+        flushed.extend(result['name'] for result in results)
+
+    monkeypatch.setattr(ssg.SessionValidator, 'flush', crash_on_second_flush)
+    init = ssg.SessionValidator.__init__
+
+    def small_batches(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self.flush_every = 5
+
+    monkeypatch.setattr(ssg.SessionValidator, '__init__', small_batches)
+    with ssg.JobJournal.for_job('check', 'validate') as journal:
+        with pytest.raises(Interrupted):
+            asyncio.run(generator.validate_sessions(factory, journal=journal))
+    # Jurnalda yalnız indeksə yazılmış partiya var
+    assert sorted(entry['key'] for entry in journal_entries(os.path.join('jobs', 'check.jsonl'))) == sorted(flushed)
+
+    monkeypatch.setattr(ssg.SessionValidator, 'flush', flush)
+    checked = []
+    original_check = ssg.SessionValidator.check
+
+    async def recording_check(self, row):
+        checked.append(row['name'])
+        return await original_check(self, row)
+
+    monkeypatch.setattr(ssg.SessionValidator, 'check', recording_check)
+    with ssg.JobJournal.for_job('check', 'validate') as journal:
+        summary = asyncio.run(generator.validate_sessions(factory, journal=journal))
+    generator.close()
+
+    assert summary['skipped'] == len(flushed) == 5
+    assert sorted(checked) == sorted(set(sessions) - set(flushed))
+    assert all(store.get(name)['status'] == 'alive' for name in sessions)
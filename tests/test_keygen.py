@@ -0,0 +1,100 @@
+import os
+import sys
+import types
+from concurrent.futures import Future
+
+import pytest
+
+import ssg
+
+# Kitabxanaların auth modullarındakı DH addımının minimal surəti
+TELETHON_AUTHENTICATOR = '''
+import os
+
+def get_int(data, signed=True):
+    return int.from_bytes(data, byteorder='little', signed=signed)
+
+def client_dh(g, g_a, dh_prime):
+    b = get_int(os.urandom(256), signed=False)
+    return b, pow(g, b, dh_prime), pow(g_a, b, dh_prime)
+'''
+PYROGRAM_AUTH = '''
+from os import urandom
+
+def client_dh(g, g_a, dh_prime):
+    b = int.from_bytes(urandom(256), "big")
+    return b, pow(g, b, dh_prime), pow(g_a, b, dh_prime)
+'''
+
+
+def load_module(monkeypatch, name, source):
+    module = types.ModuleType(name)
+    exec(source, module.__dict__)
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+def filled_pool(count):
+    """Proses hovuzu olmadan hazır girişlərlə doldurulmuş hovuz"""
+    pool = ssg.AuthKeyPool(size=count, generators=(3,))
+    for _ in range(count):
+        future = Future()
+        future.set_result(ssg.compute_dh_entry((3,)))
+        pool._futures.append(future)
+    return pool
+
+
+@pytest.fixture
+def library_versions(monkeypatch):
+    monkeypatch.setattr(ssg, 'pyro_version', '2.0.106')
+    monkeypatch.setattr(ssg, 'tele_version', '1.36.0')
+
+
+@pytest.mark.parametrize('name, source', [
+    ('telethon.network.authenticator', TELETHON_AUTHENTICATOR),
+    ('pyrogram.session.auth', PYROGRAM_AUTH),
+])
+def test_patched_auth_module_hits_pool(monkeypatch, library_versions, name, source):
+    module = load_module(monkeypatch, name, source)
+    pool = filled_pool(1).install()
+    g_a = 12345
+
+    b, g_b, shared = module.client_dh(3, g_a, ssg.TELEGRAM_DH_PRIME)
+
+    assert pool.hits == 1
+    assert g_b == pow(3, b, ssg.TELEGRAM_DH_PRIME)
+    # Serverin g_a-sı ilə hesablama hovuzdan deyil, adi pow ilə gedir
+    assert shared == pow(g_a, b, ssg.TELEGRAM_DH_PRIME)
+    # Gizli açar istifadədən sonra saxlanılmır
+    assert pool._issued == {}
+
+
+def test_telethon_os_proxy_keeps_other_functions(monkeypatch, library_versions):
+    module = load_module(monkeypatch, 'telethon.network.authenticator', TELETHON_AUTHENTICATOR)
+    filled_pool(1).install()
+    assert module.os is not os
+    assert module.os.getpid() == os.getpid()
+    assert len(module.os.urandom(16)) == 16
+
+
+def test_unsupported_version_is_not_patched(monkeypatch, library_versions):
+    monkeypatch.setattr(ssg, 'tele_version', '2.1.0')
+    module = load_module(monkeypatch, 'telethon.network.authenticator', TELETHON_AUTHENTICATOR)
+    filled_pool(1).install()
+    assert module.os is os
+    assert module.__dict__.get('pow') is None
+
+
+def test_empty_pool_falls_back_to_os_urandom():
+    pool = ssg.AuthKeyPool(size=1)
+    assert len(pool.urandom(256)) == 256
+    assert pool._issued == {}
+    assert pool.pow(3, 5, ssg.TELEGRAM_DH_PRIME) == 243
+    assert pool.misses == 1
+
+
+def test_unused_secrets_are_bounded():
+    pool = filled_pool(ssg.AuthKeyPool.MAX_ISSUED + 3)
+    for _ in range(ssg.AuthKeyPool.MAX_ISSUED + 3):
+        pool.urandom(256)
+    assert len(pool._issued) == ssg.AuthKeyPool.MAX_ISSUED
@@ -0,0 +1,246 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+import ssg
+from bench.fakes import FakeTelegramClient
+
+
+def namespace_class(name, *fields):
+    """Pyrogram raw obyektinin saxta sinfi: yalnız açar sözlü sahələr"""
+    def __init__(self, **kwargs):
+        assert set(kwargs) == set(fields), kwargs
+        self.__dict__.update(kwargs)
+    return type(name, (), {'__init__': __init__})
+
+
+ExportLoginToken = namespace_class('ExportLoginToken', 'api_id', 'api_hash', 'except_ids')
+ImportLoginToken = namespace_class('ImportLoginToken', 'token')
+LoginToken = namespace_class('LoginToken', 'token', 'expires')
+LoginTokenMigrateTo = namespace_class('LoginTokenMigrateTo', 'dc_id', 'token')
+LoginTokenSuccess = namespace_class('LoginTokenSuccess', 'authorization')
+UpdateLoginToken = namespace_class('UpdateLoginToken')
+Updates = namespace_class('Updates', 'updates')
+
+
+class FakeAuth:
+    def __init__(self, client, dc_id, test_mode):
+        self.dc_id = dc_id
+
+    async def create(self):
+        return bytes([self.dc_id]) * 256
+
+
+class FakeSession:
+    def __init__(self, client, dc_id, auth_key, test_mode):
+        self.dc_id = dc_id
+        self.auth_key = auth_key
+        self.running = False
+
+    async def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+
+class FakeStorage:
+    def __init__(self, dc_id):
+        self.values = {'dc_id': dc_id, 'test_mode': False, 'auth_key': b'\x00' * 256}
+
+    def __getattr__(self, name):
+        async def accessor(value=None):
+            if value is None:
+                return self.values.get(name)
+            self.values[name] = value
+        return accessor
+
+
+@pytest.fixture
+def pyrogram_modules(monkeypatch):
+    """from pyrogram import raw / from pyrogram.session import Auth, Session üçün saxta modullar"""
+    raw = types.SimpleNamespace(
+        functions=types.SimpleNamespace(auth=types.SimpleNamespace(
+            ExportLoginToken=ExportLoginToken, ImportLoginToken=ImportLoginToken,
+        )),
+        types=types.SimpleNamespace(auth=types.SimpleNamespace(
+            LoginToken=LoginToken, LoginTokenMigrateTo=LoginTokenMigrateTo, LoginTokenSuccess=LoginTokenSuccess,
+        )),
+    )
+    monkeypatch.setitem(ssg.sys.modules, 'pyrogram', types.SimpleNamespace(raw=raw))
+    monkeypatch.setitem(ssg.sys.modules, 'pyrogram.session', types.SimpleNamespace(Auth=FakeAuth, Session=FakeSession))
+
+
+class FakePyrogramClient:
+    """Pyrogram Client-in QR girişində istifadə olunan hissəsi; server cavabları skriptlə verilir"""
+
+    def __init__(self, dc_id=2, account_dc=2, expires_in=30.0, user_id=7_000_000_000):
+        self.api_id = 1
+        self.api_hash = 'hash'
+        self.storage = FakeStorage(dc_id)
+        self.session = FakeSession(self, dc_id, self.storage.values['auth_key'], False)
+        self.session.running = True
+        self.account_dc = account_dc
+        self.expires_in = expires_in
+        self.user = types.SimpleNamespace(id=user_id, is_bot=False)
+        self.scanned = False
+        self.exported = []
+        self.imported = []
+        self.updates = []
+
+    async def handle_updates(self, updates):
+        self.updates.append(updates)
+
+    async def scan(self):
+        """Telefonda skan: server updateLoginToken göndərir"""
+        self.scanned = True
+        await self.handle_updates(Updates(updates=[UpdateLoginToken()]))
+
+    def success(self):
+        return LoginTokenSuccess(authorization=types.SimpleNamespace(user=self.user))
+
+    async def invoke(self, query):
+        if isinstance(query, ImportLoginToken):
+            assert self.session.dc_id == self.account_dc and self.session.running
+            self.imported.append(query.token)
+            return self.success()
+        assert isinstance(query, ExportLoginToken) and query.api_id == self.api_id
+        token = f"token-{len(self.exported)}".encode()
+        self.exported.append(token)
+        if not self.scanned:
+            return LoginToken(token=token, expires=int(time.time() + self.expires_in))
+        if self.session.dc_id != self.account_dc:
+            return LoginTokenMigrateTo(dc_id=self.account_dc, token=b'migrate')
+        return self.success()
+
+
+def test_export_token(pyrogram_modules):
+    client = FakePyrogramClient(expires_in=60)
+    qr = ssg.PyrogramQrLogin(client)
+    assert asyncio.run(qr.recreate()) == b'token-0'
+    assert qr.url == ssg.login_token_url(b'token-0')
+    assert 50 < (qr.expires - ssg.datetime.now(ssg.timezone.utc)).total_seconds() <= 60
+    assert qr.user is None
+
+
+def test_expired_token_is_refreshed(pyrogram_modules):
+    client = FakePyrogramClient()
+    qr = ssg.PyrogramQrLogin(client)
+
+    async def main():
+        await qr.recreate()
+        with pytest.raises(asyncio.TimeoutError):
+            await qr.wait(0.05)
+        return await qr.recreate()
+
+    assert asyncio.run(main()) == b'token-1'
+    assert qr.user is None
+
+
+def test_scan_completes_login(pyrogram_modules):
+    client = FakePyrogramClient()
+    qr = ssg.PyrogramQrLogin(client)
+
+    async def main():
+        await qr.recreate()
+        asyncio.get_event_loop().call_later(0.05, lambda: asyncio.ensure_future(client.scan()))
+        return await qr.wait(5)
+
+    assert asyncio.run(main()) is client.user
+    assert client.storage.values['user_id'] == client.user.id
+    assert client.storage.values['is_bot'] is False
+    # Yenilik Pyrogram-ın öz emalına da ötürülür
+    assert len(client.updates) == 1
+
+
+def test_unrelated_updates_do_not_finish_login(pyrogram_modules):
+    client = FakePyrogramClient()
+    qr = ssg.PyrogramQrLogin(client)
+
+    async def main():
+        await qr.recreate()
+        await client.handle_updates(Updates(updates=[object()]))
+        with pytest.raises(asyncio.TimeoutError):
+            await qr.wait(0.05)
+
+    asyncio.run(main())
+    assert client.exported == [b'token-0']
+
+
+def test_scan_on_other_dc_migrates(pyrogram_modules):
+    client = FakePyrogramClient(dc_id=2, account_dc=4)
+    old_session = client.session
+    qr = ssg.PyrogramQrLogin(client)
+
+    async def main():
+        await qr.recreate()
+        await client.scan()
+        return await qr.wait(5)
+
+    assert asyncio.run(main()) is client.user
+    assert client.imported == [b'migrate']
+    assert not old_session.running
+    assert client.session is not old_session and client.session.running
+    assert client.session.dc_id == 4
+    assert client.storage.values['dc_id'] == 4
+    assert client.storage.values['auth_key'] == client.session.auth_key == bytes([4]) * 256
+
+
+def test_generator_refreshes_expired_pyrogram_qr(workdir, pyrogram_modules):
+    client = FakePyrogramClient(expires_in=1)
+    generator = ssg.PremiumSessionGenerator(quiet=True)
+    generator.qr_timeout = 10
+
+    async def main():
+        # Birinci kodun müddəti (1 s) bitəndən sonra skan edilir
+        asyncio.get_event_loop().call_later(1.5, lambda: asyncio.ensure_future(client.scan()))
+        return await generator._qr_login(client, 'pyrogram', client.api_id)
+
+    try:
+        assert asyncio.run(main()) is client.user
+    finally:
+        generator.close()
+    assert len(client.exported) >= 3
+    assert client.exported[-1] not in client.exported[:-1]
+
+
+def test_generator_refreshes_expired_telethon_qr(workdir):
+    client = FakeTelegramClient(qr_expires=0.2, qr_scan_after=1.5)
+    generator = ssg.PremiumSessionGenerator(quiet=True)
+    generator.qr_timeout = 10
+
+    async def main():
+        qr = await client.qr_login()
+        client.qr_login = lambda: asyncio.sleep(0, result=qr)
+        return qr, await generator._qr_login(client, 'telethon', 1)
+
+    try:
+        qr, user = asyncio.run(main())
+    finally:
+        generator.close()
+    assert user.id == client.user_id
+    assert qr.refreshed >= 1
+
+
+def test_generator_gives_up_after_timeout(workdir, monkeypatch):
+    client = FakeTelegramClient(qr_expires=0.2, qr_scan_after=60)
+    generator = ssg.PremiumSessionGenerator(quiet=True)
+    generator.qr_timeout = 1.5
+    rendered = []
+    monkeypatch.setattr(ssg, 'render_qr', rendered.append)
+
+    async def main():
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await generator._qr_login(client, 'telethon', 1)
+        return time.monotonic() - started
+
+    try:
+        elapsed = asyncio.run(main())
+    finally:
+        generator.close()
+    # Hər kod ən azı 1 s gözlənilir: 1.5 s ərzində iki kod göstərilir, müddət bitdikdən sonra yenisi yox
+    assert 1.5 <= elapsed < 3
+    assert len(rendered) == 2
@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+import ssg
+from bench.fakes import FakeClientFactory
+
+
+def run_revoker(store, factory, **kwargs):
+    revoker = ssg.SessionRevoker(store, factory, concurrency=4, timeout=5, **kwargs)
+    results = []
+    summary = asyncio.run(revoker.run(list(store.iter_all()), results.append))
+    return summary, {result['name']: result for result in results}
+
+
+def test_revoked_sessions_are_archived_and_unindexed(store, sessions):
+    summary, results = run_revoker(store, FakeClientFactory(latency=0))
+
+    archive = os.path.join('backups', 'revoked')
+    assert summary['revoked'] == len(sessions)
+    assert summary['archive'] == archive
+    assert store.count() == 0
+    for name, session_string in sessions.items():
+        assert results[name]['archived'] == os.path.join(archive, f"{name}.txt")
+        assert not os.path.exists(os.path.join('sessions', f"{name}.txt"))
+        assert ssg.SessionStore.read_session_string(results[name]['archived']) == session_string
+
+
+def test_already_revoked_and_failed_sessions(store, sessions):
+    factory = FakeClientFactory(latency=0, revoked_ratio=0.3, error_ratio=0.3)
+    summary, results = run_revoker(store, factory)
+
+    expected = {name: factory.outcome_for(session_string) for name, session_string in sessions.items()}
+    failed = {name for name, outcome in expected.items() if outcome == 'error'}
+    assert failed and len(failed) < len(sessions)
+    assert summary['error'] == len(failed)
+    assert summary['already_revoked'] == list(expected.values()).count('revoked')
+    assert summary['revoked'] == list(expected.values()).count('alive')
+    # Şəbəkə xətası olanlar indeksdə və yerində qalır, qalanları arxivlənir
+    assert {row['name'] for row in store.iter_all()} == failed
+    for name in sessions:
+        assert os.path.exists(os.path.join('sessions', f"{name}.txt")) == (name in failed)
+        assert (results[name]['archived'] is None) == (name in failed)
+
+
+def test_archive_does_not_overwrite(store, sessions):
+    name = sorted(sessions)[0]
+    archive = os.path.join('backups', 'revoked')
+    os.makedirs(archive)
+    with open(os.path.join(archive, f"{name}.txt"), 'w') as f:
+        f.write('older')
+
+    summary, results = run_revoker(store, FakeClientFactory(latency=0))
+    assert results[name]['archived'] != os.path.join(archive, f"{name}.txt")
+    with open(os.path.join(archive, f"{name}.txt")) as f:
+        assert f.read() == 'older'
+    assert ssg.SessionStore.read_session_string(results[name]['archived']) == sessions[name]
+
+
+def test_delete_instead_of_archive(store, sessions):
+    summary, results = run_revoker(store, FakeClientFactory(latency=0), archive=None)
+    assert summary['archive'] is None
+    assert store.count() == 0
+    assert not os.path.exists('backups')
+    assert not any(name.endswith('.txt') for name in os.listdir('sessions'))
+
+
+def test_revoke_command_with_fake_clients(store, sessions):
+    store.close()
+    argv = ['revoke', '--library', 'telethon', '--fake', '--fake-latency', '0', '-y']
+    assert asyncio.run(ssg.main(argv)) == 0
+
+    telethon = {name for name in sessions if name.startswith('telethon_')}
+    assert telethon
+    assert {row['name'] for row in store.iter_all()} == set(sessions) - telethon
+    assert sorted(os.listdir(os.path.join('backups', 'revoked'))) == sorted(f"{name}.txt" for name in telethon)
+
+
+def test_dry_run_changes_nothing(store, sessions):
+    store.close()
+    assert asyncio.run(ssg.main(['revoke', '--all', '--dry-run'])) == 0
+    assert store.count() == len(sessions)
+    assert not os.path.exists('backups')
+
+
+def test_connect_timeout_disconnects_client(store, sessions):
+    clients = []
+
+    class HangingClient:
+        disconnects = 0
+
+        async def connect(self):
+            await asyncio.sleep(60)
+
+        async def disconnect(self):
+            self.disconnects += 1
+
+    def factory(library, session_string, name):
+        clients.append(HangingClient())
+        return clients[-1]
+
+    revoker = ssg.SessionRevoker(store, factory, timeout=0.05)
+    summary = asyncio.run(revoker.run(list(store.iter_all())[:3]))
+
+    assert summary['error'] == 3
+    assert [client.disconnects for client in clients] == [1, 1, 1]
+    assert store.count() == len(sessions)
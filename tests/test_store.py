@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+import ssg
+from conftest import add_session
+
+
+def all_pages(store, limit, **filters):
+    pages, after = [], None
+    while True:
+        page = store.page(limit=limit, after=after, **filters)
+        if not page:
+            return pages
+        pages.append([row['name'] for row in page])
+        after = page[-1]
+
+
+@pytest.mark.parametrize('limit', [1, 6, 7, 19, 20, 21])
+def test_keyset_pages_cover_every_row_once(store, sessions, limit):
+    pages = all_pages(store, limit)
+    names = [name for page in pages for name in page]
+    assert sorted(names) == sorted(sessions)
+    assert len(names) == len(set(names))
+    assert all(len(page) == limit for page in pages[:-1])
+    # Ən yenidən köhnəyə
+    assert names == sorted(sessions, key=lambda name: store.get(name)['created_at'], reverse=True)
+
+
+def test_ties_on_created_at_are_ordered_by_name(store):
+    for index in range(10):
+        name, _ = add_session(store, index)
+        # Eyni saniyədə yaradılmış sessionlar
+        store.conn.execute('UPDATE sessions SET created_at = ? WHERE name = ?', (1700000000 + index // 4, name))
+    store.conn.commit()
+
+    for limit in (1, 2, 3, 4, 5):
+        names = [name for page in all_pages(store, limit) for name in page]
+        assert len(names) == 10
+        expected = sorted(names, key=lambda name: (store.get(name)['created_at'], name), reverse=True)
+        assert names == expected
+
+
+def test_filters_and_count(store, sessions):
+    telethon = {name for name in sessions if name.startswith('telethon_')}
+    assert store.count() == len(sessions)
+    assert store.count(library='telethon') == len(telethon)
+    assert {row['name'] for row in store.iter_all(batch_size=2, library='telethon')} == telethon
+    assert [row['name'] for row in store.iter_all(search='1005')] == ['pyrogram_user_0005']
+    assert store.count(older_than=1700000005) == 5
+    assert store.count(newer_than=1700000015) == 5
+    assert all_pages(store, 3, library='telethon', search='0008') == [['telethon_user_0008']]
+
+
+def test_update_status(store, sessions):
+    names = sorted(sessions)[:3]
+    now = time.time()
+    store.update_status([
+        {'name': names[0], 'status': 'alive', 'latency_ms': 12.5, 'checked_at': now, 'error': None},
+        {'name': names[1], 'status': 'revoked', 'latency_ms': 30.0, 'checked_at': now, 'error': 'AuthKeyUnregistered: x'},
+        {'name': 'missing', 'status': 'alive', 'latency_ms': 1.0, 'checked_at': now, 'error': None},
+    ])
+    assert (store.get(names[0])['status'], store.get(names[0])['latency_ms']) == ('alive', 12.5)
+    assert store.get(names[1])['last_error'] == 'AuthKeyUnregistered: x'
+    assert store.get(names[2])['status'] is None
+    assert store.count(status='revoked') == 1
+    assert store.get('missing') is None
+
+
+def test_add_updates_existing_row(store):
+    name, _ = add_session(store, 1)
+    store.add(name, 'pyrogram', 'bot', 'elsewhere.txt', user_id=5, username='bot', auth_key_hash=None)
+    row = store.get(name)
+    assert (row['type'], row['path'], row['username']) == ('bot', 'elsewhere.txt', 'bot')
+    # Yeni hash verilməyibsə, köhnəsi saxlanılır
+    assert store.count() == 1
+
+
+def test_remove_many_drops_client_state(store, sessions):
+    names = sorted(sessions)[:2]
+    for name in names:
+        store.put_client_state(name, 'pyrogram', sessions[name])
+    store.remove_many(names)
+    assert store.count() == len(sessions) - 2
+    assert [store.get_client_state(name) for name in names] == [None, None]
+
+
+def write_session_file(name, session_string, library, created='2024-01-02 03:04:05'):
+    path = os.path.join('sessions', f"{name}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# {library.upper()} SESSION SƏTİRİ\n# Yaradıldı: {created}\n# BUNU HEÇ KİMƏ GÖSTƏRMEYİN!\n\n"
+                f"{session_string}")
+    return path
+
+
+def test_rebuild_indexes_existing_directory(store):
+    os.makedirs('sessions', exist_ok=True)
+    auth_key = b'\x01' * 256
+    pyrogram = ssg.SessionConverter.encode_pyrogram(2, auth_key, 7_000_000_001, True)
+    telethon = ssg.SessionConverter.encode_telethon(4, b'\x02' * 256)
+    write_session_file('pyrogram_user_old', pyrogram, 'pyrogram')
+    write_session_file('my_account', telethon, 'telethon')
+    with open(os.path.join('sessions', 'notes.md'), 'w') as f:
+        f.write('not a session')
+    # Faylı artıq olmayan köhnə sətir və əl ilə verilmiş istifadəçi adı
+    store.add('gone', 'pyrogram', 'user', os.path.join('sessions', 'gone.txt'))
+    store.add('my_account', 'telethon', 'user', os.path.join('sessions', 'my_account.txt'),
+              user_id=42, username='kept')
+
+    assert store.rebuild() == (2, 1)
+
+    row = store.get('pyrogram_user_old')
+    # Bot bayrağı və user_id Pyrogram sətrindən oxunur
+    assert (row['library'], row['type'], row['user_id']) == ('pyrogram', 'bot', 7_000_000_001)
+    assert row['created_at'] == time.mktime(time.strptime('2024-01-02 03:04:05', '%Y-%m-%d %H:%M:%S'))
+    assert row['auth_key_hash'] == ssg.SessionConverter.auth_key_hash(pyrogram)
+    row = store.get('my_account')
+    assert (row['library'], row['user_id'], row['username']) == ('telethon', 42, 'kept')
+    assert store.get('gone') is None
+    assert store.count() == 2
+    # Təkrar indeksləmə eyni nəticəni verir
+    assert store.rebuild() == (2, 0)
+
+
+def test_migrates_older_schema(workdir):
+    os.makedirs('sessions')
+    conn = sqlite3.connect(os.path.join('sessions', 'index.db'))
+    conn.execute('CREATE TABLE sessions (name TEXT PRIMARY KEY, library TEXT NOT NULL, type TEXT NOT NULL, '
+                 'user_id INTEGER, created_at REAL NOT NULL, path TEXT NOT NULL)')
+    conn.execute("INSERT INTO sessions VALUES ('old', 'pyrogram', 'user', 1, 1700000000, 'sessions/old.txt')")
+    conn.commit()
+    conn.close()
+
+    store = ssg.SessionStore()
+    try:
+        row = store.get('old')
+        assert set(row) == set(ssg.SessionStore.COLUMNS)
+        assert (row['user_id'], row['status'], row['auth_key_hash']) == (1, None, None)
+        indexes = {r['name'] for r in store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert set(ssg.SessionStore.INDEXES) <= indexes
+        store.update_status([{'name': 'old', 'status': 'alive', 'latency_ms': 1.0, 'checked_at': 1.0, 'error': None}])
+        assert store.get('old')['status'] == 'alive'
+    finally:
+        store.close()
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+import ssg
+from bench.fakes import FakeClientFactory
+
+
+def expected_statuses(factory, sessions):
+    return {name: factory.outcome_for(session_string) for name, session_string in sessions.items()}
+
+
+def test_run_records_statuses(store, sessions):
+    factory = FakeClientFactory(latency=0, revoked_ratio=0.3, error_ratio=0.3)
+    validator = ssg.SessionValidator(store, factory, concurrency=5, timeout=5, flush_every=3)
+
+    summary = asyncio.run(validator.run(list(store.iter_all())))
+
+    expected = expected_statuses(factory, sessions)
+    assert {name: store.get(name)['status'] for name in sessions} == expected
+    for status in ('alive', 'revoked', 'error'):
+        assert summary[status] == list(expected.values()).count(status)
+    assert summary['total'] == len(sessions)
+    # Bu paylanma ilə hər üç status ən azı bir dəfə görünür
+    assert set(expected.values()) == {'alive', 'revoked', 'error'}
+
+
+def test_errors_are_stored_per_status(store, sessions):
+    factory = FakeClientFactory(latency=0, revoked_ratio=0.3, error_ratio=0.3)
+    asyncio.run(ssg.SessionValidator(store, factory, flush_every=100).run(list(store.iter_all())))
+
+    for name, status in expected_statuses(factory, sessions).items():
+        row = store.get(name)
+        assert row['checked_at'] is not None
+        if status == 'alive':
+            assert row['last_error'] is None
+        elif status == 'revoked':
+            assert row['last_error'].startswith('AuthKeyUnregistered')
+        else:
+            assert row['last_error'].startswith('ConnectionError')
+
+
+def test_alive_sessions_fill_identity_cache(store, sessions):
+    factory = FakeClientFactory(latency=0)
+    asyncio.run(ssg.SessionValidator(store, factory).run(list(store.iter_all())))
+
+    for session_string in sessions.values():
+        assert store.identities.get(session_string) is not None
+
+
+def test_on_flush_follows_index_writes(store, sessions):
+    factory = FakeClientFactory(latency=0)
+    validator = ssg.SessionValidator(store, factory, flush_every=6)
+    flushed = []
+
+    def on_flush(results):
+        # Partiya artıq indeksdədir
+        assert all(store.get(result['name'])['status'] == result['status'] for result in results)
+        flushed.append(len(results))
+
+    asyncio.run(validator.run(list(store.iter_all()), on_flush=on_flush))
+    assert flushed == [6, 6, 6, 2]
+
+
+def test_journal_skips_only_flushed_results(store, sessions, monkeypatch):
+    factory = FakeClientFactory(latency=0)
+    generator = ssg.PremiumSessionGenerator(quiet=True)
+    generator.store = store
+    flush = ssg.SessionValidator.flush
+    calls = []
+
+    def failing_flush(self, results):
+        calls.append(len(results))
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(ssg.SessionValidator, 'flush', failing_flush)
+    journal = ssg.JobJournal.for_job('check', 'validate').open()
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.validate_sessions(factory, journal=journal))
+    journal.close()
+    monkeypatch.setattr(ssg.SessionValidator, 'flush', flush)
+
+    # İndeksə yazılmamış nəticələr jurnalda bitmiş sayılmır
+    journal = ssg.JobJournal.for_job('check', 'validate').open()
+    summary = asyncio.run(generator.validate_sessions(factory, journal=journal))
+    journal.close()
+    generator.close()
+    assert calls
+    assert summary['skipped'] == 0
+    assert summary['total'] == len(sessions)
+    assert all(store.get(name)['status'] == 'alive' for name in sessions)
+
+
+def test_validate_command_with_fake_clients(store, sessions):
+    store.close()
+    assert asyncio.run(ssg.main(['validate', '--fake', '--fake-latency', '0'])) == 0
+
+    expected = expected_statuses(FakeClientFactory(), sessions)
+    assert {name: store.get(name)['status'] for name in sessions} == expected
+
+
+class HangingClient:
+    """connect() heç vaxt bitmir; disconnect() çağırışları sayılır"""
+
+    def __init__(self):
+        self.disconnects = 0
+
+    async def connect(self):
+        await asyncio.sleep(60)
+
+    async def disconnect(self):
+        self.disconnects += 1
+
+
+def hanging_factory(clients):
+    def factory(library, session_string, name):
+        client = HangingClient()
+        clients.append(client)
+        return client
+    return factory
+
+
+def test_connect_timeout_disconnects_client(store, sessions):
+    clients = []
+    validator = ssg.SessionValidator(store, hanging_factory(clients), timeout=0.05)
+    summary = asyncio.run(validator.run(list(store.iter_all())[:3]))
+
+    assert summary['error'] == 3
+    assert [client.disconnects for client in clients] == [1, 1, 1]
+
+
+def test_connect_timeout_in_client_pool_disconnects_client(store, sessions):
+    clients = []
+    factory = hanging_factory(clients)
+    pool = ssg.ConnectedClientPool(factory)
+    validator = ssg.SessionValidator(store, factory, timeout=0.05, client_pool=pool)
+    summary = asyncio.run(validator.run(list(store.iter_all())[:3]))
+
+    assert summary['error'] == 3
+    assert [client.disconnects for client in clients] == [1, 1, 1]
+    assert len(pool) == 0
@@ -0,0 +1,114 @@
+import asyncio
+import os
+from concurrent.futures import Future
+
+import pytest
+
+import ssg
+
+
+def row(name):
+    return {'name': name, 'library': 'pyrogram', 'kind': 'user', 'path': os.path.join('sessions', f"{name}.txt"),
+            'user_id': 1}
+
+
+def leftovers(directory='sessions'):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+@pytest.fixture
+def writer(store):
+    os.makedirs('sessions', exist_ok=True)
+    writer = ssg.SessionWriter()
+    # _flush birbaşa çağırılanda yazıcı axınının bağlantısı əvəzinə
+    writer._store = store
+    return writer
+
+
+def flush(writer, *items):
+    batch = []
+    for name, content in items:
+        future = Future()
+        batch.append((os.path.join('sessions', f"{name}.txt"), content, row(name), future))
+    writer._flush(batch)
+    return [future for _, _, _, future in batch]
+
+
+def test_background_write_is_atomic_and_indexed(store):
+    writer = ssg.SessionWriter()
+    os.makedirs('sessions', exist_ok=True)
+    path = os.path.join('sessions', 'pyrogram_user_a.txt')
+    with open(path, 'w') as f:
+        f.write('old')
+
+    async def main():
+        return await asyncio.gather(*(
+            writer.write(os.path.join('sessions', f"pyrogram_user_{name}.txt"), f"content {name}", row(f"pyrogram_user_{name}"))
+            for name in 'abc'
+        ))
+
+    try:
+        paths = asyncio.run(main())
+    finally:
+        writer.close()
+    assert paths == [os.path.join('sessions', f"pyrogram_user_{name}.txt") for name in 'abc']
+    with open(path) as f:
+        assert f.read() == 'content a'
+    assert leftovers() == []
+    assert {r['name'] for r in store.iter_all()} == {f"pyrogram_user_{name}" for name in 'abc'}
+
+
+def test_each_file_is_fsynced_once_without_global_sync(writer, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(ssg.os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+    if hasattr(os, 'sync'):
+        monkeypatch.setattr(ssg.os, 'sync', lambda: pytest.fail('os.sync() must not be used'))
+
+    futures = flush(writer, ('a', '1'), ('b', '2'), ('c', '3'))
+    assert [future.result() for future in futures] == [os.path.join('sessions', f"{name}.txt") for name in 'abc']
+    # Üç fayl + bir qovluq
+    assert len(synced) == (4 if hasattr(os, 'O_DIRECTORY') else 3)
+
+
+def test_index_failure_reaches_every_caller(writer, store, monkeypatch):
+    def broken_add(*args, **kwargs):
+        raise RuntimeError('database is locked')
+
+    monkeypatch.setattr(writer._store, 'add', broken_add)
+    futures = flush(writer, ('a', '1'), ('b', '2'))
+
+    for name, future in zip('ab', futures):
+        error = future.exception()
+        assert isinstance(error, ssg.IndexUpdateError)
+        assert error.path == os.path.join('sessions', f"{name}.txt")
+        assert str(error.error) == 'database is locked'
+        # Fayl yazılıb, 'reindex' ilə bərpa oluna bilər
+        assert os.path.exists(error.path)
+    assert store.count() == 0
+    assert leftovers() == []
+
+
+def test_cancelled_future_is_skipped(writer, store):
+    cancelled = Future()
+    cancelled.cancel()
+    kept = Future()
+    writer._flush([
+        (os.path.join('sessions', 'a.txt'), 'x', row('a'), cancelled),
+        (os.path.join('sessions', 'b.txt'), 'y', row('b'), kept),
+    ])
+    assert cancelled.cancelled()
+    assert kept.result() == os.path.join('sessions', 'b.txt')
+    assert not os.path.exists(os.path.join('sessions', 'a.txt'))
+    assert [r['name'] for r in store.iter_all()] == ['b']
+
+
+def test_write_error_leaves_no_temp_file(writer, monkeypatch):
+    def failing_fsync(fd):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(ssg.os, 'fsync', failing_fsync)
+    failed, = flush(writer, ('a', 'data'))
+    assert isinstance(failed.exception(), OSError)
+    assert leftovers() == []
+    assert not os.path.exists(os.path.join('sessions', 'a.txt'))